@@ -13,7 +13,7 @@ from datetime import datetime
 from typing import Dict, List, Optional, Any
 
 from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from models.core import (
     Plan, GeneratedProject, TestResults, AgentResponse, 
@@ -21,9 +21,14 @@ from models.core import (
 )
 from services.memory import memory_manager
 from services.rate_limiter import get_rate_limiter, RateLimitExceeded, ExponentialBackoff
+from services.llm_pool import get_pooled_client
 from config import get_settings
 
 
+# Validates a whole lineage list in one pydantic-core pass
+_FILE_LINEAGE_LIST = TypeAdapter(List[FileLineage])
+
+
 class BuilderAgent:
     """
     Builder Agent responsible for generating React code from plans
@@ -60,8 +65,9 @@ class BuilderAgent:
                 
                 # Use configured model or fallback to gemini-2.5-flash
                 model_name = self.settings.gemini_model or "gemini-2.5-flash"
-                # Use LangChain's default retry mechanism
-                self.llm = ChatGoogleGenerativeAI(
+                # Use LangChain's default retry mechanism; the client is shared across agents
+                self.llm = get_pooled_client(
+                    ChatGoogleGenerativeAI,
                     model=model_name,
                     google_api_key=self.settings.gemini_api_key,
                     temperature=0.1,
@@ -139,13 +145,14 @@ class BuilderAgent:
             from services.audit import audit_manager
             audit_logger = audit_manager.get_logger(session_id)
             
-            for file_path in generated_files.keys():
+            for file_path, file_content in generated_files.items():
                 asyncio.create_task(audit_logger.log_file_operation(
                     agent='builder',
                     operation='create',
                     file_path=file_path,
                     reason='Generated from plan during project creation',
-                    content_preview=generated_files[file_path][:200] if generated_files[file_path] else None
+                    content_preview=file_content,
+                    file_size_bytes=len(file_content.encode())
                 ))
             
             execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
@@ -1885,19 +1892,18 @@ This application was generated automatically based on the following plan:
     
     def _create_file_lineage(self, files: Dict[str, str], session_id: str) -> List[FileLineage]:
         """Create lineage tracking for all generated files"""
-        lineage = []
         timestamp = datetime.now().isoformat()
         
-        for file_path in files.keys():
-            lineage.append(FileLineage(
-                file_path=file_path,
-                created_by='builder',
-                created_at=timestamp,
-                modified_by=[],
-                reason='Initial code generation from plan'
-            ))
-        
-        return lineage
+        return _FILE_LINEAGE_LIST.validate_python([
+            {
+                'file_path': file_path,
+                'created_by': 'builder',
+                'created_at': timestamp,
+                'modified_by': [],
+                'reason': 'Initial code generation from plan'
+            }
+            for file_path in files
+        ])
     
     def _get_plan_summary(self, plan: Plan) -> Dict[str, Any]:
         """Generate summary of the plan for logging"""
@@ -2021,7 +2027,8 @@ This application was generated automatically based on the following plan:
                         operation='modify',
                         file_path=file_path,
                         reason=f'Self-healing regeneration (attempt {retry_count + 1})',
-                        content_preview=content[:200] if content else None
+                        content_preview=content,
+                        file_size_bytes=len(content.encode())
                     ))
                 except RuntimeError:
                     # No event loop running, skip async logging
@@ -4,12 +4,51 @@ Provides comprehensive validation for plan structure and content
 Validates: Requirements 2.3, 2.4
 """
 
-from typing import Dict, List, Set, Any
+import re
+import sys
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Any
 from pydantic import ValidationError
 
 from models.core import Plan, PageSpec, ComponentSpec, RoutingConfig, BackendSpec
 
 
+# Stop validating once a plan has more than this many errors
+MAX_VALIDATION_ERRORS = 50
+
+# React component names: PascalCase identifiers
+_COMPONENT_NAME_RE = re.compile(r'^[A-Z][A-Za-z0-9_]*$')
+
+# Expected complexity keyed on (page_bucket, component_bucket, has_backend, endpoint_bucket)
+# Buckets: pages <=2 / <=4 / more, components <=5 / <=15 / more, endpoints <=3 / more.
+# Any combination not listed is 'complex'.
+_COMPLEXITY_TABLE = {
+    (0, 0, False, 0): 'simple',
+    (0, 1, False, 0): 'medium',
+    (1, 0, False, 0): 'medium',
+    (1, 1, False, 0): 'medium',
+    (0, 0, True, 0): 'medium',
+    (0, 1, True, 0): 'medium',
+    (1, 0, True, 0): 'medium',
+    (1, 1, True, 0): 'medium',
+}
+
+
+def _find_duplicates(names: List[str]) -> List[int]:
+    """
+    Return indices of names that repeat an earlier entry
+
+    Single pass over a plain list of strings, so callers extract the
+    attribute once and format error messages afterwards.
+    """
+    first_seen = {}
+    duplicates = []
+    for i, name in enumerate(names):
+        # setdefault hashes once; a different stored index means an earlier occurrence
+        if first_seen.setdefault(name, i) != i:
+            duplicates.append(i)
+    return duplicates
+
+
 class PlanValidator:
     """
     Comprehensive validator for plan structure and content
@@ -20,20 +59,22 @@ class PlanValidator:
     Validates: Requirements 2.3, 2.4
     """
     
-    def __init__(self):
-        """Initialize plan validator"""
-        self.required_page_fields = {'name', 'route', 'components', 'description'}
-        self.required_component_fields = {'name', 'type', 'description'}
-        self.required_routing_fields = {'base_path', 'routes'}
-        self.valid_component_types = {'functional', 'class', 'hook'}
-        self.valid_complexity_levels = {'simple', 'medium', 'complex'}
+    # Validation rules are shared, immutable class attributes; instances carry no state
+    __slots__ = ()
     
-    def validate_plan_structure(self, plan: Plan) -> Dict[str, Any]:
+    required_page_fields = frozenset({'name', 'route', 'components', 'description'})
+    required_component_fields = frozenset({'name', 'type', 'description'})
+    required_routing_fields = frozenset({'base_path', 'routes'})
+    valid_component_types = frozenset({'functional', 'class', 'hook'})
+    valid_complexity_levels = frozenset({'simple', 'medium', 'complex'})
+    
+    def validate_plan_structure(self, plan: Plan, include_summary: bool = True) -> Dict[str, Any]:
         """
         Validate complete plan structure and return validation report
         
         Args:
             plan: Plan object to validate
+            include_summary: Whether to populate the report's summary section
             
         Returns:
             Dictionary with validation results and any issues found
@@ -44,243 +85,213 @@ class PlanValidator:
             'warnings': [],
             'summary': {}
         }
+        errors = validation_report['errors']
+        warnings = validation_report['warnings']
         
-        try:
-            # Validate pages
-            page_validation = self._validate_pages(plan.pages)
-            validation_report['errors'].extend(page_validation['errors'])
-            validation_report['warnings'].extend(page_validation['warnings'])
-            
-            # Validate components
-            component_validation = self._validate_components(plan.components)
-            validation_report['errors'].extend(component_validation['errors'])
-            validation_report['warnings'].extend(component_validation['warnings'])
-            
-            # Validate routing consistency
-            routing_validation = self._validate_routing_consistency(plan.pages, plan.routing)
-            validation_report['errors'].extend(routing_validation['errors'])
-            validation_report['warnings'].extend(routing_validation['warnings'])
+        for severity, message in self.iter_validate(plan):
+            if severity == 'warning':
+                warnings.append(message)
+                continue
             
-            # Validate component references
-            reference_validation = self._validate_component_references(plan.pages, plan.components)
-            validation_report['errors'].extend(reference_validation['errors'])
-            validation_report['warnings'].extend(reference_validation['warnings'])
-            
-            # Validate backend logic if present
-            if plan.backend_logic:
-                backend_validation = self._validate_backend_logic(plan.backend_logic)
-                validation_report['errors'].extend(backend_validation['errors'])
-                validation_report['warnings'].extend(backend_validation['warnings'])
-            
-            # Validate complexity assessment
-            complexity_validation = self._validate_complexity(plan)
-            validation_report['warnings'].extend(complexity_validation['warnings'])
-            
-            # Set overall validity
-            validation_report['valid'] = len(validation_report['errors']) == 0
-            
-            # Generate summary
-            validation_report['summary'] = self._generate_validation_summary(plan)
-            
-        except Exception as e:
-            validation_report['valid'] = False
-            validation_report['errors'].append(f"Validation process failed: {str(e)}")
+            errors.append(message)
+            # Stop consuming the stream once the plan is obviously broken
+            if len(errors) > MAX_VALIDATION_ERRORS:
+                validation_report['truncated'] = True
+                break
+        
+        # Set overall validity
+        validation_report['valid'] = len(errors) == 0
+        
+        # Generate summary
+        if include_summary:
+            validation_report['summary'] = self._generate_validation_summary(plan, len(plan.pages), len(plan.components))
         
         return validation_report
     
-    def _validate_pages(self, pages: List[PageSpec]) -> Dict[str, List[str]]:
-        """Validate page specifications"""
-        errors = []
-        warnings = []
+    def iter_validate(self, plan: Plan) -> Iterator[Tuple[str, str]]:
+        """
+        Validate plan structure lazily
+        
+        Yields issues as they are found instead of collecting them, so
+        callers validating many plans can stop early or stream results.
         
+        Args:
+            plan: Plan object to validate
+            
+        Yields:
+            (severity, message) pairs where severity is 'error' or 'warning'
+        """
+        page_count = len(plan.pages)
+        component_count = len(plan.components)
+        
+        # Build page/component indices once and share them across sub-validators
+        page_routes = {page.route for page in plan.pages}
+        page_names = {page.name for page in plan.pages}
+        component_names = {sys.intern(comp.name) for comp in plan.components}
+        
+        yield from self._iter_validate_pages(plan.pages)
+        yield from self._iter_validate_components(plan.components)
+        yield from self._iter_validate_routing_consistency(page_routes, page_names, plan.routing)
+        yield from self._iter_validate_component_references(plan.pages, component_names)
+        
+        # Validate backend logic if present
+        if plan.backend_logic:
+            yield from self._iter_validate_backend_logic(plan.backend_logic)
+        
+        # Validate complexity assessment
+        yield from self._iter_validate_complexity(plan, page_count, component_count)
+    
+    def _iter_validate_pages(self, pages: List[PageSpec]) -> Iterator[Tuple[str, str]]:
+        """Validate page specifications (empty names and routes are rejected by PageSpec)"""
         if not pages:
-            errors.append("Plan must contain at least one page")
-            return {'errors': errors, 'warnings': warnings}
+            yield 'error', "Plan must contain at least one page"
+            return
         
         if len(pages) > 5:
-            errors.append(f"Page count ({len(pages)}) exceeds maximum of 5 pages")
+            yield 'error', f"Page count ({len(pages)}) exceeds maximum of 5 pages"
         
-        # Check for duplicate page names and routes
-        page_names = set()
-        page_routes = set()
+        # Validate route format
+        for page in [p for p in pages if not p.route.startswith('/')]:
+            yield 'warning', f"Page {page.name}: Route should start with '/' (got: {page.route})"
         
-        for i, page in enumerate(pages):
-            # Check for required fields (already validated by Pydantic, but double-check)
-            if not page.name or not page.name.strip():
-                errors.append(f"Page {i+1}: Name cannot be empty")
-            
-            if not page.route or not page.route.strip():
-                errors.append(f"Page {i+1}: Route cannot be empty")
-            
-            # Check for duplicates
-            if page.name in page_names:
-                errors.append(f"Duplicate page name: {page.name}")
-            page_names.add(page.name)
-            
-            if page.route in page_routes:
-                errors.append(f"Duplicate page route: {page.route}")
-            page_routes.add(page.route)
-            
-            # Validate route format
-            if not page.route.startswith('/'):
-                warnings.append(f"Page {page.name}: Route should start with '/' (got: {page.route})")
-            
-            # Check component references
-            if not page.components:
-                warnings.append(f"Page {page.name}: No components specified")
+        # Check component references
+        for page in [p for p in pages if not p.components]:
+            yield 'warning', f"Page {page.name}: No components specified"
         
-        return {'errors': errors, 'warnings': warnings}
-    
-    def _validate_components(self, components: List[ComponentSpec]) -> Dict[str, List[str]]:
-        """Validate component specifications"""
-        errors = []
-        warnings = []
+        # Check for duplicate page names and routes
+        page_names = [page.name for page in pages]
+        for i in _find_duplicates(page_names):
+            yield 'error', f"Duplicate page name: {page_names[i]}"
         
+        page_routes = [page.route for page in pages]
+        for i in _find_duplicates(page_routes):
+            yield 'error', f"Duplicate page route: {page_routes[i]}"
+    
+    def _iter_validate_components(self, components: List[ComponentSpec]) -> Iterator[Tuple[str, str]]:
+        """Validate component specifications (empty names are rejected by ComponentSpec)"""
         if not components:
-            warnings.append("No components specified in plan")
-            return {'errors': errors, 'warnings': warnings}
+            yield 'warning', "No components specified in plan"
+            return
         
-        # Check for duplicate component names
-        component_names = set()
-        
-        for i, component in enumerate(components):
-            # Check for required fields
-            if not component.name or not component.name.strip():
-                errors.append(f"Component {i+1}: Name cannot be empty")
-            
+        for component in components:
             if component.type not in self.valid_component_types:
-                errors.append(f"Component {component.name}: Invalid type '{component.type}'. Must be one of: {self.valid_component_types}")
-            
-            # Check for duplicates
-            if component.name in component_names:
-                errors.append(f"Duplicate component name: {component.name}")
-            component_names.add(component.name)
+                yield 'error', f"Component {component.name}: Invalid type '{component.type}'. Must be one of: {sorted(self.valid_component_types)}"
             
             # Validate component naming convention
-            if not component.name[0].isupper():
-                warnings.append(f"Component {component.name}: Should start with uppercase letter (React convention)")
+            if not _COMPONENT_NAME_RE.match(component.name):
+                yield 'warning', f"Component {component.name}: Should be PascalCase: an uppercase letter followed by letters, digits or underscores (React convention)"
         
-        return {'errors': errors, 'warnings': warnings}
+        # Check for duplicate component names
+        component_names = [component.name for component in components]
+        for i in _find_duplicates(component_names):
+            yield 'error', f"Duplicate component name: {component_names[i]}"
     
-    def _validate_routing_consistency(self, pages: List[PageSpec], routing: RoutingConfig) -> Dict[str, List[str]]:
+    def _iter_validate_routing_consistency(self, page_routes: Set[str], page_names: Set[str], routing: RoutingConfig) -> Iterator[Tuple[str, str]]:
         """Validate routing configuration consistency with pages"""
-        errors = []
-        warnings = []
-        
-        # Get all page routes and names
-        page_routes = {page.route for page in pages}
-        page_names = {page.name for page in pages}
-        
         # Check that all routes in routing config correspond to actual pages
-        routing_paths = {route['path'] for route in routing.routes}
-        routing_components = {route['component'] for route in routing.routes}
+        routing_paths = frozenset(routing.route_paths)
+        routing_components = frozenset(routing.route_components)
         
         # Check for missing routes
         missing_routes = page_routes - routing_paths
         if missing_routes:
-            errors.append(f"Routes missing from routing config: {missing_routes}")
+            yield 'error', f"Routes missing from routing config: {sorted(missing_routes)}"
         
         # Check for extra routes
         extra_routes = routing_paths - page_routes
         if extra_routes:
-            warnings.append(f"Extra routes in routing config not matching any page: {extra_routes}")
+            yield 'warning', f"Extra routes in routing config not matching any page: {sorted(extra_routes)}"
         
         # Check for missing components
         missing_components = routing_components - page_names
         if missing_components:
-            errors.append(f"Routing references non-existent page components: {missing_components}")
+            yield 'error', f"Routing references non-existent page components: {sorted(missing_components)}"
         
         # Validate navigation links
         if routing.navigation_links:
-            nav_paths = {link['path'] for link in routing.navigation_links}
+            nav_paths = frozenset(routing.navigation_paths)
+            if len(routing.navigation_paths) < len(routing.navigation_links):
+                for link in routing.navigation_links:
+                    if 'path' not in link:
+                        yield 'warning', f"Navigation link missing 'path': {link}"
             invalid_nav_paths = nav_paths - page_routes
             if invalid_nav_paths:
-                warnings.append(f"Navigation links reference non-existent routes: {invalid_nav_paths}")
-        
-        return {'errors': errors, 'warnings': warnings}
+                yield 'warning', f"Navigation links reference non-existent routes: {sorted(invalid_nav_paths)}"
     
-    def _validate_component_references(self, pages: List[PageSpec], components: List[ComponentSpec]) -> Dict[str, List[str]]:
-        """Validate that page component references are valid"""
-        errors = []
-        warnings = []
-        
-        # Get all available component names
-        available_components = {comp.name for comp in components}
+    def _iter_validate_component_references(self, pages: List[PageSpec], available_components: Set[str]) -> Iterator[Tuple[str, str]]:
+        """
+        Validate that page component references are valid
         
-        # Check each page's component references
+        Args:
+            pages: Page specifications whose references are checked
+            available_components: Interned names of all defined components
+        """
+        # Check each page's component references, collecting used names in the same pass
+        used_components = set()
         for page in pages:
             for component_name in page.components:
-                if component_name not in available_components:
-                    errors.append(f"Page {page.name} references undefined component: {component_name}")
+                name = sys.intern(component_name)
+                if name not in available_components:
+                    yield 'error', f"Page {page.name} references undefined component: {component_name}"
+                used_components.add(name)
         
         # Check for unused components
-        used_components = set()
-        for page in pages:
-            used_components.update(page.components)
-        
         unused_components = available_components - used_components
         if unused_components:
-            warnings.append(f"Unused components defined: {unused_components}")
-        
-        return {'errors': errors, 'warnings': warnings}
+            yield 'warning', f"Unused components defined: {sorted(unused_components)}"
     
-    def _validate_backend_logic(self, backend: BackendSpec) -> Dict[str, List[str]]:
+    def _iter_validate_backend_logic(self, backend: BackendSpec) -> Iterator[Tuple[str, str]]:
         """Validate backend logic specification"""
-        errors = []
-        warnings = []
-        
         if not backend.endpoints:
-            warnings.append("Backend logic specified but no endpoints defined")
-            return {'errors': errors, 'warnings': warnings}
+            yield 'warning', "Backend logic specified but no endpoints defined"
+            return
         
         # Check for duplicate endpoints
-        endpoint_signatures = set()
-        
-        for endpoint in backend.endpoints:
-            signature = f"{endpoint['method']} {endpoint['path']}"
-            if signature in endpoint_signatures:
-                errors.append(f"Duplicate endpoint: {signature}")
-            endpoint_signatures.add(signature)
+        endpoint_signatures = {}
+        
+        for i, endpoint in enumerate(backend.endpoints):
+            method = endpoint.get('method')
+            path = endpoint.get('path')
+            if method is None or path is None:
+                yield 'error', f"Endpoint {i+1}: Must specify both 'method' and 'path'"
+                continue
+            
+            signature = f"{method} {path}"
+            if endpoint_signatures.setdefault(signature, i) != i:
+                yield 'error', f"Duplicate endpoint: {signature}"
             
             # Validate endpoint format
-            if not endpoint.get('path', '').startswith('/'):
-                warnings.append(f"Endpoint path should start with '/': {endpoint.get('path')}")
+            if not path.startswith('/'):
+                yield 'warning', f"Endpoint path should start with '/': {path}"
             
-            if endpoint.get('method') not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
-                warnings.append(f"Unusual HTTP method: {endpoint.get('method')}")
-        
-        return {'errors': errors, 'warnings': warnings}
+            if method not in ['GET', 'POST', 'PUT', 'DELETE', 'PATCH']:
+                yield 'warning', f"Unusual HTTP method: {method}"
     
-    def _validate_complexity(self, plan: Plan) -> Dict[str, List[str]]:
+    def _iter_validate_complexity(self, plan: Plan, page_count: int, component_count: int) -> Iterator[Tuple[str, str]]:
         """Validate complexity assessment"""
-        warnings = []
-        
         if plan.estimated_complexity not in self.valid_complexity_levels:
-            warnings.append(f"Invalid complexity level: {plan.estimated_complexity}")
+            yield 'warning', f"Invalid complexity level: {plan.estimated_complexity}"
         
         # Assess if complexity matches plan content
-        page_count = len(plan.pages)
-        component_count = len(plan.components)
         has_backend = plan.backend_logic is not None
+        endpoint_count = len(plan.backend_logic.endpoints) if has_backend else 0
         
         # Simple heuristics for complexity assessment
-        if page_count <= 2 and component_count <= 5 and not has_backend:
-            expected_complexity = 'simple'
-        elif page_count <= 4 and component_count <= 15 and (not has_backend or len(plan.backend_logic.endpoints) <= 3):
-            expected_complexity = 'medium'
-        else:
-            expected_complexity = 'complex'
+        page_bucket = 0 if page_count <= 2 else 1 if page_count <= 4 else 2
+        component_bucket = 0 if component_count <= 5 else 1 if component_count <= 15 else 2
+        endpoint_bucket = 0 if endpoint_count <= 3 else 1
+        expected_complexity = _COMPLEXITY_TABLE.get(
+            (page_bucket, component_bucket, has_backend, endpoint_bucket), 'complex'
+        )
         
         if plan.estimated_complexity != expected_complexity:
-            warnings.append(f"Complexity assessment '{plan.estimated_complexity}' may not match plan content (expected: {expected_complexity})")
-        
-        return {'warnings': warnings}
+            yield 'warning', f"Complexity assessment '{plan.estimated_complexity}' may not match plan content (expected: {expected_complexity})"
     
-    def _generate_validation_summary(self, plan: Plan) -> Dict[str, Any]:
+    def _generate_validation_summary(self, plan: Plan, page_count: int, component_count: int) -> Dict[str, Any]:
         """Generate summary of plan validation"""
         return {
-            'page_count': len(plan.pages),
-            'component_count': len(plan.components),
+            'page_count': page_count,
+            'component_count': component_count,
             'route_count': len(plan.routing.routes),
             'has_backend': plan.backend_logic is not None,
             'backend_endpoint_count': len(plan.backend_logic.endpoints) if plan.backend_logic else 0,
@@ -289,17 +300,43 @@ class PlanValidator:
         }
 
 
-def validate_plan_completeness(plan_dict: Dict[str, Any]) -> Dict[str, Any]:
+# PlanValidator holds no per-plan state, so a single shared instance serves every call
+_VALIDATOR_SINGLETON = PlanValidator()
+
+
+def validate_plan_completeness(plan_dict: Dict[str, Any], include_summary: bool = True) -> Dict[str, Any]:
     """
     Validate that plan dictionary contains all required fields
     
     Args:
         plan_dict: Dictionary containing plan data
+        include_summary: Whether to populate the report's summary section
         
     Returns:
         Validation report with errors and warnings
     """
-    validator = PlanValidator()
+    report, _ = check_plan_completeness(plan_dict, include_summary=include_summary)
+    return report
+
+
+def check_plan_completeness(
+    plan_dict: Dict[str, Any],
+    include_summary: bool = True
+) -> Tuple[Dict[str, Any], Optional[Plan]]:
+    """
+    Validate a plan dictionary and return the Plan built along the way
+    
+    Lets callers reuse the validated Plan instead of running Pydantic
+    validation over the same dictionary a second time.
+    
+    Args:
+        plan_dict: Dictionary containing plan data
+        include_summary: Whether to populate the report's summary section
+        
+    Returns:
+        Tuple of (validation report, Plan or None if Pydantic rejected the data)
+    """
+    validator = _VALIDATOR_SINGLETON
     
     # Check for required top-level fields
     required_fields = {'pages', 'components', 'routing'}
@@ -311,28 +348,15 @@ def validate_plan_completeness(plan_dict: Dict[str, Any]) -> Dict[str, Any]:
             'errors': [f"Missing required fields: {missing_fields}"],
             'warnings': [],
             'summary': {}
-        }
+        }, None
     
     try:
-        # Create Plan object to trigger Pydantic validation
-        pages = [PageSpec(**page) for page in plan_dict['pages']]
-        components = [ComponentSpec(**comp) for comp in plan_dict['components']]
-        routing = RoutingConfig(**plan_dict['routing'])
-        
-        backend_logic = None
-        if plan_dict.get('backend_logic'):
-            backend_logic = BackendSpec(**plan_dict['backend_logic'])
-        
-        plan = Plan(
-            pages=pages,
-            components=components,
-            routing=routing,
-            backend_logic=backend_logic,
-            estimated_complexity=plan_dict.get('estimated_complexity', 'simple')
-        )
+        # Treat an empty backend_logic section the same as an absent one
+        if 'backend_logic' in plan_dict and not plan_dict['backend_logic']:
+            plan_dict = {**plan_dict, 'backend_logic': None}
         
-        # Run comprehensive validation
-        return validator.validate_plan_structure(plan)
+        # Validate the whole plan (and nested specs) in a single Pydantic pass
+        plan = Plan.model_validate(plan_dict)
         
     except ValidationError as e:
         return {
@@ -340,11 +364,23 @@ def validate_plan_completeness(plan_dict: Dict[str, Any]) -> Dict[str, Any]:
             'errors': [f"Plan structure validation failed: {str(e)}"],
             'warnings': [],
             'summary': {}
-        }
+        }, None
+    except Exception as e:
+        return {
+            'valid': False,
+            'errors': [f"Validation process failed: {str(e)}"],
+            'warnings': [],
+            'summary': {}
+        }, None
+    
+    try:
+        # Run comprehensive validation
+        return validator.validate_plan_structure(plan, include_summary=include_summary), plan
+        
     except Exception as e:
         return {
             'valid': False,
             'errors': [f"Validation process failed: {str(e)}"],
             'warnings': [],
             'summary': {}
-        }
\ No newline at end of file
+        }, plan
@@ -4,11 +4,18 @@ Decomposes user requests into structured implementation plans using Gemini LLM
 Validates: Requirements 2.1, 2.2, 12.1, 12.2
 """
 
+import asyncio
+import atexit
 import json
+import logging
 import re
-from datetime import datetime
-from typing import Dict, List, Optional, Any
+import time
+from collections import OrderedDict
+from threading import Lock
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple, Any, Union
 
+import orjson
 from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import ValidationError
 
@@ -18,9 +25,194 @@ from models.core import (
 )
 from services.memory import memory_manager
 from services.rate_limiter import get_rate_limiter, RateLimitExceeded, ExponentialBackoff
+from services.llm_pool import get_pooled_client
 from services.error_handler import get_error_handler, LLMAPIError, ValidationError as AmarValidationError
+from services.semantic_cache import SemanticPlanCache, context_fingerprint
+from services.rag_service import get_rag_service
+from services.llm_cache import LLMCache, RedisBackend
 from config import get_settings
-from .plan_validator import PlanValidator, validate_plan_completeness
+from .plan_validator import PlanValidator, check_plan_completeness
+
+logger = logging.getLogger(__name__)
+
+# Newly generated plans between writes of the persisted semantic cache
+SEMANTIC_CACHE_SAVE_EVERY = 20
+
+# Sessions whose rendered planning context is kept for reuse
+CONTEXT_CACHE_SESSIONS = 256
+
+# Keywords that indicate backend logic is needed, by category (read-only)
+BACKEND_INDICATORS = MappingProxyType({
+    'form_submission': ('submit', 'send', 'contact form', 'signup', 'register', 'feedback'),
+    'data_processing': ('validate', 'process', 'calculate', 'compute', 'analyze'),
+    'api_interaction': ('api', 'fetch', 'retrieve', 'get data', 'load data'),
+    'search': ('search', 'filter', 'query', 'find'),
+    'user_actions': ('save', 'store', 'update', 'delete', 'create')
+})
+
+# Inverted index: keyword -> category
+KEYWORD_CATEGORIES = MappingProxyType({
+    keyword: category
+    for category, keywords in BACKEND_INDICATORS.items()
+    for keyword in keywords
+})
+
+# Terms that select a specific suggested endpoint
+_ENDPOINT_TRIGGERS = MappingProxyType({
+    'contact': 'contact',
+    'signup': 'signup',
+    'register': 'signup',
+    'feedback': 'feedback',
+    'validate': 'validate'
+})
+
+
+def _build_keyword_scanner():
+    """
+    Compile every indicator keyword and endpoint trigger into one regex
+    
+    Matches are plain substrings (no word boundaries), like the original
+    ``keyword in description`` checks. The pattern is wrapped in a lookahead
+    so overlapping keywords are all found; where one keyword is a prefix of
+    another, the longer one is tried first and also carries the shorter
+    one's tags. Each term maps to a bitmask of its tags (see _TAG_BITS).
+    """
+    tags: Dict[str, set] = {keyword: {category} for keyword, category in KEYWORD_CATEGORIES.items()}
+    for term, trigger in _ENDPOINT_TRIGGERS.items():
+        tags.setdefault(term, set()).add(trigger)
+    
+    for keyword in tags:
+        for other in tags:
+            if other != keyword and keyword.startswith(other):
+                tags[keyword] |= tags[other]
+    
+    terms = sorted(tags, key=len, reverse=True)
+    pattern = re.compile('(?=(' + '|'.join(map(re.escape, terms)) + '))')
+    masks = {term: sum(_TAG_BITS[tag] for tag in term_tags) for term, term_tags in tags.items()}
+    return pattern, MappingProxyType(masks)
+
+
+# One bit per category and endpoint trigger
+_TAG_BITS = MappingProxyType({
+    tag: 1 << bit
+    for bit, tag in enumerate(sorted(set(BACKEND_INDICATORS) | set(_ENDPOINT_TRIGGERS.values())))
+})
+_FORM_SUBMISSION = _TAG_BITS['form_submission']
+_DATA_PROCESSING = _TAG_BITS['data_processing']
+_API_INTERACTION = _TAG_BITS['api_interaction']
+_SEARCH = _TAG_BITS['search']
+_CONTACT = _TAG_BITS['contact']
+_SIGNUP = _TAG_BITS['signup']
+_FEEDBACK = _TAG_BITS['feedback']
+_VALIDATE = _TAG_BITS['validate']
+
+_KEYWORD_RE, _KEYWORD_MASKS = _build_keyword_scanner()
+
+# Suggested endpoints are shared constants; callers must not mutate them.
+# They stay plain dicts so detection results remain JSON-serializable.
+_ENDPOINT_CONTACT = {'method': 'POST', 'path': '/api/contact', 'handler': 'handleContact', 'description': 'Handle contact form submission'}
+_ENDPOINT_SIGNUP = {'method': 'POST', 'path': '/api/signup', 'handler': 'handleSignup', 'description': 'Handle user signup'}
+_ENDPOINT_FEEDBACK = {'method': 'POST', 'path': '/api/feedback', 'handler': 'handleFeedback', 'description': 'Handle feedback submission'}
+_ENDPOINT_VALIDATE = {'method': 'POST', 'path': '/api/validate', 'handler': 'handleValidation', 'description': 'Validate user input'}
+_ENDPOINT_SEARCH = {'method': 'GET', 'path': '/api/search', 'handler': 'handleSearch', 'description': 'Handle search queries'}
+
+_JSON_DECODER = json.JSONDecoder()
+
+
+def _dumps(obj: Any, pretty: bool = False) -> str:
+    """Serialize to JSON text with orjson (2-space indented if pretty)"""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(obj, option=option).decode('utf-8')
+
+
+# Braces tried as the start of the plan JSON before giving up
+MAX_JSON_CANDIDATES = 8
+
+
+# Invariant parts of the planning prompt; only the session context and the
+# user's description change between requests
+_PLANNING_PROMPT_PREFIX = """
+You are a web application planner. Analyze the user's request and create a detailed implementation plan for a React application.
+
+"""
+
+_PLANNING_PROMPT_SUFFIX = """
+
+IMPORTANT CONSTRAINTS:
+- Maximum 5 pages allowed
+- Generate React components with TypeScript
+- Include routing configuration
+- Detect if backend API endpoints are needed
+- Make reasonable assumptions for ambiguous requirements
+
+BACKEND REQUIREMENT DETECTION:
+Carefully analyze the user request for these indicators that backend logic is needed:
+- Forms that submit data (contact forms, signup forms, feedback forms)
+- Data validation or processing (email validation, input sanitization)
+- API calls or data fetching
+- User interactions that require server-side logic
+- Any mention of "submit", "send", "save", "process", "validate"
+- Features like search, filtering, or data manipulation
+
+If ANY of these indicators are present, include backend_logic with appropriate endpoints.
+
+Generate a JSON response with this exact structure:
+
+{
+    "pages": [
+        {
+            "name": "HomePage",
+            "route": "/",
+            "components": ["Header", "Hero", "Footer"],
+            "description": "Main landing page with hero section"
+        }
+    ],
+    "components": [
+        {
+            "name": "Header",
+            "type": "functional",
+            "props": {"title": "string", "showNav": "boolean"},
+            "description": "Navigation header component"
+        }
+    ],
+    "routing": {
+        "base_path": "/",
+        "routes": [
+            {"path": "/", "component": "HomePage"},
+            {"path": "/about", "component": "AboutPage"}
+        ],
+        "navigation_links": [
+            {"label": "Home", "path": "/"},
+            {"label": "About", "path": "/about"}
+        ]
+    },
+    "backend_logic": {
+        "endpoints": [
+            {"method": "POST", "path": "/api/contact", "handler": "handleContact", "description": "Handle contact form submission"}
+        ],
+        "middleware": ["cors", "bodyParser"],
+        "dependencies": ["express"]
+    },
+    "estimated_complexity": "simple"
+}
+
+BACKEND ENDPOINT SPECIFICATION:
+- Each endpoint MUST have: method (GET/POST/PUT/DELETE), path, handler name, and description
+- Common patterns:
+  * Contact forms: POST /api/contact
+  * Search: GET /api/search
+  * Form validation: POST /api/validate
+  * Data submission: POST /api/submit
+- Include "cors" and "bodyParser" in middleware for API endpoints
+- Include "express" in dependencies for backend logic
+
+If no backend logic is needed (purely static content), set "backend_logic" to null.
+Complexity should be "simple", "medium", or "complex".
+
+Respond ONLY with valid JSON. No additional text or explanation.
+"""
 
 
 class PlannerAgent:
@@ -45,14 +237,35 @@ class PlannerAgent:
         )
         self.error_handler = get_error_handler()
         
+        # Two-tier plan cache: exact-match SHA256 lookup, then semantic similarity
+        self.llm_cache = LLMCache(
+            RedisBackend(self.settings.llm_cache_redis_url) if self.settings.llm_cache_redis_url else None
+        )
+        # The semantic tier stays off until RAG is enabled and then embeds with the
+        # retriever's already-loaded model rather than loading a second one
+        self.plan_cache = SemanticPlanCache(enabled=False)
+        self._unsaved_plans = 0
+        if self.settings.semantic_cache_path:
+            self.plan_cache.load(self.settings.semantic_cache_path)
+            # Plans added since the last periodic save are written at exit
+            atexit.register(self.save_plan_cache)
+        self.stats = {'hits': 0, 'misses': 0}
+        
+        # Rendered session context per session: session_id -> (context_version, text),
+        # least recently used sessions evicted past CONTEXT_CACHE_SESSIONS
+        self._context_cache: "OrderedDict[str, Tuple[Any, str]]" = OrderedDict()
+        self._context_cache_lock = Lock()
+        
         # Initialize LLM client (OpenAI, Groq, or Gemini)
         if self.settings.use_openai and self.settings.openai_api_key:
             from services.openai_client import get_openai_client
             self.llm_client = get_openai_client()
+            self.model_name = f"openai:{self.llm_client.model}"
             self.use_custom_client = True
         elif self.settings.use_groq and self.settings.groq_api_key:
             from services.groq_client import get_groq_client
             self.llm_client = get_groq_client()
+            self.model_name = f"groq:{self.llm_client.model}"
             self.use_custom_client = True
         else:
             # Fallback to Gemini
@@ -66,14 +279,16 @@ class PlannerAgent:
                 
                 # Use configured model or fallback to gemini-2.5-flash
                 model_name = self.settings.gemini_model or "gemini-2.5-flash"
-                # Use LangChain's default retry mechanism
-                self.llm = ChatGoogleGenerativeAI(
+                # Use LangChain's default retry mechanism; the client is shared across agents
+                self.llm = get_pooled_client(
+                    ChatGoogleGenerativeAI,
                     model=model_name,
                     google_api_key=self.settings.gemini_api_key,
                     temperature=0.3,
                     max_tokens=4000,
                     timeout=60
                 )
+                self.model_name = f"gemini:{model_name}"
                 self.use_custom_client = False
             except Exception as e:
                 raise LLMAPIError(
@@ -94,101 +309,249 @@ class PlannerAgent:
             
         Validates: Requirements 2.1, 2.2, 12.1, 12.2, 13.1
         """
-        start_time = datetime.now()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Get memory context for this session
             memory = memory_manager.get_memory(user_request.session_id)
             context = memory.get_context_for_agent('planner', max_entries=3)
             
-            # Detect backend requirements from user description
-            backend_detection = self.detect_backend_requirements(user_request.description)
+            backend_detection = self._detect_and_log_backend(memory, user_request.description)
             
-            # Log backend detection results
-            memory.add_entry(
-                agent='planner',
-                action='backend_detection',
-                data={
-                    'user_description': user_request.description,
-                    'needs_backend': backend_detection['needs_backend'],
-                    'detected_categories': backend_detection['detected_categories'],
-                    'suggested_endpoints': backend_detection['suggested_endpoints'],
-                    'confidence': backend_detection['confidence']
-                },
-                tags=['backend_detection', 'analysis'],
-                importance=0.8
-            )
+            lookup = self._lookup_cached_plan(user_request.description, context)
+            plan_dict = lookup['plan_dict']
+            if plan_dict is None:
+                plan_dict = self._generate_plan_with_llm(user_request.description, context, user_request.session_id)
             
-            # Generate plan using LLM
-            plan_dict = self._generate_plan_with_llm(user_request.description, context, user_request.session_id)
+            return self._complete_analysis(user_request, memory, backend_detection, lookup, plan_dict, start_ns)
             
-            # Validate plan completeness first
-            completeness_validation = validate_plan_completeness(plan_dict)
-            if not completeness_validation['valid']:
-                raise ValidationError(f"Plan completeness validation failed: {completeness_validation['errors']}")
+        except Exception as e:
+            return self._handle_analysis_error(e, user_request, start_ns)
+    
+    async def analyze_request_async(self, user_request: UserRequest) -> AgentResponse:
+        """
+        Async variant of analyze_request for use inside the workflow event loop
+        
+        The LLM call is awaited instead of blocking, and the plan cache lookup
+        and store (embedding, Redis, disk) run in worker threads so they do not
+        stall the event loop. Backend detection is synchronous, so it finishes
+        before the scheduled LLM task starts sending its request.
+        
+        Args:
+            user_request: Validated user request with description
             
-            # Validate and create Plan object
-            plan = self._validate_and_create_plan(plan_dict)
+        Returns:
+            AgentResponse with success status and generated plan
+        """
+        start_ns = time.perf_counter_ns()
+        
+        try:
+            memory = memory_manager.get_memory(user_request.session_id)
+            context = memory.get_context_for_agent('planner', max_entries=3)
             
-            # Run comprehensive structure validation
-            structure_validation = self.validator.validate_plan_structure(plan)
-            if not structure_validation['valid']:
-                raise ValidationError(f"Plan structure validation failed: {structure_validation['errors']}")
+            lookup = await asyncio.to_thread(self._lookup_cached_plan, user_request.description, context)
+            plan_task = None
+            if lookup['plan_dict'] is None:
+                plan_task = asyncio.create_task(
+                    self._generate_plan_with_llm_async(user_request.description, context, user_request.session_id)
+                )
             
-            # Store plan in episodic memory with validation results
-            memory.add_entry(
-                agent='planner',
-                action='plan_generated',
-                data={
-                    'user_description': user_request.description,
-                    'plan': plan.model_dump(),
-                    'page_count': len(plan.pages),
-                    'has_backend': plan.backend_logic is not None,
-                    'backend_detection': backend_detection,
-                    'validation_summary': structure_validation['summary'],
-                    'validation_warnings': structure_validation['warnings']
-                },
-                tags=['planning', 'user_request', 'validated'],
-                importance=1.0
-            )
+            try:
+                backend_detection = self._detect_and_log_backend(memory, user_request.description)
+            except Exception:
+                if plan_task is not None:
+                    plan_task.cancel()
+                raise
             
-            execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            plan_dict = lookup['plan_dict'] if plan_task is None else await plan_task
             
-            return AgentResponse(
-                agent_name='planner',
-                success=True,
-                output={'plan': plan.model_dump()},
-                errors=[],
-                execution_time_ms=execution_time
+            response = self._complete_analysis(
+                user_request, memory, backend_detection, lookup, plan_dict, start_ns, store_plan=False
             )
+            await asyncio.to_thread(self._store_plan, user_request.description, lookup, plan_dict)
+            return response
             
-        except RateLimitExceeded as e:
-            user_message, error_details = self.error_handler.handle_error(
-                e,
-                context={'agent': 'planner', 'session_id': user_request.session_id}
-            )
-            return self._create_error_response(user_message, start_time)
+        except Exception as e:
+            return self._handle_analysis_error(e, user_request, start_ns)
+    
+    async def analyze_requests(
+        self,
+        user_requests: List[UserRequest],
+        max_concurrency: int = 4
+    ) -> List[AgentResponse]:
+        """
+        Analyze several user requests concurrently
         
-        except (ValidationError, AmarValidationError) as e:
-            user_message, error_details = self.error_handler.handle_error(
-                e,
-                context={'agent': 'planner', 'session_id': user_request.session_id}
-            )
-            return self._create_error_response(user_message, start_time)
+        Requests run through analyze_request_async with at most max_concurrency
+        LLM calls in flight; per-session rate limits still apply.
         
-        except LLMAPIError as e:
-            user_message, error_details = self.error_handler.handle_error(
-                e,
-                context={'agent': 'planner', 'session_id': user_request.session_id}
-            )
-            return self._create_error_response(user_message, start_time)
+        Args:
+            user_requests: Requests to plan
+            max_concurrency: Maximum number of requests analyzed at once
+            
+        Returns:
+            One AgentResponse per request, in input order
+        """
+        semaphore = asyncio.Semaphore(max_concurrency)
         
-        except Exception as e:
-            user_message, error_details = self.error_handler.handle_error(
-                e,
-                context={'agent': 'planner', 'session_id': user_request.session_id}
-            )
-            return self._create_error_response(user_message, start_time)
+        async def analyze(user_request: UserRequest) -> AgentResponse:
+            async with semaphore:
+                return await self.analyze_request_async(user_request)
+        
+        return list(await asyncio.gather(*(analyze(request) for request in user_requests)))
+    
+    def _detect_and_log_backend(self, memory, description: str) -> Dict[str, Any]:
+        """Detect backend requirements and record the result in episodic memory"""
+        backend_detection = self.detect_backend_requirements(description)
+        
+        # Log backend detection results
+        memory.add_entry(
+            agent='planner',
+            action='backend_detection',
+            data={
+                'user_description': description,
+                'needs_backend': backend_detection['needs_backend'],
+                'detected_categories': backend_detection['detected_categories'],
+                'suggested_endpoints': backend_detection['suggested_endpoints'],
+                'confidence': backend_detection['confidence']
+            },
+            tags=['backend_detection', 'analysis'],
+            importance=0.8
+        )
+        
+        return backend_detection
+    
+    def _lookup_cached_plan(self, description: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Look up a plan for an identical or similar request
+        
+        Cache hits skip both the rate-limit check and the LLM call.
+        
+        Returns:
+            Dictionary with the cached plan_dict (None on a miss) and the keys
+            needed to store a freshly generated plan
+        """
+        context_key = context_fingerprint(context)
+        exact_key = LLMCache.cache_key(
+            self.model_name,
+            f"{description}\n{context_key}",
+            temperature=0.3,
+            allow_sampled=True
+        )
+        plan_dict = self.llm_cache.get(exact_key)
+        exact_hit = plan_dict is not None
+        vector = None
+        if not exact_hit and self._semantic_cache_ready():
+            # Embedded once; the same vector is reused to store a fresh plan
+            vector = self.plan_cache.embed(description)
+            plan_dict = self.plan_cache.get(description, context_key, vector=vector)
+        self.stats['hits' if plan_dict is not None else 'misses'] += 1
+        
+        return {
+            'plan_dict': plan_dict,
+            'context_key': context_key,
+            'exact_key': exact_key,
+            'exact_hit': exact_hit,
+            'vector': vector
+        }
+    
+    def _semantic_cache_ready(self) -> bool:
+        """Enable the semantic plan cache with the RAG retriever's model once RAG is running"""
+        if self.settings.disable_semantic_cache or self.settings.disable_rag:
+            return False
+        if not self.plan_cache.enabled:
+            rag_service = get_rag_service()
+            if not rag_service.is_enabled or rag_service.rag_pipeline is None:
+                return False
+            self.plan_cache.use_encoder(rag_service.rag_pipeline.retriever.model)
+        return True
+    
+    def _complete_analysis(
+        self,
+        user_request: UserRequest,
+        memory,
+        backend_detection: Dict[str, Any],
+        lookup: Dict[str, Any],
+        plan_dict: Dict,
+        start_ns: int,
+        store_plan: bool = True
+    ) -> AgentResponse:
+        """
+        Validate the plan, update the caches and memory, and build the response
+        
+        Pass store_plan=False to skip the cache update and call _store_plan
+        separately (the async path runs it in a worker thread).
+        """
+        plan_from_cache = lookup['plan_dict'] is not None
+        
+        # Validate plan completeness and structure; the Plan object built by the
+        # check is reused so the dictionary is only run through Pydantic once
+        structure_validation, plan = check_plan_completeness(plan_dict)
+        if not structure_validation['valid']:
+            raise ValidationError(f"Plan completeness validation failed: {structure_validation['errors']}")
+        
+        # Only cache plans that passed validation
+        if store_plan:
+            self._store_plan(user_request.description, lookup, plan_dict)
+        
+        # Dump once; memory and the response share the (read-only) payload
+        plan_payload = plan.model_dump()
+        
+        # Store plan in episodic memory with validation results
+        memory.add_entry(
+            agent='planner',
+            action='plan_generated',
+            data={
+                'user_description': user_request.description,
+                'plan': plan_payload,
+                'page_count': len(plan.pages),
+                'has_backend': plan.backend_logic is not None,
+                'backend_detection': backend_detection,
+                'validation_summary': structure_validation['summary'],
+                'validation_warnings': structure_validation['warnings'],
+                'from_cache': plan_from_cache
+            },
+            tags=['planning', 'user_request', 'validated'],
+            importance=1.0
+        )
+        
+        execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
+        
+        return AgentResponse(
+            agent_name='planner',
+            success=True,
+            output={'plan': plan_payload},
+            errors=[],
+            execution_time_ms=execution_time
+        )
+    
+    def _store_plan(self, description: str, lookup: Dict[str, Any], plan_dict: Dict) -> None:
+        """Write a validated plan to the exact and semantic caches (blocking I/O)"""
+        if not lookup['exact_hit']:
+            self.llm_cache.put(lookup['exact_key'], plan_dict)
+        if lookup['plan_dict'] is None and lookup['vector'] is not None:
+            self.plan_cache.put(description, plan_dict, lookup['context_key'], vector=lookup['vector'])
+            self._unsaved_plans += 1
+            if self._unsaved_plans >= SEMANTIC_CACHE_SAVE_EVERY:
+                self.save_plan_cache()
+    
+    def save_plan_cache(self) -> None:
+        """Persist the semantic plan cache if a path is configured and it has new plans"""
+        if not self.settings.semantic_cache_path or self._unsaved_plans == 0:
+            return
+        self._unsaved_plans = 0
+        try:
+            self.plan_cache.save(self.settings.semantic_cache_path)
+        except OSError as e:
+            logger.warning(f"Failed to save semantic plan cache: {e}")
+    
+    def _handle_analysis_error(self, error: Exception, user_request: UserRequest, start_ns: int) -> AgentResponse:
+        """Report a planning failure (rate limit, validation, LLM or unexpected error)"""
+        user_message, error_details = self.error_handler.handle_error(
+            error,
+            context={'agent': 'planner', 'session_id': user_request.session_id}
+        )
+        return self._create_error_response(user_message, start_ns)
     
     def _generate_plan_with_llm(self, description: str, context: Dict[str, Any], session_id: str) -> Dict:
         """
@@ -209,14 +572,7 @@ class PlannerAgent:
             
         Validates: Requirements 10.4, 10.5
         """
-        # Check rate limit before making LLM call
-        try:
-            self.rate_limiter.check_and_increment(session_id)
-        except RateLimitExceeded as e:
-            raise RateLimitExceeded(str(e))
-        
-        # Create structured prompt for plan generation
-        prompt = self._create_planning_prompt(description, context)
+        prompt = self._prepare_llm_prompt(description, context, session_id)
         
         # Call LLM directly - let LangChain handle retries naturally
         try:
@@ -234,14 +590,49 @@ class PlannerAgent:
             
         except Exception as e:
             # If LLM call fails, raise error immediately
-            raise LLMAPIError(
-                f"LLM plan generation failed: {str(e)}",
-                details={
-                    'agent': 'planner',
-                    'error_type': type(e).__name__
-                },
-                recoverable=False
-            )
+            raise self._plan_generation_error(e)
+    
+    async def _generate_plan_with_llm_async(self, description: str, context: Dict[str, Any], session_id: str) -> Dict:
+        """
+        Async variant of _generate_plan_with_llm
+        
+        Gemini is called through LangChain's ainvoke; the OpenAI and Groq
+        clients are synchronous, so they run in a worker thread.
+        """
+        prompt = self._prepare_llm_prompt(description, context, session_id)
+        
+        try:
+            if self.use_custom_client:
+                response_text = await asyncio.to_thread(
+                    self.llm_client.generate_content, prompt, temperature=0.3, max_tokens=4000
+                )
+            else:
+                response = await self.llm.ainvoke(prompt)
+                response_text = response.content
+            
+            return self._extract_json_from_response(response_text)
+            
+        except Exception as e:
+            raise self._plan_generation_error(e)
+    
+    def _prepare_llm_prompt(self, description: str, context: Dict[str, Any], session_id: str) -> str:
+        """Check the session rate limit and build the planning prompt"""
+        # Check rate limit before making LLM call (raises RateLimitExceeded)
+        self.rate_limiter.check_and_increment(session_id)
+        
+        # Create structured prompt for plan generation
+        return self._create_planning_prompt(description, context)
+    
+    def _plan_generation_error(self, error: Exception) -> LLMAPIError:
+        """Wrap an LLM or parsing failure as a non-recoverable LLMAPIError"""
+        return LLMAPIError(
+            f"LLM plan generation failed: {str(error)}",
+            details={
+                'agent': 'planner',
+                'error_type': type(error).__name__
+            },
+            recoverable=False
+        )
     
     def _create_planning_prompt(self, description: str, context: Dict[str, Any]) -> str:
         """
@@ -256,195 +647,90 @@ class PlannerAgent:
         """
         context_str = ""
         if context.get('relevant_context'):
-            context_str = f"""
-Previous context from this session:
-{json.dumps(context['relevant_context'], indent=2)}
-"""
+            context_str = self._render_context(context)
         
-        prompt = f"""
-You are a web application planner. Analyze the user's request and create a detailed implementation plan for a React application.
-
-{context_str}
-
-User Request: "{description}"
-
-IMPORTANT CONSTRAINTS:
-- Maximum 5 pages allowed
-- Generate React components with TypeScript
-- Include routing configuration
-- Detect if backend API endpoints are needed
-- Make reasonable assumptions for ambiguous requirements
-
-BACKEND REQUIREMENT DETECTION:
-Carefully analyze the user request for these indicators that backend logic is needed:
-- Forms that submit data (contact forms, signup forms, feedback forms)
-- Data validation or processing (email validation, input sanitization)
-- API calls or data fetching
-- User interactions that require server-side logic
-- Any mention of "submit", "send", "save", "process", "validate"
-- Features like search, filtering, or data manipulation
-
-If ANY of these indicators are present, include backend_logic with appropriate endpoints.
-
-Generate a JSON response with this exact structure:
-
-{{
-    "pages": [
-        {{
-            "name": "HomePage",
-            "route": "/",
-            "components": ["Header", "Hero", "Footer"],
-            "description": "Main landing page with hero section"
-        }}
-    ],
-    "components": [
-        {{
-            "name": "Header",
-            "type": "functional",
-            "props": {{"title": "string", "showNav": "boolean"}},
-            "description": "Navigation header component"
-        }}
-    ],
-    "routing": {{
-        "base_path": "/",
-        "routes": [
-            {{"path": "/", "component": "HomePage"}},
-            {{"path": "/about", "component": "AboutPage"}}
-        ],
-        "navigation_links": [
-            {{"label": "Home", "path": "/"}},
-            {{"label": "About", "path": "/about"}}
-        ]
-    }},
-    "backend_logic": {{
-        "endpoints": [
-            {{"method": "POST", "path": "/api/contact", "handler": "handleContact", "description": "Handle contact form submission"}}
-        ],
-        "middleware": ["cors", "bodyParser"],
-        "dependencies": ["express"]
-    }},
-    "estimated_complexity": "simple"
-}}
-
-BACKEND ENDPOINT SPECIFICATION:
-- Each endpoint MUST have: method (GET/POST/PUT/DELETE), path, handler name, and description
-- Common patterns:
-  * Contact forms: POST /api/contact
-  * Search: GET /api/search
-  * Form validation: POST /api/validate
-  * Data submission: POST /api/submit
-- Include "cors" and "bodyParser" in middleware for API endpoints
-- Include "express" in dependencies for backend logic
-
-If no backend logic is needed (purely static content), set "backend_logic" to null.
-Complexity should be "simple", "medium", or "complex".
-
-Respond ONLY with valid JSON. No additional text or explanation.
-"""
-        return prompt
+        return f'{_PLANNING_PROMPT_PREFIX}{context_str}\n\nUser Request: "{description}"{_PLANNING_PROMPT_SUFFIX}'
     
-    def _extract_json_from_response(self, response_text: str) -> Dict:
+    def _render_context(self, context: Dict[str, Any]) -> str:
         """
-        Extract and parse JSON from LLM response
+        Render the session context block of the planning prompt
         
-        Args:
-            response_text: Raw response from LLM
-            
-        Returns:
-            Parsed JSON dictionary
+        The rendered text is reused until the session's relevant context
+        changes, as reported by the memory's context_version.
         """
-        try:
-            # Try to find JSON in the response
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                json_str = json_match.group(0)
-                return json.loads(json_str)
-            else:
-                # If no JSON found, try parsing the entire response
-                return json.loads(response_text.strip())
-                
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in LLM response: {str(e)}\nResponse: {response_text}")
+        session_id = context.get('session_id')
+        version = context.get('context_version')
+        with self._context_cache_lock:
+            cached = self._context_cache.get(session_id)
+            if version is not None and cached is not None and cached[0] == version:
+                self._context_cache.move_to_end(session_id)
+                return cached[1]
+        
+        rendered = f"""
+Previous context from this session:
+{_dumps(context['relevant_context'], pretty=True)}
+"""
+        if version is not None:
+            with self._context_cache_lock:
+                self._context_cache[session_id] = (version, rendered)
+                self._context_cache.move_to_end(session_id)
+                while len(self._context_cache) > CONTEXT_CACHE_SESSIONS:
+                    self._context_cache.popitem(last=False)
+        return rendered
     
-    def _validate_and_create_plan(self, plan_dict: Dict) -> Plan:
+    def _extract_json_from_response(self, response_text: Union[str, Dict]) -> Dict:
         """
-        Validate plan dictionary and create Plan object
+        Extract and parse JSON from LLM response
         
         Args:
-            plan_dict: Dictionary containing plan data from LLM
+            response_text: Raw response from LLM, or an already-parsed plan
+                dictionary (as returned by stub clients), which is used as-is
             
         Returns:
-            Validated Plan object
-            
-        Raises:
-            ValidationError: If plan validation fails
-        """
-        try:
-            # Create PageSpec objects
-            pages = []
-            for page_data in plan_dict.get('pages', []):
-                page = PageSpec(**page_data)
-                pages.append(page)
-            
-            # Create ComponentSpec objects
-            components = []
-            for comp_data in plan_dict.get('components', []):
-                component = ComponentSpec(**comp_data)
-                components.append(component)
-            
-            # Create RoutingConfig object
-            routing_data = plan_dict.get('routing', {})
-            routing = RoutingConfig(**routing_data)
-            
-            # Create BackendSpec object if backend logic is specified
-            backend_logic = None
-            if plan_dict.get('backend_logic'):
-                backend_logic = BackendSpec(**plan_dict['backend_logic'])
-            
-            # Create and validate Plan object
-            plan = Plan(
-                pages=pages,
-                components=components,
-                routing=routing,
-                backend_logic=backend_logic,
-                estimated_complexity=plan_dict.get('estimated_complexity', 'simple')
-            )
-            
-            return plan
-            
-        except Exception as e:
-            raise ValidationError(f"Plan validation failed: {str(e)}")
-    
-    def _validate_page_count(self, pages: List[PageSpec]) -> None:
+            Parsed JSON dictionary
         """
-        Validate that page count doesn't exceed maximum limit
+        if isinstance(response_text, dict):
+            return response_text
         
-        Args:
-            pages: List of page specifications
-            
-        Raises:
-            ValueError: If page count exceeds 5
+        try:
+            # Decode the first complete object starting at a brace, ignoring
+            # trailing text. raw_decode stops at the end of that object (or at
+            # the first syntax error), so a runaway response is never scanned
+            # to its last brace and there is no regex backtracking.
+            start = response_text.find('{')
+            error = None
+            for _attempt in range(MAX_JSON_CANDIDATES):
+                if start == -1:
+                    break
+                try:
+                    plan_dict, _ = _JSON_DECODER.raw_decode(response_text, start)
+                    return plan_dict
+                except json.JSONDecodeError as e:
+                    # Prose such as "{braces}" may precede the JSON; try the next brace
+                    error = error or e
+                    start = response_text.find('{', start + 1)
+            
+            if error is not None:
+                raise error
+            
+            # If no JSON object found, try parsing the entire response
+            return json.loads(response_text.strip())
             
-        Validates: Requirements 1.5, 12.3
-        """
-        if len(pages) > 5:
-            raise ValueError(f"Page count ({len(pages)}) exceeds maximum of 5 pages")
-        
-        if len(pages) == 0:
-            raise ValueError("At least one page must be specified")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in LLM response: {str(e)}\nResponse: {response_text}")
     
-    def _create_error_response(self, error_msg: str, start_time: datetime) -> AgentResponse:
+    def _create_error_response(self, error_msg: str, start_ns: int) -> AgentResponse:
         """
         Create standardized error response
         
         Args:
             error_msg: Error message to include
-            start_time: When the operation started
+            start_ns: time.perf_counter_ns() reading taken when the operation started
             
         Returns:
             AgentResponse with error details
         """
-        execution_time = int((datetime.now() - start_time).total_seconds() * 1000)
+        execution_time = (time.perf_counter_ns() - start_ns) // 1_000_000
         
         return AgentResponse(
             agent_name='planner',
@@ -469,68 +755,37 @@ Respond ONLY with valid JSON. No additional text or explanation.
             
         Validates: Requirements 13.1
         """
-        description_lower = description.lower()
-        
-        # Keywords that indicate backend logic is needed
-        backend_indicators = {
-            'form_submission': ['submit', 'send', 'contact form', 'signup', 'register', 'feedback'],
-            'data_processing': ['validate', 'process', 'calculate', 'compute', 'analyze'],
-            'api_interaction': ['api', 'fetch', 'retrieve', 'get data', 'load data'],
-            'search': ['search', 'filter', 'query', 'find'],
-            'user_actions': ['save', 'store', 'update', 'delete', 'create']
-        }
+        # One regex pass collects every category and endpoint trigger present
+        matched = 0
+        for term in _KEYWORD_RE.findall(description.lower()):
+            matched |= _KEYWORD_MASKS[term]
         
         detected_categories = []
         suggested_endpoints = []
         
         # Check for form submission indicators
-        if any(keyword in description_lower for keyword in backend_indicators['form_submission']):
+        if matched & _FORM_SUBMISSION:
             detected_categories.append('form_submission')
-            if 'contact' in description_lower:
-                suggested_endpoints.append({
-                    'method': 'POST',
-                    'path': '/api/contact',
-                    'handler': 'handleContact',
-                    'description': 'Handle contact form submission'
-                })
-            if 'signup' in description_lower or 'register' in description_lower:
-                suggested_endpoints.append({
-                    'method': 'POST',
-                    'path': '/api/signup',
-                    'handler': 'handleSignup',
-                    'description': 'Handle user signup'
-                })
-            if 'feedback' in description_lower:
-                suggested_endpoints.append({
-                    'method': 'POST',
-                    'path': '/api/feedback',
-                    'handler': 'handleFeedback',
-                    'description': 'Handle feedback submission'
-                })
+            if matched & _CONTACT:
+                suggested_endpoints.append(_ENDPOINT_CONTACT)
+            if matched & _SIGNUP:
+                suggested_endpoints.append(_ENDPOINT_SIGNUP)
+            if matched & _FEEDBACK:
+                suggested_endpoints.append(_ENDPOINT_FEEDBACK)
         
         # Check for data processing indicators
-        if any(keyword in description_lower for keyword in backend_indicators['data_processing']):
+        if matched & _DATA_PROCESSING:
             detected_categories.append('data_processing')
-            if 'validate' in description_lower:
-                suggested_endpoints.append({
-                    'method': 'POST',
-                    'path': '/api/validate',
-                    'handler': 'handleValidation',
-                    'description': 'Validate user input'
-                })
+            if matched & _VALIDATE:
+                suggested_endpoints.append(_ENDPOINT_VALIDATE)
         
         # Check for search indicators
-        if any(keyword in description_lower for keyword in backend_indicators['search']):
+        if matched & _SEARCH:
             detected_categories.append('search')
-            suggested_endpoints.append({
-                'method': 'GET',
-                'path': '/api/search',
-                'handler': 'handleSearch',
-                'description': 'Handle search queries'
-            })
+            suggested_endpoints.append(_ENDPOINT_SEARCH)
         
         # Check for API interaction indicators
-        if any(keyword in description_lower for keyword in backend_indicators['api_interaction']):
+        if matched & _API_INTERACTION:
             detected_categories.append('api_interaction')
         
         needs_backend = len(detected_categories) > 0
@@ -557,9 +812,10 @@ Respond ONLY with valid JSON. No additional text or explanation.
             'component_count': len(plan.components),
             'has_backend': plan.backend_logic is not None,
             'complexity': plan.estimated_complexity,
-            'routes': [route['path'] for route in plan.routing.routes],
+            'routes': [route.path for route in plan.routing.routes],
             'backend_endpoints': [
                 f"{ep['method']} {ep['path']}" 
                 for ep in (plan.backend_logic.endpoints if plan.backend_logic else [])
-            ]
+            ],
+            'cache_stats': dict(self.stats)
         }
\ No newline at end of file
@@ -3,11 +3,13 @@ Configuration management for AMAR MVP Backend
 """
 
 import os
+from functools import cached_property, lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
+# Load environment variables from .env file (the only place .env is parsed;
+# Settings reads the resulting process environment)
 load_dotenv()
 
 
@@ -47,23 +49,32 @@ class Settings(BaseSettings):
     # RAG Configuration
     disable_rag: bool = False
     
-    model_config = {"env_file": ".env", "case_sensitive": False}
+    # Planner Semantic Cache
+    disable_semantic_cache: bool = False
+    semantic_cache_path: str = ""  # Persist cached plans here for warm starts (empty = in-memory only)
+    llm_cache_redis_url: str = ""  # Share exact-match plan cache across workers (empty = in-memory)
+    
+    # Session Storage
+    session_redis_url: str = ""  # Share session state across workers (empty = in-memory)
+    
+    model_config = {"case_sensitive": False}
     
     @property
     def is_production(self) -> bool:
         """Check if running in production environment"""
         return self.environment.lower() == "production"
     
-    @property
+    @cached_property
     def cors_origins_list(self) -> list:
-        """Get CORS origins as a list"""
+        """Get CORS origins as a list (split once per Settings instance)"""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
 
-# Global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Get application settings (loaded and validated once per process)"""
+    return Settings()
 
 
-def get_settings() -> Settings:
-    """Get application settings"""
-    return settings
\ No newline at end of file
+# Global settings instance, loaded eagerly so invalid configuration fails at import
+settings = get_settings()
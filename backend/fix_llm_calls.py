@@ -1,17 +1,32 @@
+import ast
 import re
 
+# Routes direct self.llm.invoke(prompt) code-generation calls through
+# self._call_llm() and normalizes the indentation of the following return,
+# in a single read/parse/write pass over builder.py
+LLM_CALL_PATTERN = re.compile(
+    r'^(?P<indent>[ \t]*)(?:response = self\.llm\.invoke\(prompt\)|response_text = self\._call_llm\(prompt\))\n'
+    r'[ \t]*return self\._extract_code_from_response\((?:response\.content|response_text)\)',
+    re.MULTILINE
+)
+REPLACEMENT = (
+    r'\g<indent>response_text = self._call_llm(prompt)\n'
+    r'\g<indent>return self._extract_code_from_response(response_text)'
+)
+
 # Read the file
 with open('agents/builder.py', 'r', encoding='utf-8') as f:
     content = f.read()
 
-# Replace all occurrences
-content = content.replace(
-    'response = self.llm.invoke(prompt)\n                return self._extract_code_from_response(response.content)',
-    'response_text = self._call_llm(prompt)\n                return self._extract_code_from_response(response_text)'
-)
+# Rewrite every call site at once
+fixed, count = LLM_CALL_PATTERN.subn(REPLACEMENT, content)
 
-# Write back
-with open('agents/builder.py', 'w', encoding='utf-8') as f:
-    f.write(content)
+# Already-fixed files are a no-op: no parse check and no write
+if fixed != content:
+    # Refuse to write a module that no longer parses
+    ast.parse(fixed)
+    
+    with open('agents/builder.py', 'w', encoding='utf-8') as f:
+        f.write(fixed)
 
-print("Fixed all LLM calls in builder.py")
+print(f"Fixed {count} LLM call sites in builder.py")
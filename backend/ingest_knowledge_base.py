@@ -3,12 +3,21 @@ Ingest Knowledge Base into RAG System
 Run this once to build the FAISS index
 """
 import os
-# Disable multiprocessing to avoid segmentation faults on macOS
-os.environ['TOKENIZERS_PARALLELISM'] = 'false'
-os.environ['OMP_NUM_THREADS'] = '1'
+import sys
+
+if sys.platform == 'darwin':
+    # Disable multiprocessing to avoid segmentation faults on macOS
+    os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+    os.environ['OMP_NUM_THREADS'] = '1'
+else:
+    # Elsewhere keep tokenizer and BLAS threads on for the CPU-bound encode step
+    os.environ.setdefault('TOKENIZERS_PARALLELISM', 'true')
+    os.environ.setdefault('OMP_NUM_THREADS', str(max(1, (os.cpu_count() or 2) - 1)))
 
 from services.rag_retriever import RAGPipeline
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import shelve
 import time
 
 print("="*70)
@@ -37,55 +46,118 @@ if not kb_dir.exists():
     print("Please ensure knowledge_base directory exists with .md files")
     exit(1)
 
-md_files = list(kb_dir.rglob("*.md"))
+
+def _walk_md(root):
+    """Yield markdown files under root using os.scandir (one stat per entry)"""
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.name.endswith(".md"):
+                    yield Path(entry.path)
+
+
+md_files = list(_walk_md(str(kb_dir)))
 print(f"Found {len(md_files)} documents")
 
 if len(md_files) == 0:
     print("❌ No markdown files found in knowledge base")
     exit(1)
 
-# Ingest each file
+# Read files concurrently (I/O bound) and embed them in micro-batches of
+# documents, so encoding a full batch overlaps with the remaining reads
 print("\n[3/4] Ingesting documents...")
 start_time = time.time()
 
-for i, file_path in enumerate(md_files, 1):
+INGEST_BATCH_DOCUMENTS = 64
+PROGRESS_EVERY = 25  # Successful files are reported every Nth file; failures always
+
+
+def _read(file_path):
+    return file_path.read_bytes().decode("utf-8")
+
+
+def _ingest_batch(texts, metadatas, embedding_cache):
+    """Ingest one batch; a failure is reported with its files and skipped"""
     try:
-        # Read file
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        rag.ingest_documents(texts, metadatas, embedding_cache=embedding_cache)
+    except Exception as e:
+        print(f"  ✗ Batch of {len(texts)} documents failed: {e}")
+        for metadata in metadatas:
+            print(f"      - {metadata['source']}")
+        failed_files.extend(metadata['source'] for metadata in metadatas)
+        return 0
+    return len(texts)
+
+
+texts = []
+metadatas = []
+documents_ingested = 0
+failed_files = []
+
+# Embeddings of unchanged files are reused from the content-addressed cache
+embedding_cache_path = backend_dir / "amar_kb_embed_cache"
+
+with ThreadPoolExecutor(max_workers=16) as executor, shelve.open(str(embedding_cache_path)) as embedding_cache:
+    futures = [executor.submit(_read, file_path) for file_path in md_files]
+    
+    for i, (file_path, future) in enumerate(zip(md_files, futures), 1):
+        try:
+            content = future.result()
+        except Exception as e:
+            print(f"  [{i}/{len(md_files)}] ✗ {file_path.name}: {e}")
+            continue
         
         # Determine category from path
         category = file_path.parent.name
         
         # Create metadata
-        metadata = {
+        texts.append(content)
+        metadatas.append({
             "source": str(file_path),
             "domain": "web_development",
             "category": category,
             "filename": file_path.name
-        }
-        
-        rag.ingest_document(content, metadata)
-        print(f"  [{i}/{len(md_files)}] ✓ {file_path.name}")
+        })
+        if i % PROGRESS_EVERY == 0 or i == len(md_files):
+            print(f"  [{i}/{len(md_files)}] ✓ {file_path.name}")
         
-    except Exception as e:
-        print(f"  [{i}/{len(md_files)}] ✗ {file_path.name}: {e}")
+        # Flush each full batch; the remainder is flushed after the loop
+        if len(texts) >= INGEST_BATCH_DOCUMENTS:
+            documents_ingested += _ingest_batch(texts, metadatas, embedding_cache)
+            texts = []
+            metadatas = []
+    
+    if texts:
+        documents_ingested += _ingest_batch(texts, metadatas, embedding_cache)
 
 elapsed_time = time.time() - start_time
 
-# Save the pipeline to backend directory
+# Save the pipeline to backend directory in the background so the
+# summary below overlaps with the pickle and FAISS index writes
 output_path = backend_dir / "amar_knowledge_base.pkl"
 print(f"\n[4/4] Saving RAG pipeline to {output_path}...")
-rag.save(str(output_path))
+with ThreadPoolExecutor(max_workers=1) as saver:
+    save_future = saver.submit(rag.save, str(output_path))
+    
+    # Summary
+    print("\n" + "="*70)
+    print("INGESTION COMPLETE")
+    print("="*70)
+    print(f"Documents ingested: {documents_ingested}")
+    if failed_files:
+        print(f"Documents skipped (failed batches): {len(failed_files)}")
+    print(f"Total chunks: {len(rag.retriever.chunks)}")
+    print(f"Time taken: {elapsed_time:.2f} seconds")
+    print(f"Saved to: {output_path}")
+    print(f"Index file: {output_path}.index")
+    print(f"Embedding cache: {embedding_cache_path}")
+    
+    # Wait for the write to finish (re-raises if saving failed)
+    save_future.result()
 
-# Summary
-print("\n" + "="*70)
-print("INGESTION COMPLETE")
-print("="*70)
-print(f"Documents ingested: {len(md_files)}")
-print(f"Total chunks: {len(rag.retriever.chunks)}")
-print(f"Time taken: {elapsed_time:.2f} seconds")
-print(f"Saved to: {output_path}")
-print(f"Index file: {output_path}.index")
 print("\n✅ Knowledge base is ready!")
 print("="*70)
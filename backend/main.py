@@ -7,16 +7,20 @@ Validates: Requirements 1.3, 9.1
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.exceptions import RequestValidationError
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
 import uvicorn
 import os
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import uuid
 import json
+import time
 from datetime import datetime
 from pydantic import ValidationError
 import asyncio
+import functools
+import itertools
+import orjson
 
 # Configure clean logging - only show phase transitions
 logging.basicConfig(
@@ -39,25 +43,40 @@ from services.error_handler import (
     SystemError as AmarSystemError
 )
 from services.graceful_failure import get_graceful_failure_handler
+from services.session_store import get_session_store
+from services.audit import audit_manager
+from workflow.orchestrator import get_orchestrator
 from config import get_settings
 
 # Get application settings
 settings = get_settings()
 
+# Process-wide singletons, resolved once instead of on every request
+error_handler = get_error_handler()
+graceful_failure = get_graceful_failure_handler()
+session_store = get_session_store()
+
 app = FastAPI(
     title="AMAR MVP Backend",
     description="Multi-agent web application for autonomous React app generation",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
-# Configure CORS with dynamic origins
-cors_origins = settings.cors_origins_list
+# Configure CORS with dynamic origins (copied, since the settings list is cached)
+cors_origins = list(settings.cors_origins_list)
 if settings.is_production:
     # In production, add the deployed frontend URL if available
     frontend_url = os.getenv("FRONTEND_URL")
     if frontend_url and frontend_url not in cors_origins:
         cors_origins.append(frontend_url)
 
+# Middleware added last runs outermost, so CORS must stay the final
+# add_middleware call: preflight requests are then answered before any other
+# layer runs. Custom middleware should be plain ASGI classes
+# (async __call__(scope, receive, send)) registered above this call, not
+# @app.middleware("http") or BaseHTTPMiddleware, which build Request/Response
+# objects and an extra task for every request.
 app.add_middleware(
     CORSMiddleware,
     allow_origins=cors_origins,
@@ -66,27 +85,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# In-memory storage for sessions (will be replaced with proper storage later)
-sessions: Dict[str, Dict[str, Any]] = {}
-active_connections: Dict[str, WebSocket] = {}
+# Session state lives in session_store (shareable across workers); WebSocket
+# connections and workflow tasks are bound to this process. Each connected
+# session has an outgoing message queue that a writer task drains onto its
+# WebSocket, so senders never await the network.
+WEBSOCKET_QUEUE_SIZE = 256
+PROGRESS_COALESCE_SECONDS = 0.02
+MAX_PROGRESS_BATCH = 32
+active_connections: Dict[str, asyncio.Queue] = {}
 workflow_tasks: Dict[str, asyncio.Task] = {}
 
+# WebSocket message timestamps only need coarse resolution, so the formatted
+# value is reused for every message sent within the same 50 ms tick
+MESSAGE_TIMESTAMP_RESOLUTION_S = 0.05
+_message_timestamp = [-1, ""]  # [tick, ISO timestamp]
+
+
+async def send_json_message(websocket: WebSocket, message: Dict[str, Any]) -> None:
+    """Send a JSON text frame, serialized with orjson instead of the stdlib encoder"""
+    await websocket.send_text(orjson.dumps(message, option=orjson.OPT_NON_STR_KEYS).decode())
+
+
+def push_message(session_id: str, message: Dict[str, Any]) -> None:
+    """Queue a message for the session's WebSocket, if one is connected"""
+    queue = active_connections.get(session_id)
+    if queue is None:
+        return
+    
+    if queue.full():
+        # Client is not keeping up; drop rather than stall the workflow
+        logging.warning(f"WebSocket queue full for session {session_id}, dropping message")
+        return
+    queue.put_nowait(message)
+
+
+def _release_connection(session_id: str, queue: asyncio.Queue) -> None:
+    """Unregister a connection's queue (unless a reconnect already replaced it)"""
+    if active_connections.get(session_id) is queue:
+        del active_connections[session_id]
+
+
+def _drop_backfilled(queue: asyncio.Queue, backfill: List[Dict[str, Any]]) -> None:
+    """
+    Remove queued updates that the backfill message already delivered
+    
+    The queue is registered before the session snapshot is read, so an update
+    pushed in between is both in the snapshot and queued. Must be called
+    before the writer starts consuming the queue.
+    """
+    pending = []
+    while not queue.empty():
+        message = queue.get_nowait()
+        if message.get("type") != "progress" or message not in backfill:
+            pending.append(message)
+    for message in pending:
+        queue.put_nowait(message)
+
+
+async def _websocket_writer(websocket: WebSocket, queue: asyncio.Queue) -> None:
+    """
+    Send queued messages in order until the connection fails or is closed
+    
+    Progress updates that arrive within PROGRESS_COALESCE_SECONDS of each
+    other are sent as one "progress_batch" frame; other message types are
+    always sent on their own, in queue order.
+    """
+    # Bound once for the life of the connection
+    send = websocket.send_text
+    dumps = orjson.dumps
+    
+    while True:
+        messages = [await queue.get()]
+        if messages[0].get("type") == "progress":
+            # Give the rest of a burst (e.g. builder file updates) time to queue
+            await asyncio.sleep(PROGRESS_COALESCE_SECONDS)
+        while not queue.empty() and len(messages) < MAX_PROGRESS_BATCH:
+            messages.append(queue.get_nowait())
+        
+        for frame in _coalesce_progress(messages):
+            await send(dumps(frame, option=orjson.OPT_NON_STR_KEYS).decode())
+
+
+def _coalesce_progress(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Merge each run of consecutive progress updates into one progress_batch frame"""
+    frames: List[Dict[str, Any]] = []
+    
+    for is_progress, group in itertools.groupby(messages, key=lambda m: m.get("type") == "progress"):
+        run = list(group)
+        if is_progress and len(run) > 1:
+            frames.append({
+                "type": "progress_batch",
+                "updates": run,
+                "timestamp": message_timestamp()
+            })
+        else:
+            frames.extend(run)
+    
+    return frames
+
+
+def message_timestamp() -> str:
+    """ISO 8601 timestamp for progress/WebSocket messages (50 ms resolution)"""
+    tick = int(time.monotonic() / MESSAGE_TIMESTAMP_RESOLUTION_S)
+    if tick != _message_timestamp[0]:
+        _message_timestamp[0] = tick
+        _message_timestamp[1] = datetime.now().isoformat()
+    return _message_timestamp[1]
+
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     """Handle Pydantic validation errors and return 400 status code"""
-    # Check if the error is related to our UserRequest description validation
-    for error in exc.errors():
-        if error.get('type') == 'value_error' and 'Description cannot be empty' in str(error.get('ctx', {})):
-            return JSONResponse(
-                status_code=400,
-                content={"detail": "Description cannot be empty"}
-            )
+    # UserRequest raises a typed error for empty descriptions, so matching on
+    # the error type is enough
+    errors = exc.errors()
+    if any(error['type'] == 'description_empty' for error in errors):
+        return ORJSONResponse(
+            status_code=400,
+            content={"detail": "Description cannot be empty"}
+        )
     
     # For other validation errors, return the default 422
-    return JSONResponse(
+    return ORJSONResponse(
         status_code=422,
-        content={"detail": exc.errors()}
+        content={"detail": errors}
     )
 
 
@@ -126,7 +248,6 @@ async def root():
     Validates: Requirements 8.3
     """
     rag_service = get_rag_service()
-    graceful_failure = get_graceful_failure_handler()
     
     # Get resource status
     resource_status = graceful_failure.get_resource_status()
@@ -145,7 +266,7 @@ async def root():
         "message": "AMAR MVP Backend is running",
         "status": overall_status,
         "version": "1.0.0",
-        "active_sessions": len(sessions),
+        "active_sessions": await session_store.count(),
         "active_connections": len(active_connections),
         "rag_enabled": rag_service.is_enabled,
         "resources": resource_status
@@ -153,7 +274,7 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(request: Request):
     """
     Dedicated health check endpoint for deployment platforms
     
@@ -166,8 +287,6 @@ async def health_check():
     Returns:
         JSON with status and basic health information
     """
-    graceful_failure = get_graceful_failure_handler()
-    
     # Get resource status
     resource_status = graceful_failure.get_resource_status()
     
@@ -177,6 +296,12 @@ async def health_check():
     
     is_healthy = memory_status != 'critical' and disk_status != 'critical'
     
+    # The ETag covers the health verdict (not the timestamp) so probes that
+    # send If-None-Match get a 304 while nothing has changed
+    etag = f'W/"{memory_status}-{disk_status}"'
+    if is_healthy and request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    
     response = {
         "status": "healthy" if is_healthy else "unhealthy",
         "timestamp": datetime.now().isoformat(),
@@ -186,10 +311,11 @@ async def health_check():
         }
     }
     
-    if is_healthy:
-        return response
-    else:
-        return JSONResponse(status_code=503, content=response)
+    return ORJSONResponse(
+        status_code=200 if is_healthy else 503,
+        content=response,
+        headers={"ETag": etag}
+    )
 
 
 @app.post("/api/rag/enable")
@@ -244,9 +370,9 @@ async def generate_application(request: UserRequest):
     updates are sent via WebSocket to connected clients.
     
     RAG-FAISS Integration Point:
-    Before passing the user query to LangGraph, this endpoint calls the
-    RAG service to retrieve relevant context from the knowledge base.
-    This enriches the user query with relevant information.
+    Before passing the user query to LangGraph, the background workflow
+    calls the RAG service to retrieve relevant context from the knowledge
+    base, so the session ID is returned without waiting for retrieval.
     
     Validates: Requirements 1.2, 1.3, 1.4, 7.1, 11.1, 11.2, 11.3
     
@@ -259,9 +385,6 @@ async def generate_application(request: UserRequest):
     Raises:
         HTTPException: 400 if description is empty or invalid
     """
-    error_handler = get_error_handler()
-    graceful_failure = get_graceful_failure_handler()
-    
     try:
         # Comprehensive input validation
         is_valid, error_msg = error_handler.validate_user_input(request.description)
@@ -294,39 +417,27 @@ async def generate_application(request: UserRequest):
         # Create new session
         session_id = request.session_id if request.session_id else str(uuid.uuid4())
         
-        # RAG-FAISS Integration: Retrieve relevant context from knowledge base
-        # This is the integration point for your friend's RAG-FAISS system
-        rag_service = get_rag_service()
+        description = request.description.strip()
         
-        try:
-            rag_result = await rag_service.retrieve_context(
-                user_query=request.description.strip(),
-                top_k=3  # Retrieve top 3 relevant documents (reduced to limit token usage)
-            )
-            enriched_description = rag_result["enriched_query"]
-        except Exception as rag_error:
-            # Log RAG error but don't fail the request
-            error_handler.handle_error(
-                rag_error,
-                context={'endpoint': '/api/generate', 'action': 'rag_retrieval'}
-            )
-            # Fallback to original description
-            enriched_description = request.description.strip()
-        
-        # Initialize session data
-        sessions[session_id] = {
-            "description": request.description.strip(),
-            "enriched_description": enriched_description,
-            "rag_metadata": rag_result.get("metadata", {}) if 'rag_result' in locals() else {},
+        # Initialize session data (RAG enrichment is filled in by the workflow)
+        await session_store.create(session_id, {
+            "description": description,
+            "enriched_description": description,
+            "rag_metadata": {},
             "status": "initiated",
             "created_at": datetime.now().isoformat(),
             "progress": [],
             "result": None,
             "workflow_state": None
-        }
+        })
         
-        # Start workflow execution in background with enriched description
-        task = asyncio.create_task(execute_workflow_background(session_id, enriched_description))
+        # Start workflow execution in background; it enriches the description
+        # with RAG context before running the agents
+        task = asyncio.create_task(
+            execute_workflow_background(session_id, description),
+            name=f"workflow-{session_id}"
+        )
+        task.add_done_callback(functools.partial(_cleanup_workflow_task, session_id))
         workflow_tasks[session_id] = task
         
         return GenerateResponse(
@@ -343,6 +454,36 @@ async def generate_application(request: UserRequest):
         raise HTTPException(status_code=500, detail=user_message)
 
 
+@app.post("/api/cancel/{session_id}")
+async def cancel_generation(session_id: str):
+    """
+    Cancel a running generation workflow
+    
+    Args:
+        session_id: Session identifier
+        
+    Returns:
+        JSON with the session ID and its new status
+        
+    Raises:
+        HTTPException: 404 if no workflow is running for the session
+    """
+    task = workflow_tasks.get(session_id)
+    if task is None or task.done():
+        raise HTTPException(status_code=404, detail="No running workflow for this session")
+    
+    task.cancel()
+    await session_store.update(session_id, status="cancelled")
+    push_message(session_id, {
+        "type": "error",
+        "message": "Workflow cancelled",
+        "error": "Generation was cancelled by the user",
+        "timestamp": message_timestamp()
+    })
+    
+    return {"session_id": session_id, "status": "cancelled"}
+
+
 @app.websocket("/ws/{session_id}")
 async def websocket_endpoint(websocket: WebSocket, session_id: str):
     """
@@ -360,7 +501,7 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         
     Message Format:
         {
-            "type": "connection" | "progress" | "error" | "complete",
+            "type": "connection" | "backfill" | "progress" | "error" | "complete",
             "agent": "planner" | "builder" | "deployer" | "tester",
             "status": "running" | "completed" | "failed",
             "message": "Human-readable status message",
@@ -369,61 +510,84 @@ async def websocket_endpoint(websocket: WebSocket, session_id: str):
         }
     """
     await websocket.accept()
-    active_connections[session_id] = websocket
+    
+    # Register before reading the session so no update falls between the
+    # history snapshot and the live stream
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WEBSOCKET_QUEUE_SIZE)
+    active_connections[session_id] = queue
+    writer = None
     
     try:
         # Verify session exists
-        if session_id not in sessions:
-            await websocket.send_json({
+        session = await session_store.get(session_id)
+        if session is None:
+            await send_json_message(websocket, {
                 "type": "error",
                 "message": f"Session {session_id} not found",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": message_timestamp()
             })
             await websocket.close()
             return
         
         # Send initial connection confirmation
-        await websocket.send_json({
+        await send_json_message(websocket, {
             "type": "connection",
             "message": "Connected to progress updates",
             "session_id": session_id,
-            "timestamp": datetime.now().isoformat()
+            "timestamp": message_timestamp()
         })
         
-        # Send any existing progress updates
-        session = sessions[session_id]
-        for progress in session.get("progress", []):
-            await websocket.send_json(progress)
+        # Replay the stored progress history in a single message
+        if session.progress:
+            backfill = list(session.progress)
+            await send_json_message(websocket, {
+                "type": "backfill",
+                "message": "Progress history",
+                "updates": backfill,
+                "timestamp": message_timestamp()
+            })
+            _drop_backfilled(queue, backfill)
+        
+        # From here on all outgoing messages go through the queue; the writer
+        # unregisters the connection once if sending fails
+        writer = asyncio.create_task(_websocket_writer(websocket, queue))
+        writer.add_done_callback(lambda _: _release_connection(session_id, queue))
         
         # Keep connection alive and listen for client messages
         while True:
             try:
-                # Receive messages from client (for keepalive)
-                data = await websocket.receive_text()
+                # Receive messages from client (for keepalive); the raw ASGI
+                # message is compared directly, so binary b"ping" frames work
+                # as well as text ones
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
                 
                 # Echo back to confirm connection is alive
-                if data == "ping":
-                    await websocket.send_json({
+                if message.get("text") == "ping" or message.get("bytes") == b"ping":
+                    push_message(session_id, {
                         "type": "pong",
-                        "timestamp": datetime.now().isoformat()
+                        "timestamp": message_timestamp()
                     })
                     
             except WebSocketDisconnect:
                 break
             except Exception as e:
                 # Log error but keep connection open
-                await websocket.send_json({
+                push_message(session_id, {
                     "type": "error",
                     "message": f"Error processing message: {str(e)}",
-                    "timestamp": datetime.now().isoformat()
+                    "timestamp": message_timestamp()
                 })
             
     except WebSocketDisconnect:
         pass
     finally:
         # Clean up connection
-        if session_id in active_connections:
-            del active_connections[session_id]
+        _release_connection(session_id, queue)
+        if writer is not None:
+            writer.cancel()
+            await asyncio.gather(writer, return_exceptions=True)
 
 
 @app.get("/api/result/{session_id}", response_model=DeploymentResult)
@@ -447,11 +611,11 @@ async def get_result(session_id: str):
     Raises:
         HTTPException: 404 if session not found
     """
-    if session_id not in sessions:
+    session = await session_store.get(session_id)
+    if session is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = sessions[session_id]
-    workflow_state = session.get("workflow_state")
+    workflow_state = session.workflow_state
     
     # Check if workflow has completed
     if not workflow_state:
@@ -519,6 +683,19 @@ async def get_result(session_id: str):
     )
 
 
+# Log prefix for each workflow phase
+PHASE_EMOJI = {
+    "supervisor": "🎯",
+    "rag": "📚",
+    "planner": "📋",
+    "builder": "🔨",
+    "tester": "🧪",
+    "deployer": "🚀",
+    "finalize": "✅",
+    "system": "⚠️"
+}
+
+
 async def send_progress_update(
     session_id: str,
     agent: str,
@@ -542,27 +719,17 @@ async def send_progress_update(
         message: Human-readable status message
         details: Optional additional details
     """
-    if session_id not in sessions:
+    if not await session_store.exists(session_id):
         return
     
-    # Log clean phase transition
-    phase_emoji = {
-        "supervisor": "🎯",
-        "planner": "📋",
-        "builder": "🔨",
-        "tester": "🧪",
-        "deployer": "🚀",
-        "finalize": "✅",
-        "system": "⚠️"
-    }
-    emoji = phase_emoji.get(agent, "▶️")
-    
+    # Log clean phase transition (lazy arguments: nothing is formatted when
+    # the level is disabled)
     if status == "running":
-        logging.info(f"{emoji} {agent.upper()}: {message}")
+        logging.info("%s %s: %s", PHASE_EMOJI.get(agent, "▶️"), agent.upper(), message)
     elif status == "completed":
-        logging.info(f"✓ {agent.upper()}: {message}")
+        logging.info("✓ %s: %s", agent.upper(), message)
     elif status == "failed":
-        logging.error(f"✗ {agent.upper()}: {message}")
+        logging.error("✗ %s: %s", agent.upper(), message)
     
     # Create progress update
     update = {
@@ -571,20 +738,69 @@ async def send_progress_update(
         "status": status,
         "message": message,
         "details": details,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": message_timestamp()
     }
     
     # Store in session history
-    sessions[session_id]["progress"].append(update)
+    await session_store.append_progress(session_id, update)
     
     # Send to active WebSocket connection if exists
-    if session_id in active_connections:
-        try:
-            await active_connections[session_id].send_json(update)
-        except Exception as e:
-            # Connection may have closed, remove it
-            if session_id in active_connections:
-                del active_connections[session_id]
+    push_message(session_id, update)
+
+
+def _cleanup_workflow_task(session_id: str, task: asyncio.Task) -> None:
+    """Forget a finished workflow task and log anything it failed to handle"""
+    if workflow_tasks.get(session_id) is task:
+        del workflow_tasks[session_id]
+    
+    if task.cancelled():
+        logging.info("Workflow cancelled for session %s", session_id)
+    elif task.exception() is not None:
+        logging.error("Workflow task for session %s failed", session_id, exc_info=task.exception())
+
+
+async def enrich_with_rag_context(session_id: str, description: str) -> str:
+    """
+    Retrieve knowledge base context for a description
+    
+    Runs at the start of the background workflow so that /api/generate can
+    return immediately; RAG failures fall back to the original description.
+    
+    Args:
+        session_id: Session identifier for tracking
+        description: User's application description
+        
+    Returns:
+        Enriched description (or the original on failure)
+    """
+    rag_service = get_rag_service()
+    if not rag_service.is_enabled:
+        return description
+    
+    await send_progress_update(session_id, "rag", "running", "Retrieving relevant context", None)
+    
+    try:
+        rag_result = await rag_service.retrieve_context(
+            user_query=description,
+            top_k=3  # Retrieve top 3 relevant documents (reduced to limit token usage)
+        )
+    except Exception as rag_error:
+        # Log RAG error but don't fail the workflow
+        error_handler.handle_error(
+            rag_error,
+            context={'session_id': session_id, 'action': 'rag_retrieval'}
+        )
+        await send_progress_update(session_id, "rag", "failed", "Context retrieval failed, continuing without it", None)
+        return description
+    
+    enriched_description = rag_result["enriched_query"]
+    await session_store.update(
+        session_id,
+        enriched_description=enriched_description,
+        rag_metadata=rag_result.get("metadata", {})
+    )
+    await send_progress_update(session_id, "rag", "completed", "Context retrieved", None)
+    return enriched_description
 
 
 async def execute_workflow_background(session_id: str, user_input: str):
@@ -601,9 +817,6 @@ async def execute_workflow_background(session_id: str, user_input: str):
         session_id: Session identifier for tracking
         user_input: User's application description
     """
-    error_handler = get_error_handler()
-    graceful_failure = get_graceful_failure_handler()
-    
     try:
         # Check system resources before starting with graceful handling
         can_continue, resource_error = graceful_failure.check_and_handle_resources()
@@ -613,11 +826,11 @@ async def execute_workflow_background(session_id: str, user_input: str):
                 details={'session_id': session_id, 'phase': 'pre_workflow'}
             )
         
-        # Import orchestrator
-        from workflow.orchestrator import get_orchestrator
-        
         # Update session status
-        sessions[session_id]["status"] = "running"
+        await session_store.update(session_id, status="running")
+        
+        # RAG-FAISS Integration: enrich the query with knowledge base context
+        user_input = await enrich_with_rag_context(session_id, user_input)
         
         # Send initial progress update
         await send_progress_update(
@@ -657,11 +870,11 @@ async def execute_workflow_background(session_id: str, user_input: str):
             }
         
         # Store final state in session
-        sessions[session_id]["workflow_state"] = final_state
+        await session_store.update(session_id, workflow_state=final_state)
         
         # Determine final status
         if final_state.get("workflow_status") == "completed":
-            sessions[session_id]["status"] = "completed"
+            await session_store.update(session_id, status="completed")
             
             # Send completion update
             await send_progress_update(
@@ -674,31 +887,24 @@ async def execute_workflow_background(session_id: str, user_input: str):
             
             # Send final complete message with generated files if deployment failed
             if session_id in active_connections:
-                try:
-                    complete_message = {
-                        "type": "complete",
-                        "message": "Workflow completed successfully",
-                        "deployment_url": final_state.get("deployment_url"),
-                        "execution_time_ms": final_state.get("execution_time_ms"),
-                        "timestamp": datetime.now().isoformat()
-                    }
-                    
-                    # Include generated files if deployment failed
-                    if not final_state.get("deployment_url") and final_state.get("generated_files"):
-                        complete_message["generated_files"] = final_state.get("generated_files")
-                        complete_message["file_list"] = final_state.get("file_list", [])
-                        complete_message["project_location"] = final_state.get("project_location")
-                        complete_message["deployment_error"] = final_state.get("deployment_error")
-                    
-                    await active_connections[session_id].send_json(complete_message)
-                except Exception as ws_error:
-                    # Log WebSocket error but don't fail the workflow
-                    error_handler.handle_error(
-                        ws_error,
-                        context={'session_id': session_id, 'phase': 'websocket_send'}
-                    )
+                complete_message = {
+                    "type": "complete",
+                    "message": "Workflow completed successfully",
+                    "deployment_url": final_state.get("deployment_url"),
+                    "execution_time_ms": final_state.get("execution_time_ms"),
+                    "timestamp": message_timestamp()
+                }
+                
+                # Include generated files if deployment failed
+                if not final_state.get("deployment_url") and final_state.get("generated_files"):
+                    complete_message["generated_files"] = final_state.get("generated_files")
+                    complete_message["file_list"] = final_state.get("file_list", [])
+                    complete_message["project_location"] = final_state.get("project_location")
+                    complete_message["deployment_error"] = final_state.get("deployment_error")
+                
+                push_message(session_id, complete_message)
         else:
-            sessions[session_id]["status"] = "failed"
+            await session_store.update(session_id, status="failed")
             
             # Send failure update
             errors = final_state.get("errors", [])
@@ -713,20 +919,12 @@ async def execute_workflow_background(session_id: str, user_input: str):
             )
             
             # Send final error message
-            if session_id in active_connections:
-                try:
-                    await active_connections[session_id].send_json({
-                        "type": "error",
-                        "message": "Workflow failed",
-                        "error": error_msg,
-                        "timestamp": datetime.now().isoformat()
-                    })
-                except Exception as ws_error:
-                    # Log WebSocket error but don't fail the workflow
-                    error_handler.handle_error(
-                        ws_error,
-                        context={'session_id': session_id, 'phase': 'websocket_send'}
-                    )
+            push_message(session_id, {
+                "type": "error",
+                "message": "Workflow failed",
+                "error": error_msg,
+                "timestamp": message_timestamp()
+            })
         
     except AmarSystemError as system_error:
         # Handle system-level errors
@@ -735,12 +933,15 @@ async def execute_workflow_background(session_id: str, user_input: str):
             context={'session_id': session_id, 'phase': 'system_check'}
         )
         
-        sessions[session_id]["status"] = "failed"
-        sessions[session_id]["workflow_state"] = {
-            'workflow_status': 'failed',
-            'errors': [user_message],
-            'error_details': error_details
-        }
+        await session_store.update(
+            session_id,
+            status="failed",
+            workflow_state={
+                'workflow_status': 'failed',
+                'errors': [user_message],
+                'error_details': error_details
+            }
+        )
         
         # Send error update
         await send_progress_update(
@@ -752,16 +953,12 @@ async def execute_workflow_background(session_id: str, user_input: str):
         )
         
         # Send final error message
-        if session_id in active_connections:
-            try:
-                await active_connections[session_id].send_json({
-                    "type": "error",
-                    "message": "System error occurred",
-                    "error": user_message,
-                    "timestamp": datetime.now().isoformat()
-                })
-            except:
-                pass  # Ignore WebSocket errors at this point
+        push_message(session_id, {
+            "type": "error",
+            "message": "System error occurred",
+            "error": user_message,
+            "timestamp": message_timestamp()
+        })
     
     except Exception as e:
         # Handle unexpected errors
@@ -770,12 +967,15 @@ async def execute_workflow_background(session_id: str, user_input: str):
             context={'session_id': session_id, 'phase': 'unexpected'}
         )
         
-        sessions[session_id]["status"] = "failed"
-        sessions[session_id]["workflow_state"] = {
-            'workflow_status': 'failed',
-            'errors': [user_message],
-            'error_details': error_details
-        }
+        await session_store.update(
+            session_id,
+            status="failed",
+            workflow_state={
+                'workflow_status': 'failed',
+                'errors': [user_message],
+                'error_details': error_details
+            }
+        )
         
         # Send error update
         await send_progress_update(
@@ -787,21 +987,19 @@ async def execute_workflow_background(session_id: str, user_input: str):
         )
         
         # Send final error message
-        if session_id in active_connections:
-            try:
-                await active_connections[session_id].send_json({
-                    "type": "error",
-                    "message": "Unexpected error occurred",
-                    "error": user_message,
-                    "timestamp": datetime.now().isoformat()
-                })
-            except:
-                pass  # Ignore WebSocket errors at this point
+        push_message(session_id, {
+            "type": "error",
+            "message": "Unexpected error occurred",
+            "error": user_message,
+            "timestamp": message_timestamp()
+        })
     
     finally:
-        # Clean up workflow task
-        if session_id in workflow_tasks:
-            del workflow_tasks[session_id]
+        # Export the audit trail and release the session's audit log file
+        try:
+            await audit_manager.finalize_session(session_id)
+        except Exception:
+            logging.exception("Failed to finalize audit log for session %s", session_id)
 
 
 if __name__ == "__main__":
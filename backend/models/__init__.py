@@ -8,6 +8,7 @@ from .core import (
     Plan,
     PageSpec,
     ComponentSpec,
+    Route,
     RoutingConfig,
     BackendSpec,
     GeneratedProject,
@@ -19,6 +20,7 @@ from .core import (
 
 from .workflow import (
     WorkflowState,
+    WorkflowStatus,
     validate_workflow_state,
     create_initial_workflow_state,
     update_workflow_state,
@@ -32,6 +34,7 @@ __all__ = [
     'Plan', 
     'PageSpec',
     'ComponentSpec',
+    'Route',
     'RoutingConfig',
     'BackendSpec',
     'GeneratedProject',
@@ -40,6 +43,7 @@ __all__ = [
     'FileLineage',
     'AgentResponse',
     'WorkflowState',
+    'WorkflowStatus',
     'validate_workflow_state',
     'create_initial_workflow_state',
     'update_workflow_state',
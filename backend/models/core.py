@@ -4,10 +4,16 @@ Contains UserRequest, Plan, and GeneratedProject models with validation
 """
 
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Annotated, Dict, List, Optional, Tuple
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, StringConstraints, field_validator, ConfigDict
+from pydantic_core import PydanticCustomError
+
+
+# Names and routes are identifiers: surrounding whitespace is dropped and the
+# stripped value must be non-empty. Free-text fields are left untouched.
+_NonEmptyName = Annotated[str, StringConstraints(strip_whitespace=True, min_length=1)]
 
 
 class UserRequest(BaseModel):
@@ -24,31 +30,74 @@ class UserRequest(BaseModel):
     def validate_description(cls, v):
         """Validate that description is non-empty"""
         if not v or len(v.strip()) == 0:
-            raise ValueError('Description cannot be empty')
+            raise PydanticCustomError('description_empty', 'Description cannot be empty')
         return v.strip()
 
 
 class PageSpec(BaseModel):
     """Specification for a single page in the application"""
-    name: str
-    route: str
+    name: _NonEmptyName
+    route: _NonEmptyName
     components: List[str]
     description: str
 
 
 class ComponentSpec(BaseModel):
     """Specification for a React component"""
-    name: str
+    name: _NonEmptyName
     type: str  # 'functional' | 'class' | 'hook'
     props: Dict[str, str] = Field(default_factory=dict)
     description: str
 
 
+class Route(BaseModel):
+    """Single route entry mapping a path to a page component"""
+    model_config = ConfigDict(frozen=True)
+    
+    path: str
+    component: str
+
+
 class RoutingConfig(BaseModel):
-    """Configuration for React Router setup"""
+    """
+    Configuration for React Router setup
+    
+    Immutable after construction: the route field tuples below are computed
+    once, so routes and navigation_links must not be reassigned or mutated
+    in place. Construct a new RoutingConfig instead (model_copy would carry
+    over the old tuples).
+    """
+    model_config = ConfigDict(frozen=True)
+    
     base_path: str = "/"
-    routes: List[Dict[str, str]]  # [{"path": "/about", "component": "About"}]
+    routes: List[Route]  # [{"path": "/about", "component": "About"}]
     navigation_links: List[Dict[str, str]] = Field(default_factory=list)
+    
+    # Parallel tuples of route fields, computed once when the model is created
+    _route_paths: Tuple[str, ...] = PrivateAttr(default=())
+    _route_components: Tuple[str, ...] = PrivateAttr(default=())
+    _navigation_paths: Tuple[str, ...] = PrivateAttr(default=())
+    
+    def model_post_init(self, __context) -> None:
+        """Precompute route field tuples for fast cross-field scans"""
+        self._route_paths = tuple(route.path for route in self.routes)
+        self._route_components = tuple(route.component for route in self.routes)
+        self._navigation_paths = tuple(link['path'] for link in self.navigation_links if 'path' in link)
+    
+    @property
+    def route_paths(self) -> Tuple[str, ...]:
+        """Paths of all routes, in declaration order"""
+        return self._route_paths
+    
+    @property
+    def route_components(self) -> Tuple[str, ...]:
+        """Components of all routes, parallel to route_paths"""
+        return self._route_components
+    
+    @property
+    def navigation_paths(self) -> Tuple[str, ...]:
+        """Paths of navigation links that declare one"""
+        return self._navigation_paths
 
 
 class BackendSpec(BaseModel):
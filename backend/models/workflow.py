@@ -4,11 +4,43 @@ Contains WorkflowState TypedDict and related validation logic
 Validates: Requirements 14.1, 14.4, 14.5
 """
 
+import json
+from enum import Enum
 from typing import Dict, List, Optional, TypedDict, Any
 from datetime import datetime
 
 from .core import Plan, TestResults
 
+# Bound once; the state mutators below stamp last_updated on every transition
+_now = datetime.now
+_json_dumps = json.dumps
+
+# Checked on every validation, so built once as sets
+_REQUIRED_FIELD_ORDER = (
+    'user_input', 'session_id', 'errors', 'retry_count',
+    'current_agent', 'workflow_status', 'started_at',
+    'last_updated', 'agent_context'
+)
+_REQUIRED_FIELDS = frozenset(_REQUIRED_FIELD_ORDER)
+
+
+class WorkflowStatus(str, Enum):
+    """Allowed values of WorkflowState['workflow_status']"""
+    RUNNING = 'running'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+
+# Members compare and hash as their plain-string values
+_VALID_STATUSES = frozenset(WorkflowStatus)
+_TERMINAL_STATUSES = frozenset({WorkflowStatus.COMPLETED, WorkflowStatus.FAILED})
+
+# Fields preserve_context_across_transition restores if a transition drops them
+_CRITICAL_FIELDS = frozenset({
+    'user_input', 'session_id', 'started_at',
+    'plan', 'generated_files', 'agent_context'
+})
+
 
 class WorkflowState(TypedDict):
     """
@@ -35,7 +67,7 @@ class WorkflowState(TypedDict):
     
     # Workflow management
     current_agent: str
-    workflow_status: str  # 'running' | 'completed' | 'failed'
+    workflow_status: str  # a WorkflowStatus value: 'running' | 'completed' | 'failed'
     
     # Timestamps and metadata
     started_at: str
@@ -46,20 +78,20 @@ class WorkflowState(TypedDict):
     agent_context: Dict[str, Any]
 
 
+def _shallow_copy_state(state: WorkflowState) -> WorkflowState:
+    """Shallow-copy a workflow state via dict.copy directly"""
+    return dict.copy(state)
+
+
 def validate_workflow_state(state: WorkflowState) -> bool:
     """
     Validate that workflow state contains all required fields
     Returns True if valid, raises ValueError if invalid
     """
-    required_fields = [
-        'user_input', 'session_id', 'errors', 'retry_count', 
-        'current_agent', 'workflow_status', 'started_at', 
-        'last_updated', 'agent_context'
-    ]
-    
-    for field in required_fields:
-        if field not in state:
-            raise ValueError(f"Missing required field in workflow state: {field}")
+    if not state.keys() >= _REQUIRED_FIELDS:
+        # Report the first missing field in schema order
+        field = next(f for f in _REQUIRED_FIELD_ORDER if f not in state)
+        raise ValueError(f"Missing required field in workflow state: {field}")
     
     # Validate field types and constraints
     if not isinstance(state['user_input'], str) or not state['user_input'].strip():
@@ -74,7 +106,7 @@ def validate_workflow_state(state: WorkflowState) -> bool:
     if not isinstance(state['retry_count'], int) or state['retry_count'] < 0:
         raise ValueError("retry_count must be a non-negative integer")
     
-    if state['workflow_status'] not in ['running', 'completed', 'failed']:
+    if state['workflow_status'] not in _VALID_STATUSES:
         raise ValueError("workflow_status must be 'running', 'completed', or 'failed'")
     
     if not isinstance(state['agent_context'], dict):
@@ -97,11 +129,14 @@ def create_initial_workflow_state(user_input: str, session_id: str) -> WorkflowS
     Returns:
         Initialized WorkflowState ready for execution
         
+    Raises:
+        ValueError: If the initial state is invalid (e.g. empty user_input)
+        
     Validates: Requirements 14.4
     """
-    now = datetime.now().isoformat()
+    now = _now().isoformat()
     
-    return WorkflowState(
+    state = WorkflowState(
         user_input=user_input,
         session_id=session_id,
         plan=None,
@@ -117,12 +152,19 @@ def create_initial_workflow_state(user_input: str, session_id: str) -> WorkflowS
         execution_time_ms=None,
         agent_context={}
     )
+    
+    # Validate at ingress; transitions in between are not re-validated
+    validate_workflow_state(state)
+    
+    return state
 
 
 def update_workflow_state(
     state: WorkflowState, 
     agent: str, 
-    updates: Dict[str, Any]
+    updates: Dict[str, Any],
+    inplace: bool = False,
+    debug_validate: bool = False
 ) -> WorkflowState:
     """
     Update workflow state with new data from an agent
@@ -135,18 +177,22 @@ def update_workflow_state(
         state: Current workflow state
         agent: Name of the agent making the update
         updates: Dictionary of fields to update
+        inplace: Update state itself instead of a shallow copy (for callers
+            that own the state, such as workflow nodes)
+        debug_validate: Validate the updated state (state is otherwise only
+            validated when created and when finalized)
         
     Returns:
         Updated WorkflowState with preserved context
         
     Validates: Requirements 14.5
     """
-    # Create a copy to avoid mutating the original
-    new_state = state.copy()
+    # Copy unless the caller owns the state
+    new_state = state if inplace else _shallow_copy_state(state)
     
     # Update core fields
     new_state['current_agent'] = agent
-    new_state['last_updated'] = datetime.now().isoformat()
+    new_state['last_updated'] = _now().isoformat()
     
     # Apply updates while preserving existing data
     for key, value in updates.items():
@@ -163,37 +209,50 @@ def update_workflow_state(
                 new_state['agent_context'] = {}
             new_state['agent_context'][key] = value
     
-    # Validate the updated state
-    validate_workflow_state(new_state)
+    if debug_validate:
+        validate_workflow_state(new_state)
     
     return new_state
 
 
-def add_error_to_state(state: WorkflowState, error: str, agent: str) -> WorkflowState:
+def add_error_to_state(
+    state: WorkflowState,
+    error: str,
+    agent: str,
+    inplace: bool = False
+) -> WorkflowState:
     """
     Add an error to the workflow state with proper formatting
+    
+    Each error is stored as a compact JSON object string, so consumers
+    that join errors keep working and the entries stay machine-readable.
+    The errors list is shared with the original state either way (the copy
+    is shallow); inplace=True also skips copying the dict itself.
     """
+    timestamp = _now().isoformat()
     error_entry = {
         'agent': agent,
         'error': error,
-        'timestamp': datetime.now().isoformat(),
+        'timestamp': timestamp,
         'retry_count': state['retry_count']
     }
     
-    new_state = state.copy()
-    new_state['errors'].append(str(error_entry))
-    new_state['last_updated'] = datetime.now().isoformat()
+    new_state = state if inplace else _shallow_copy_state(state)
+    new_state['errors'].append(
+        _json_dumps(error_entry, default=str, separators=(',', ':'))
+    )
+    new_state['last_updated'] = timestamp
     
     return new_state
 
 
-def increment_retry_count(state: WorkflowState) -> WorkflowState:
+def increment_retry_count(state: WorkflowState, inplace: bool = False) -> WorkflowState:
     """
     Increment retry count in workflow state
     """
-    new_state = state.copy()
+    new_state = state if inplace else _shallow_copy_state(state)
     new_state['retry_count'] += 1
-    new_state['last_updated'] = datetime.now().isoformat()
+    new_state['last_updated'] = _now().isoformat()
     
     return new_state
 
@@ -201,7 +260,8 @@ def increment_retry_count(state: WorkflowState) -> WorkflowState:
 def finalize_workflow_state(
     state: WorkflowState, 
     status: str, 
-    execution_time_ms: int
+    execution_time_ms: int,
+    inplace: bool = False
 ) -> WorkflowState:
     """
     Finalize workflow state when workflow completes or fails
@@ -213,16 +273,20 @@ def finalize_workflow_state(
         state: Current workflow state
         status: Final status ('completed' or 'failed')
         execution_time_ms: Total execution time in milliseconds
+        inplace: Update state itself instead of a shallow copy
         
     Returns:
         Finalized WorkflowState ready for return
         
     Validates: Requirements 14.4
     """
-    new_state = state.copy()
+    new_state = state if inplace else _shallow_copy_state(state)
     new_state['workflow_status'] = status
     new_state['execution_time_ms'] = execution_time_ms
-    new_state['last_updated'] = datetime.now().isoformat()
+    new_state['last_updated'] = _now().isoformat()
+    
+    # Validate at egress, before the state is returned to the user
+    validate_workflow_state(new_state)
     
     return new_state
 
@@ -248,7 +312,8 @@ def get_agent_output(state: WorkflowState, agent: str) -> Optional[Dict[str, Any
 def store_agent_output(
     state: WorkflowState, 
     agent: str, 
-    output: Dict[str, Any]
+    output: Dict[str, Any],
+    inplace: bool = False
 ) -> WorkflowState:
     """
     Store agent output in workflow state for future reference
@@ -257,19 +322,20 @@ def store_agent_output(
         state: Current workflow state
         agent: Name of the agent storing output
         output: Output data to store
+        inplace: Update state itself instead of a shallow copy
         
     Returns:
         Updated WorkflowState with stored output
         
     Validates: Requirements 14.5
     """
-    new_state = state.copy()
+    new_state = state if inplace else _shallow_copy_state(state)
     
     if 'agent_context' not in new_state:
         new_state['agent_context'] = {}
     
     new_state['agent_context'][f'{agent}_output'] = output
-    new_state['last_updated'] = datetime.now().isoformat()
+    new_state['last_updated'] = _now().isoformat()
     
     return new_state
 
@@ -312,7 +378,7 @@ def is_terminal_state(state: WorkflowState) -> bool:
         
     Validates: Requirements 14.4
     """
-    return state['workflow_status'] in ['completed', 'failed']
+    return state['workflow_status'] in _TERMINAL_STATUSES
 
 
 def has_errors(state: WorkflowState) -> bool:
@@ -363,17 +429,15 @@ def preserve_context_across_transition(
         
     Validates: Requirements 14.5
     """
+    # Nothing can have been lost when the state was updated in place
+    if from_state is to_state:
+        return to_state
+    
     # Verify critical fields are preserved
-    critical_fields = [
-        'user_input', 'session_id', 'started_at', 
-        'plan', 'generated_files', 'agent_context'
-    ]
-    
-    for field in critical_fields:
-        if from_state.get(field) is not None:
-            if to_state.get(field) is None:
-                # Context was lost, restore it
-                to_state[field] = from_state[field]
+    for field in _CRITICAL_FIELDS.intersection(from_state):
+        if from_state[field] is not None and to_state.get(field) is None:
+            # Context was lost, restore it
+            to_state[field] = from_state[field]
     
     # Ensure errors are accumulated, not replaced
     from_errors = from_state.get('errors', [])
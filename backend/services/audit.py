@@ -6,30 +6,63 @@ Validates: Requirements 8.1, 8.2, 8.3, 8.5
 """
 
 import asyncio
-import json
-import logging
+import os
+import sys
 import traceback
+import weakref
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Optional, Any, Union
 from uuid import uuid4
-from concurrent.futures import ThreadPoolExecutor
 
+import orjson
 from pydantic import BaseModel, Field
 
 from models.core import AuditLogEntry, FileLineage
 
+# Bound once; every log_* call stamps its entry with the current time
+_now = datetime.now
+
+# Agent and action names repeat across entries; interned copies are shared
+# and hit the per-agent/per-action indexes by identity
+_intern = sys.intern
+
+# One JSONL record per line; agent-supplied details may use non-string keys
+_LINE_OPTIONS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS
+
+
+def _entry_to_dict(entry: AuditLogEntry) -> Dict[str, Any]:
+    """Plain dict of an audit entry, read straight off its fields"""
+    return {
+        'timestamp': entry.timestamp,
+        'session_id': entry.session_id,
+        'agent': entry.agent,
+        'action': entry.action,
+        'details': entry.details,
+        'duration_ms': entry.duration_ms
+    }
+
 
 class AuditLogger:
     """
     Comprehensive audit logging system with JSON formatting and async performance
     
     Logs agent decisions, file operations, errors with full context and lineage tracking.
-    Ensures async logging for performance (Requirements 8.5).
+    Ensures async logging for performance (Requirements 8.5). Entries are built
+    by this class from known-good values, so they skip Pydantic validation.
     
     Validates: Requirements 8.1, 8.2, 8.3, 8.5
     """
     
+    # One logger per session; slots keep the per-session footprint small
+    __slots__ = (
+        'session_id', 'log_dir', 'entries', '_by_agent', '_by_action',
+        '_durations', 'file_lineage', '_lineage_dumps',
+        '_write_queue', '_writer_task', 'start_time', 'operation_count', '_fd',
+        '_fd_finalizer', '__weakref__'
+    )
+    
     def __init__(self, session_id: str, log_dir: Optional[str] = None):
         """
         Initialize audit logger for a specific session
@@ -44,38 +77,41 @@ class AuditLogger:
         
         # In-memory storage for fast access
         self.entries: List[AuditLogEntry] = []
+        # Indexes filled as entries are recorded, for O(1) filtered lookups
+        self._by_agent: DefaultDict[str, List[AuditLogEntry]] = defaultdict(list)
+        self._by_action: DefaultDict[str, List[AuditLogEntry]] = defaultdict(list)
+        # Durations kept as their own column for the audit trail statistics
+        self._durations: List[Optional[int]] = []
         self.file_lineage: Dict[str, FileLineage] = {}
+        # Dumped lineage dicts, reused until the file's lineage changes
+        self._lineage_dumps: Dict[str, Dict[str, Any]] = {}
         
-        # Async logging setup
-        self.executor = ThreadPoolExecutor(max_workers=2)
-        self.pending_writes: List[asyncio.Task] = []
+        # Async logging setup: log calls queue entries; one writer task
+        # appends everything queued so far to the log file in a single
+        # write, then exits until needed
+        self._write_queue: asyncio.Queue = asyncio.Queue()
+        self._writer_task: Optional[asyncio.Task] = None
         
         # Performance tracking
-        self.start_time = datetime.now()
+        self.start_time = _now()
         self.operation_count = 0
         
-        # Setup JSON logger
-        self._setup_json_logger()
+        # Append-only JSONL file, written with raw os.write calls
+        self._fd: Optional[int] = None
+        self._fd_finalizer: Optional[weakref.finalize] = None
+        self._open_log_file()
     
-    def _setup_json_logger(self):
-        """Setup structured JSON logger for file output"""
-        self.logger = logging.getLogger(f"audit_{self.session_id}")
-        self.logger.setLevel(logging.INFO)
-        
-        # Remove existing handlers to avoid duplicates
-        self.logger.handlers.clear()
-        
-        # JSON file handler
+    def _open_log_file(self):
+        """Open the session's JSONL audit file for appending"""
         log_file = self.log_dir / f"audit_{self.session_id}.jsonl"
-        handler = logging.FileHandler(log_file)
-        handler.setLevel(logging.INFO)
-        
-        # JSON formatter
-        formatter = logging.Formatter('%(message)s')
-        handler.setFormatter(formatter)
-        
-        self.logger.addHandler(handler)
-        self.logger.propagate = False
+        self._fd = os.open(
+            str(log_file),
+            os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0),
+            0o644
+        )
+        # Fallback for loggers dropped without close(): the descriptor is
+        # closed when the logger is garbage collected or at interpreter exit
+        self._fd_finalizer = weakref.finalize(self, os.close, self._fd)
     
     async def log_agent_decision(
         self,
@@ -98,18 +134,17 @@ class AuditLogger:
         Returns:
             Entry ID for reference
         """
-        entry = AuditLogEntry(
-            timestamp=datetime.now().isoformat(),
+        entry = AuditLogEntry.model_construct(
+            timestamp=_now().isoformat(),
             session_id=self.session_id,
-            agent=agent,
-            action=action,
+            agent=_intern(agent),
+            action=_intern(action),
             details=details,
             duration_ms=duration_ms
         )
         
         # Add to in-memory storage
-        self.entries.append(entry)
-        self.operation_count += 1
+        self._record(entry)
         
         # Async write to file
         await self._async_write_entry(entry, "agent_decision", importance)
@@ -123,7 +158,8 @@ class AuditLogger:
         file_path: str,
         reason: str,
         content_preview: Optional[str] = None,
-        duration_ms: Optional[int] = None
+        duration_ms: Optional[int] = None,
+        file_size_bytes: Optional[int] = None
     ) -> str:
         """
         Log file operations with lineage tracking
@@ -133,46 +169,52 @@ class AuditLogger:
             operation: Type of file operation
             file_path: Path to the file
             reason: Reason for the operation
-            content_preview: Optional preview of file content
+            content_preview: Optional file content; only the first 200
+                characters are stored
             duration_ms: Time taken for the operation
+            file_size_bytes: Size of the file, if the caller knows it
             
         Returns:
             Entry ID for reference
         """
+        # One timestamp for both the lineage record and the audit entry
+        now_iso = _now().isoformat()
+        
         # Update file lineage
         if operation == 'create':
             lineage = FileLineage(
                 file_path=file_path,
                 created_by=agent,
-                created_at=datetime.now().isoformat(),
+                created_at=now_iso,
                 modified_by=[],
                 reason=reason
             )
             self.file_lineage[file_path] = lineage
+            self._lineage_dumps.pop(file_path, None)
         elif operation == 'modify' and file_path in self.file_lineage:
             self.file_lineage[file_path].modified_by.append(agent)
+            self._lineage_dumps.pop(file_path, None)
         
         # Create audit entry
         details = {
             'operation': operation,
             'file_path': file_path,
             'reason': reason,
-            'file_size_bytes': len(content_preview) if content_preview else None,
+            'file_size_bytes': file_size_bytes,
             'content_preview': content_preview[:200] if content_preview else None,
-            'lineage': self.file_lineage.get(file_path, {}).model_dump() if file_path in self.file_lineage else None
+            'lineage': self._dump_lineage(file_path)
         }
         
-        entry = AuditLogEntry(
-            timestamp=datetime.now().isoformat(),
+        entry = AuditLogEntry.model_construct(
+            timestamp=now_iso,
             session_id=self.session_id,
-            agent=agent,
-            action=f"file_{operation}",
+            agent=_intern(agent),
+            action=_intern(f"file_{operation}"),
             details=details,
             duration_ms=duration_ms
         )
         
-        self.entries.append(entry)
-        self.operation_count += 1
+        self._record(entry)
         
         # Async write with high importance for file operations
         await self._async_write_entry(entry, "file_operation", 0.9)
@@ -219,17 +261,16 @@ class AuditLogger:
             'agent_state': context.get('agent_state', {})
         }
         
-        entry = AuditLogEntry(
-            timestamp=datetime.now().isoformat(),
+        entry = AuditLogEntry.model_construct(
+            timestamp=_now().isoformat(),
             session_id=self.session_id,
-            agent=agent,
+            agent=_intern(agent),
             action="error",
             details=details,
             duration_ms=duration_ms
         )
         
-        self.entries.append(entry)
-        self.operation_count += 1
+        self._record(entry)
         
         # Async write with highest importance for errors
         await self._async_write_entry(entry, "error", 1.0)
@@ -269,8 +310,8 @@ class AuditLogger:
             'preserved_context': list(state_data.keys())
         }
         
-        entry = AuditLogEntry(
-            timestamp=datetime.now().isoformat(),
+        entry = AuditLogEntry.model_construct(
+            timestamp=_now().isoformat(),
             session_id=self.session_id,
             agent="orchestrator",
             action="workflow_transition",
@@ -278,50 +319,87 @@ class AuditLogger:
             duration_ms=duration_ms
         )
         
-        self.entries.append(entry)
-        self.operation_count += 1
+        self._record(entry)
         
         await self._async_write_entry(entry, "workflow", 0.8)
         
         return f"transition_{from_agent}_{to_agent}_{len(self.entries)}"
     
+    def _record(self, entry: AuditLogEntry):
+        """Store an entry in memory and in the agent/action indexes"""
+        self.entries.append(entry)
+        self.operation_count += 1
+        self._by_agent[entry.agent].append(entry)
+        self._by_action[entry.action].append(entry)
+        self._durations.append(entry.duration_ms)
+    
     async def _async_write_entry(self, entry: AuditLogEntry, category: str, importance: float):
         """
         Asynchronously write entry to log file for performance
         Ensures logging doesn't block agent execution (Requirements 8.5)
         """
-        async def write_task():
+        # Create enhanced log entry with metadata; serialized by the writer
+        self._write_queue.put_nowait({
+            **_entry_to_dict(entry),
+            'category': category,
+            'importance': importance,
+            'operation_number': self.operation_count
+        })
+        
+        # Entries logged before the writer gets to run share one write
+        if self._writer_task is None or self._writer_task.done():
+            self._writer_task = asyncio.create_task(self._writer_loop())
+    
+    async def _writer_loop(self):
+        """Write queued entries until the queue is empty"""
+        self._write_queued()
+    
+    def _write_queued(self):
+        """Append every queued entry to the JSON log file in one write"""
+        queue = self._write_queue
+        lines = []
+        while not queue.empty():
+            log_data = queue.get_nowait()
             try:
-                # Create enhanced log entry with metadata
-                log_data = {
-                    **entry.model_dump(),
-                    'category': category,
-                    'importance': importance,
-                    'operation_number': self.operation_count
-                }
-                
-                # Write to JSON log file
-                json_line = json.dumps(log_data, default=str)
-                self.logger.info(json_line)
-                
+                lines.append(orjson.dumps(log_data, default=str, option=_LINE_OPTIONS))
             except Exception as e:
                 # Fallback logging to prevent audit failures from breaking the system
                 print(f"Audit logging error: {e}")
         
-        # Schedule async write
-        task = asyncio.create_task(write_task())
-        self.pending_writes.append(task)
-        
-        # Clean up completed tasks
-        self.pending_writes = [t for t in self.pending_writes if not t.done()]
+        if lines and self._fd is not None:
+            try:
+                data = memoryview(b"".join(lines))
+                while data:
+                    data = data[os.write(self._fd, data):]
+            except Exception as e:
+                print(f"Audit logging error: {e}")
     
     async def flush_pending_writes(self):
         """
         Wait for all pending async writes to complete
         """
-        if self.pending_writes:
-            await asyncio.gather(*self.pending_writes, return_exceptions=True)
-            self.pending_writes.clear()
+        writer = self._writer_task
+        if writer is not None and not writer.done():
+            await writer
+        
+        # Anything still queued (e.g. the writer's event loop has gone away)
+        self._write_queued()
+    
+    def _dump_lineage(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """Lineage of a file as a plain dict, cached until it is modified"""
+        dumped = self._lineage_dumps.get(file_path)
+        if dumped is None:
+            lineage = self.file_lineage.get(file_path)
+            if lineage is None:
+                return None
+            dumped = self._lineage_dumps[file_path] = {
+                'file_path': lineage.file_path,
+                'created_by': lineage.created_by,
+                'created_at': lineage.created_at,
+                'modified_by': list(lineage.modified_by),
+                'reason': lineage.reason
+            }
+        return dumped
     
     def get_file_lineage(self, file_path: str) -> Optional[FileLineage]:
         """
@@ -354,7 +432,7 @@ class AuditLogger:
         Returns:
             List of audit entries for the agent
         """
-        return [entry for entry in self.entries if entry.agent == agent]
+        return list(self._by_agent.get(agent, ()))
     
     def get_entries_by_action(self, action: str) -> List[AuditLogEntry]:
         """
@@ -366,7 +444,7 @@ class AuditLogger:
         Returns:
             List of audit entries for the action
         """
-        return [entry for entry in self.entries if entry.action == action]
+        return list(self._by_action.get(_intern(action), ()))
     
     def get_error_entries(self) -> List[AuditLogEntry]:
         """
@@ -375,7 +453,7 @@ class AuditLogger:
         Returns:
             List of error audit entries
         """
-        return [entry for entry in self.entries if entry.action == "error"]
+        return list(self._by_action.get("error", ()))
     
     async def generate_audit_trail(self) -> Dict[str, Any]:
         """
@@ -387,32 +465,37 @@ class AuditLogger:
         # Ensure all writes are complete
         await self.flush_pending_writes()
         
-        total_duration = (datetime.now() - self.start_time).total_seconds() * 1000
+        now = _now()
+        total_duration = (now - self.start_time).total_seconds() * 1000
         
-        # Calculate statistics
-        agents = set(entry.agent for entry in self.entries)
-        actions = set(entry.action for entry in self.entries)
-        error_count = len(self.get_error_entries())
+        # Statistics come from the indexes and the duration column, so only
+        # serializing the entries walks every entry object
+        timed = [duration_ms for duration_ms in self._durations if duration_ms]
+        by_action = self._by_action
+        file_operations = sum(
+            len(recorded) for action, recorded in by_action.items()
+            if action.startswith('file_')
+        )
+        agents = list(self._by_agent)
+        actions = list(by_action)
         
         audit_trail = {
             'session_id': self.session_id,
-            'generated_at': datetime.now().isoformat(),
+            'generated_at': now.isoformat(),
             'summary': {
                 'total_entries': len(self.entries),
                 'total_duration_ms': int(total_duration),
                 'unique_agents': len(agents),
                 'unique_actions': len(actions),
-                'error_count': error_count,
-                'file_operations': len([e for e in self.entries if e.action.startswith('file_')]),
-                'agents': list(agents),
-                'actions': list(actions)
+                'error_count': len(by_action.get("error", ())),
+                'file_operations': file_operations,
+                'agents': agents,
+                'actions': actions
             },
-            'entries': [entry.model_dump() for entry in self.entries],
-            'file_lineage': {path: lineage.model_dump() for path, lineage in self.file_lineage.items()},
+            'entries': list(map(_entry_to_dict, self.entries)),
+            'file_lineage': {path: self._dump_lineage(path) for path in self.file_lineage},
             'performance_metrics': {
-                'avg_operation_time_ms': sum(
-                    e.duration_ms for e in self.entries if e.duration_ms
-                ) / len([e for e in self.entries if e.duration_ms]) if any(e.duration_ms for e in self.entries) else 0,
+                'avg_operation_time_ms': sum(timed) / len(timed) if timed else 0,
                 'operations_per_second': self.operation_count / (total_duration / 1000) if total_duration > 0 else 0
             }
         }
@@ -434,15 +517,22 @@ class AuditLogger:
         
         audit_trail = await self.generate_audit_trail()
         
-        with open(file_path, 'w') as f:
-            json.dump(audit_trail, f, indent=2, default=str)
+        with open(file_path, 'wb') as f:
+            f.write(orjson.dumps(
+                audit_trail,
+                default=str,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+            ))
         
         return str(file_path)
     
-    def __del__(self):
-        """Cleanup executor on deletion"""
-        if hasattr(self, 'executor'):
-            self.executor.shutdown(wait=False)
+    async def close(self):
+        """Write anything still queued and close the log file"""
+        await self.flush_pending_writes()
+        if self._fd is not None:
+            # Calling the finalizer closes the descriptor exactly once
+            self._fd_finalizer()
+            self._fd = None
 
 
 class AuditManager:
@@ -450,6 +540,8 @@ class AuditManager:
     Global manager for audit loggers across sessions
     """
     
+    __slots__ = ('log_dir', '_loggers')
+    
     def __init__(self, log_dir: Optional[str] = None):
         self.log_dir = log_dir
         self._loggers: Dict[str, AuditLogger] = {}
@@ -464,9 +556,10 @@ class AuditManager:
         Returns:
             AuditLogger instance for the session
         """
-        if session_id not in self._loggers:
-            self._loggers[session_id] = AuditLogger(session_id, self.log_dir)
-        return self._loggers[session_id]
+        logger = self._loggers.get(session_id)
+        if logger is None:
+            logger = self._loggers[session_id] = AuditLogger(session_id, self.log_dir)
+        return logger
     
     async def finalize_session(self, session_id: str) -> Optional[str]:
         """
@@ -481,6 +574,7 @@ class AuditManager:
         if session_id in self._loggers:
             logger = self._loggers[session_id]
             file_path = await logger.export_to_file()
+            await logger.close()
             del self._loggers[session_id]
             return file_path
         return None
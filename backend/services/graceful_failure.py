@@ -8,6 +8,7 @@ import logging
 import os
 import shutil
 import tempfile
+import time
 from typing import Dict, Any, Optional, Tuple, List
 from datetime import datetime
 import psutil
@@ -39,6 +40,12 @@ class GracefulFailureHandler:
         # Cleanup tracking
         self.temp_directories: List[str] = []
         self.cleanup_enabled = True
+        
+        # Health probes hit get_resource_status() every few seconds; reuse the
+        # last reading for this many seconds instead of querying psutil again
+        self.resource_status_ttl = 2.0
+        self._resource_status: Optional[Dict[str, Any]] = None
+        self._resource_status_expires = 0.0
     
     def check_and_handle_resources(self) -> Tuple[bool, Optional[str]]:
         """
@@ -344,11 +351,19 @@ class GracefulFailureHandler:
     
     def get_resource_status(self) -> Dict[str, Any]:
         """
-        Get current resource status
+        Get current resource status (cached for resource_status_ttl seconds)
         
         Returns:
-            Dictionary with resource status information
+            Dictionary with resource status information; callers must not modify it
         """
+        now = time.monotonic()
+        if self._resource_status is None or now >= self._resource_status_expires:
+            self._resource_status = self._read_resource_status()
+            self._resource_status_expires = now + self.resource_status_ttl
+        return self._resource_status
+    
+    def _read_resource_status(self) -> Dict[str, Any]:
+        """Query psutil for current memory and disk usage"""
         try:
             memory = psutil.virtual_memory()
             disk = psutil.disk_usage('/')
@@ -0,0 +1,161 @@
+"""
+Exact-Match LLM Response Cache for AMAR MVP
+Fast first tier in front of the semantic cache: identical requests are
+answered from a SHA256-keyed store without embedding inference or an LLM call
+"""
+
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Optional, Protocol
+
+logger = logging.getLogger(__name__)
+
+MAX_CACHE_ENTRIES = 1000
+
+
+class CacheBackend(Protocol):
+    """Storage interface for cached LLM responses (serialized JSON strings)"""
+    
+    def get(self, key: str) -> Optional[str]:
+        ...
+    
+    def set(self, key: str, value: str) -> None:
+        ...
+    
+    def clear(self) -> None:
+        ...
+
+
+class InMemoryBackend:
+    """Process-local LRU store"""
+    
+    def __init__(self, max_entries: int = MAX_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._store: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = Lock()
+    
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            value = self._store.get(key)
+            if value is not None:
+                self._store.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: str) -> None:
+        with self._lock:
+            self._store[key] = value
+            self._store.move_to_end(key)
+            while len(self._store) > self.max_entries:
+                self._store.popitem(last=False)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._store.clear()
+    
+    def __len__(self) -> int:
+        return len(self._store)
+
+
+class RedisBackend:
+    """Shared store for multi-process deployments (requires the redis package)"""
+    
+    def __init__(self, url: str, prefix: str = "amar:llm:", ttl_seconds: int = 86400):
+        import redis
+        
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+    
+    def get(self, key: str) -> Optional[str]:
+        return self._client.get(self.prefix + key)
+    
+    def set(self, key: str, value: str) -> None:
+        self._client.set(self.prefix + key, value, ex=self.ttl_seconds)
+    
+    def clear(self) -> None:
+        for key in self._client.scan_iter(f"{self.prefix}*"):
+            self._client.delete(key)
+
+
+class LLMCache:
+    """
+    Exact-match cache of LLM outputs keyed by SHA256 of the request
+    
+    Backend failures are logged and treated as misses so caching can never
+    break plan generation.
+    """
+    
+    def __init__(self, backend: Optional[CacheBackend] = None):
+        """
+        Initialize LLM cache
+        
+        Args:
+            backend: Storage backend (defaults to an in-memory LRU)
+        """
+        self.backend = backend if backend is not None else InMemoryBackend()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    @staticmethod
+    def cache_key(model: str, prompt: str, temperature: float = 0.0, allow_sampled: bool = False) -> Optional[str]:
+        """
+        Build a cache key for an LLM request
+        
+        Args:
+            model: Model identifier
+            prompt: Prompt (or other request-identifying text)
+            temperature: Sampling temperature of the call
+            allow_sampled: Cache even when temperature > 0; callers that validate
+                and accept any reasonable output (such as the planner) opt in
+        
+        Returns:
+            Hex digest, or None if the request should not be cached
+        """
+        if temperature > 0 and not allow_sampled:
+            return None
+        
+        payload = json.dumps(
+            {'model': model, 'prompt': prompt, 'temperature': temperature},
+            sort_keys=True
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+    
+    def get(self, key: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached response
+        
+        Returns:
+            Fresh copy of the cached response, or None on a miss
+        """
+        if key is None:
+            return None
+        
+        try:
+            value = self.backend.get(key)
+        except Exception as e:
+            logger.warning(f"LLM cache lookup failed: {e}")
+            value = None
+        
+        if value is None:
+            self.stats['misses'] += 1
+            return None
+        
+        self.stats['hits'] += 1
+        return json.loads(value)
+    
+    def put(self, key: Optional[str], response: Dict[str, Any]) -> None:
+        """Store a response under a key from cache_key()"""
+        if key is None:
+            return
+        
+        try:
+            self.backend.set(key, json.dumps(response))
+        except Exception as e:
+            logger.warning(f"LLM cache store failed: {e}")
+    
+    def clear(self) -> None:
+        """Remove all cached responses and reset statistics"""
+        self.backend.clear()
+        self.stats = {'hits': 0, 'misses': 0}
@@ -0,0 +1,44 @@
+"""
+LLM Client Pool for AMAR MVP
+Shares LLM client instances across agents so repeated agent construction
+does not rebuild HTTP clients and re-resolve credentials
+"""
+
+from threading import Lock
+from typing import Any, Callable, Dict, Tuple
+
+_client_pool: Dict[Tuple, Any] = {}
+_pool_lock = Lock()
+
+
+def get_pooled_client(factory: Callable[..., Any], **kwargs: Any) -> Any:
+    """
+    Get a shared client instance, creating it on first use
+    
+    Clients are keyed by factory and constructor arguments, so agents that
+    configure the same provider, model and sampling settings share one
+    instance (and its connection pool).
+    
+    Args:
+        factory: Client class or factory function
+        **kwargs: Constructor arguments (must be hashable)
+        
+    Returns:
+        Pooled client instance
+    """
+    key = (factory, tuple(sorted(kwargs.items())))
+    
+    client = _client_pool.get(key)
+    if client is None:
+        with _pool_lock:
+            client = _client_pool.get(key)
+            if client is None:
+                client = factory(**kwargs)
+                _client_pool[key] = client
+    return client
+
+
+def clear_client_pool() -> None:
+    """Drop all pooled clients (useful for testing and credential rotation)"""
+    with _pool_lock:
+        _client_pool.clear()
@@ -6,12 +6,16 @@ Validates: Requirements 2.3, 11.1
 
 import json
 from datetime import datetime
-from typing import Dict, List, Optional, Any, Union
+from typing import Dict, List, Optional, Any, Tuple, Union
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
 
+# Entries from other agents at or above this importance are shared as context
+CONTEXT_MIN_IMPORTANCE = 0.7
+
+
 class MemoryEntry(BaseModel):
     """
     Single entry in episodic memory with RAG-compatible structure
@@ -51,6 +55,11 @@ class EpisodicMemory:
         self.created_at = datetime.now().isoformat()
         self._index_by_agent: Dict[str, List[MemoryEntry]] = {}
         self._index_by_action: Dict[str, List[MemoryEntry]] = {}
+        
+        # Feed get_context_version so callers can cache rendered context
+        self._clear_count = 0
+        self._shared_counts: Dict[str, int] = {}
+        self._shared_total = 0
     
     def add_entry(
         self, 
@@ -93,6 +102,10 @@ class EpisodicMemory:
             self._index_by_action[action] = []
         self._index_by_action[action].append(entry)
         
+        if importance >= CONTEXT_MIN_IMPORTANCE:
+            self._shared_counts[agent] = self._shared_counts.get(agent, 0) + 1
+            self._shared_total += 1
+        
         return entry.id
     
     def get_entries_by_agent(self, agent: str) -> List[MemoryEntry]:
@@ -178,12 +191,13 @@ class EpisodicMemory:
         
         # Get recent high-importance entries from other agents
         other_entries = [
-            e for e in self.get_entries_by_importance(min_importance=0.7)
+            e for e in self.get_entries_by_importance(min_importance=CONTEXT_MIN_IMPORTANCE)
             if e.agent != agent
         ][:max_entries]
         
         return {
             'session_id': self.session_id,
+            'context_version': self.get_context_version(agent),
             'agent_history': [
                 {
                     'timestamp': e.timestamp,
@@ -204,6 +218,21 @@ class EpisodicMemory:
             ]
         }
     
+    def get_context_version(self, agent: str) -> Tuple[int, int]:
+        """
+        Get a token that changes whenever the agent's relevant context may change
+        
+        Only high-importance entries from other agents feed relevant_context,
+        so an agent's own entries leave the token unchanged.
+        
+        Args:
+            agent: Agent name requesting context
+            
+        Returns:
+            Tuple that compares equal only if relevant_context is unchanged
+        """
+        return (self._clear_count, self._shared_total - self._shared_counts.get(agent, 0))
+    
     def export_for_rag(self) -> List[Dict[str, Any]]:
         """
         Export memory entries in format suitable for RAG vector embedding
@@ -260,6 +289,9 @@ class EpisodicMemory:
         self.entries.clear()
         self._index_by_agent.clear()
         self._index_by_action.clear()
+        self._clear_count += 1
+        self._shared_counts.clear()
+        self._shared_total = 0
 
 
 class MemoryManager:
@@ -3,10 +3,12 @@ AMAR RAG Retriever Module - Integrated Version
 Core functionality for document ingestion, embedding, indexing, and retrieval
 Based on temp_amar_repo implementation with FAISS HNSW and reranking
 """
+import hashlib
 import os
 import pickle
+import sys
 import uuid
-from typing import List, Dict, Tuple, Optional
+from typing import List, Dict, MutableMapping, Tuple, Optional
 from datetime import datetime
 
 import numpy as np
@@ -24,6 +26,8 @@ HNSW_M = 64  # More connections = better accuracy
 HNSW_EF_CONSTRUCTION = 400  # Higher = better index quality
 HNSW_EF_SEARCH = 200  # Search-time parameter
 USE_RERANKING = True  # Enable cross-encoder reranking
+EMBED_BATCH_SIZE = 64  # Chunks per forward pass when ingesting in bulk
+SINGLE_THREADED_ENCODING = sys.platform == 'darwin'  # Threaded tokenizers/OMP segfault on macOS only
 
 
 class DocumentChunker:
@@ -76,15 +80,16 @@ class FAISSRetriever:
     def __init__(self, embedding_model: str = EMBEDDING_MODEL, use_hnsw: bool = True):
         import os
         import torch
-        # Disable multiprocessing to avoid segmentation faults on macOS
-        os.environ['TOKENIZERS_PARALLELISM'] = 'false'
-        os.environ['OMP_NUM_THREADS'] = '1'
-        os.environ['MKL_NUM_THREADS'] = '1'
-        # Disable torch multiprocessing
-        torch.set_num_threads(1)
+        if SINGLE_THREADED_ENCODING:
+            # Disable multiprocessing to avoid segmentation faults on macOS
+            os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+            os.environ['OMP_NUM_THREADS'] = '1'
+            os.environ['MKL_NUM_THREADS'] = '1'
+            # Disable torch multiprocessing
+            torch.set_num_threads(1)
         
         print(f"Loading embedding model: {embedding_model}")
-        # Load model with single-threaded settings
+        self.embedding_model = embedding_model
         self.model = SentenceTransformer(
             embedding_model,
             device='cpu',
@@ -124,8 +129,9 @@ class FAISSRetriever:
     def add_documents(self, chunks: List[Dict]) -> None:
         """Add document chunks to the index - processes one at a time to avoid multiprocessing crashes"""
         import os
-        # Ensure multiprocessing is disabled
-        os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+        if SINGLE_THREADED_ENCODING:
+            # Ensure multiprocessing is disabled
+            os.environ['TOKENIZERS_PARALLELISM'] = 'false'
         
         # Process chunks one at a time to avoid segmentation faults on macOS
         for i, chunk in enumerate(chunks):
@@ -159,14 +165,40 @@ class FAISSRetriever:
         
         print(f"Added {len(chunks)} chunks. Total chunks: {len(self.chunks)}")
     
-    def search(self, query: str, top_k: int = TOP_K_RESULTS) -> List[Tuple[Dict, float]]:
-        """Search for relevant chunks with optional reranking"""
+    def encode_chunks(self, chunks: List[Dict], batch_size: int = EMBED_BATCH_SIZE) -> np.ndarray:
+        """Embed chunk texts with a single batched encode call"""
+        embeddings = self.model.encode(
+            [chunk["text"] for chunk in chunks],
+            convert_to_numpy=True,
+            show_progress_bar=False,
+            batch_size=batch_size,
+            device='cpu',
+            normalize_embeddings=False
+        )
+        return np.asarray(embeddings, dtype='float32').reshape(len(chunks), -1)
+    
+    def add_embedded_chunks(self, chunks: List[Dict], embeddings: np.ndarray) -> None:
+        """Add chunks whose embeddings are already computed (row i belongs to chunk i)"""
+        self.index.add(np.asarray(embeddings, dtype='float32'))
+        self.chunks.extend(chunks)
+        
+        print(f"Added {len(chunks)} chunks. Total chunks: {len(self.chunks)}")
+    
+    def search(
+        self,
+        query: str,
+        top_k: int = TOP_K_RESULTS,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Tuple[Dict, float]]:
+        """Search for relevant chunks with optional reranking (query_embedding skips re-encoding the query)"""
         if len(self.chunks) == 0:
             return []
         
         # Step 1: Initial retrieval with FAISS (get more candidates for reranking)
         initial_k = top_k * 3 if self.reranker else top_k
-        query_embedding = self.embed_text(query).reshape(1, -1).astype('float32')
+        if query_embedding is None:
+            query_embedding = self.embed_text(query)
+        query_embedding = np.asarray(query_embedding).reshape(1, -1).astype('float32')
         
         distances, indices = self.index.search(query_embedding, min(initial_k, len(self.chunks)))
         
@@ -211,7 +243,7 @@ class FAISSRetriever:
                 "chunks": self.chunks,
                 "doc_metadata": self.doc_metadata,
                 "dimension": self.dimension
-            }, f)
+            }, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         print(f"Index saved to {filepath}")
     
@@ -249,6 +281,7 @@ class RAGPipeline:
         self.chunker = DocumentChunker()
         self.retriever = FAISSRetriever()
         self.llm_type = llm_type
+        self._ingested_content: Dict[str, str] = {}  # content hash -> doc_id of the indexed copy
     
     def ingest_document(self, text: str, metadata: Dict) -> None:
         """Ingest a document: chunk, embed, and index"""
@@ -261,9 +294,86 @@ class RAGPipeline:
         self.retriever.add_documents(chunks)
         self.retriever.doc_metadata[metadata["doc_id"]] = metadata
     
-    def retrieve(self, query: str, top_k: int = TOP_K_RESULTS) -> List[Tuple[Dict, float]]:
+    def embedding_cache_key(self, text: str) -> str:
+        """Content hash of a document under the current model and chunking settings"""
+        payload = f"{self.retriever.embedding_model}|{self.chunker.chunk_size}|{self.chunker.overlap}|{text}"
+        return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def ingest_documents(
+        self,
+        texts: List[str],
+        metadatas: List[Dict],
+        batch_size: int = EMBED_BATCH_SIZE,
+        embedding_cache: Optional[MutableMapping[str, np.ndarray]] = None
+    ) -> None:
+        """
+        Ingest many documents: chunk each, then embed and index all chunks in one pass
+        
+        Args:
+            texts: Document contents
+            metadatas: Metadata for each document (doc_id and created_at are filled in)
+            batch_size: Chunks per encoder forward pass
+            embedding_cache: Optional mapping from embedding_cache_key() to the
+                document's chunk embeddings; unchanged documents reuse their
+                cached rows and only new or edited ones are encoded
+        
+        Documents whose content was already ingested by this pipeline are not
+        chunked or indexed again; their metadata is recorded with a
+        "duplicate_of" doc_id pointing at the indexed copy.
+        """
+        created_at = datetime.now().isoformat()
+        documents = []
+        
+        for text, metadata in zip(texts, metadatas):
+            if "doc_id" not in metadata:
+                metadata["doc_id"] = str(uuid.uuid4())
+            metadata["created_at"] = created_at
+            self.retriever.doc_metadata[metadata["doc_id"]] = metadata
+            
+            key = self.embedding_cache_key(text)
+            original_doc_id = self._ingested_content.get(key)
+            if original_doc_id is not None:
+                metadata["duplicate_of"] = original_doc_id
+                continue
+            self._ingested_content[key] = metadata["doc_id"]
+            
+            chunks = self.chunker.chunk_text(text, metadata)
+            
+            if embedding_cache is None:
+                key = None
+            cached = embedding_cache.get(key) if key is not None else None
+            if cached is not None and len(cached) != len(chunks):
+                cached = None
+            documents.append((key, chunks, cached))
+        
+        # Encode every uncached chunk in a single call
+        misses = [chunk for _, chunks, cached in documents if cached is None for chunk in chunks]
+        fresh = self.retriever.encode_chunks(misses, batch_size=batch_size) if misses else None
+        
+        all_chunks = []
+        rows = []
+        offset = 0
+        for key, chunks, embeddings in documents:
+            if embeddings is None:
+                embeddings = fresh[offset:offset + len(chunks)] if chunks else None
+                offset += len(chunks)
+                if key is not None and embeddings is not None:
+                    embedding_cache[key] = embeddings
+            if chunks:
+                all_chunks.extend(chunks)
+                rows.append(embeddings)
+        
+        if all_chunks:
+            self.retriever.add_embedded_chunks(all_chunks, np.vstack(rows))
+    
+    def retrieve(
+        self,
+        query: str,
+        top_k: int = TOP_K_RESULTS,
+        query_embedding: Optional[np.ndarray] = None
+    ) -> List[Tuple[Dict, float]]:
         """Retrieve relevant chunks for a query"""
-        return self.retriever.search(query, top_k)
+        return self.retriever.search(query, top_k, query_embedding=query_embedding)
     
     def enrich_query(self, query: str, top_k: int = 5) -> str:
         """Enrich user query with RAG context"""
@@ -11,10 +11,20 @@ Validates: Requirements 11.1, 11.2, 11.3
 """
 
 from typing import Dict, List, Optional, Any
+import hashlib
+import json
 import logging
 
+from .llm_cache import InMemoryBackend
+from .semantic_cache import SemanticPlanCache
+
 logger = logging.getLogger(__name__)
 
+# Retrieval cache: exact matches on the normalized query first, then
+# near-duplicate queries by embedding similarity
+RAG_CACHE_ENTRIES = 1000
+RAG_SEMANTIC_THRESHOLD = 0.95
+
 
 class RAGService:
     """
@@ -43,6 +53,8 @@ class RAGService:
         
         self.is_enabled = False
         self.rag_pipeline = None
+        self._exact_cache = InMemoryBackend(max_entries=RAG_CACHE_ENTRIES)
+        self._semantic_cache: Optional[SemanticPlanCache] = None
         
         # Try to load RAG pipeline
         try:
@@ -51,6 +63,7 @@ class RAGService:
                 from services.rag_retriever import RAGPipeline
                 self.rag_pipeline = RAGPipeline()
                 self.rag_pipeline.load(self.knowledge_base_path)
+                self._reset_caches()
                 self.is_enabled = True
                 logger.info(f"RAG Service initialized with {len(self.rag_pipeline.retriever.chunks)} chunks")
             else:
@@ -72,6 +85,8 @@ class RAGService:
         
         This method will be called before passing user input to LangGraph workflow.
         It enriches the user query with relevant context from the knowledge base.
+        Successful retrievals are cached; repeated or near-identical queries are
+        answered from the cache without searching the index.
         
         Args:
             user_query: The user's application description
@@ -95,11 +110,27 @@ class RAGService:
                 }
             }
         
+        exact_key = self._exact_cache_key(user_query, top_k, filters)
+        cached = self._exact_cache.get(exact_key)
+        if cached is not None:
+            return self._build_result(user_query, json.loads(cached))
+        
+        context_key = json.dumps({'top_k': top_k, 'filters': filters}, sort_keys=True, default=str)
+        
         try:
+            # Encoded once for the semantic lookup, the index search and the cache store
+            query_embedding = self.rag_pipeline.retriever.embed_text(user_query)
+            
+            if self._semantic_cache is not None:
+                retrieval = self._semantic_cache.get(user_query, context_key=context_key, vector=query_embedding)
+                if retrieval is not None:
+                    self._exact_cache.set(exact_key, json.dumps(retrieval))
+                    return self._build_result(user_query, retrieval)
+            
             logger.info(f"Retrieving context for query: {user_query[:100]}...")
             
             # Use RAG pipeline to retrieve relevant context
-            retrieved = self.rag_pipeline.retrieve(user_query, top_k=top_k)
+            retrieved = self.rag_pipeline.retrieve(user_query, top_k=top_k, query_embedding=query_embedding)
             
             # Format retrieved docs
             retrieved_docs = [
@@ -112,11 +143,7 @@ class RAGService:
                 for chunk, score in retrieved
             ]
             
-            # Enrich query with retrieved context
-            enriched_query = self._enrich_query(user_query, retrieved_docs)
-            
-            return {
-                "enriched_query": enriched_query,
+            retrieval = {
                 "retrieved_docs": retrieved_docs,
                 "metadata": {
                     "rag_enabled": True,
@@ -137,6 +164,56 @@ class RAGService:
                     "error": str(e)
                 }
             }
+        
+        self._cache_result(exact_key, user_query, retrieval, context_key, query_embedding)
+        return self._build_result(user_query, retrieval)
+    
+    def _build_result(self, user_query: str, retrieval: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Combine a (possibly cached) retrieval with this request's enriched query
+        
+        Only retrieved_docs and metadata are cached; the enriched query embeds
+        the user's own text, so it is rebuilt for every request.
+        """
+        return {
+            "enriched_query": self._enrich_query(user_query, retrieval["retrieved_docs"]),
+            **retrieval
+        }
+    
+    def _cache_result(
+        self,
+        exact_key: str,
+        user_query: str,
+        retrieval: Dict[str, Any],
+        context_key: str,
+        query_embedding: Any
+    ) -> None:
+        """Cache a successful retrieval; a failed cache write never discards the result"""
+        try:
+            self._exact_cache.set(exact_key, json.dumps(retrieval, default=str))
+            if self._semantic_cache is not None:
+                self._semantic_cache.put(user_query, retrieval, context_key=context_key, vector=query_embedding)
+        except Exception as e:
+            logger.warning(f"Failed to cache RAG retrieval: {e}")
+    
+    @staticmethod
+    def _exact_cache_key(user_query: str, top_k: int, filters: Optional[Dict[str, Any]]) -> str:
+        """Cache key for a query, ignoring case and surrounding whitespace"""
+        payload = json.dumps(
+            {'query': user_query.strip().lower(), 'top_k': top_k, 'filters': filters},
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.blake2b(payload.encode('utf-8')).hexdigest()
+    
+    def _reset_caches(self):
+        """Drop cached retrievals (called whenever a knowledge base is loaded)"""
+        self._exact_cache.clear()
+        self._semantic_cache = SemanticPlanCache(
+            threshold=RAG_SEMANTIC_THRESHOLD,
+            max_entries=RAG_CACHE_ENTRIES,
+            encoder=self.rag_pipeline.retriever.model
+        )
     
     def _enrich_query(self, original_query: str, retrieved_docs: List[Dict]) -> str:
         """
@@ -220,6 +297,7 @@ Use this context to inform your planning."""
                 if self.rag_pipeline is None:
                     self.rag_pipeline = RAGPipeline()
                 self.rag_pipeline.load(knowledge_base_path)
+                self._reset_caches()
                 self.is_enabled = True
                 logger.info(f"RAG-FAISS enabled with {len(self.rag_pipeline.retriever.chunks)} chunks from: {knowledge_base_path}")
             else:
@@ -102,6 +102,9 @@ class SessionRateLimiter:
             
         Validates: Requirements 10.1, 10.2
         """
+        # Read the clock before taking the lock to keep the critical section short
+        now = datetime.now()
+        
         with self._lock:
             # Get current count for session
             current_count = self._session_counts.get(session_id, 0)
@@ -115,7 +118,7 @@ class SessionRateLimiter:
             
             # Increment counter
             self._session_counts[session_id] = current_count + 1
-            self._session_timestamps[session_id] = datetime.now()
+            self._session_timestamps[session_id] = now
     
     def get_remaining_requests(self, session_id: str) -> int:
         """
@@ -0,0 +1,284 @@
+"""
+Semantic Cache for LLM Plan Generation
+Reuses plans generated for paraphrases of earlier descriptions so the
+Planner Agent can skip the remote LLM round-trip on a hit
+"""
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Configuration
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"  # 384-dim, fast on CPU
+SIMILARITY_THRESHOLD = 0.87
+MAX_CACHE_ENTRIES = 1000
+
+
+def context_fingerprint(context: Optional[Dict[str, Any]]) -> str:
+    """
+    Short, stable hash of the session context that influences a plan
+    
+    Args:
+        context: Context dictionary from episodic memory
+    
+    Returns:
+        16-character hex digest (empty context hashes to a fixed value)
+    """
+    relevant = (context or {}).get('relevant_context') or []
+    payload = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class SemanticPlanCache:
+    """
+    Embedding-keyed cache of generated plans
+    
+    Descriptions are embedded with a small sentence-transformers model and
+    compared by cosine similarity against all cached descriptions with the
+    same context fingerprint. Entries are evicted least-recently-used once
+    the cache holds max_entries plans.
+    """
+    
+    def __init__(
+        self,
+        model_name: str = SEMANTIC_CACHE_MODEL,
+        threshold: float = SIMILARITY_THRESHOLD,
+        max_entries: int = MAX_CACHE_ENTRIES,
+        enabled: bool = True,
+        encoder: Any = None
+    ):
+        """
+        Initialize semantic cache
+        
+        Args:
+            model_name: sentence-transformers model used for embeddings
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Maximum number of cached plans
+            enabled: Set False to turn every lookup into a miss
+            encoder: Optional preloaded encoder exposing encode(List[str])
+        """
+        self.model_name = model_name
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._encoder = encoder
+        
+        # Parallel storage: row i of the matrix belongs to plan i
+        self._embeddings: List[np.ndarray] = []
+        self._plans: List[str] = []
+        self._context_keys: List[str] = []
+        self._matrix: Optional[np.ndarray] = None
+        self._key_array: Optional[np.ndarray] = None
+        
+        self._lock = Lock()
+        self._save_lock = Lock()
+        self.stats = {'hits': 0, 'misses': 0}
+    
+    def _get_encoder(self) -> Any:
+        """Load the embedding model on first use; disable the cache if unavailable"""
+        if self._encoder is None and self.enabled:
+            try:
+                from sentence_transformers import SentenceTransformer
+                self._encoder = SentenceTransformer(self.model_name, device='cpu')
+                logger.info(f"Semantic cache loaded embedding model: {self.model_name}")
+            except Exception as e:
+                logger.warning(f"Semantic cache disabled, embedding model unavailable: {e}")
+                self.enabled = False
+        return self._encoder
+    
+    def use_encoder(self, encoder: Any) -> None:
+        """Embed with an already-loaded encoder (e.g. the RAG retriever's model) and enable the cache"""
+        self._encoder = encoder
+        self.enabled = True
+    
+    @staticmethod
+    def _normalize(vector: Any) -> np.ndarray:
+        """Scale an embedding to a unit-length float32 vector"""
+        vector = np.asarray(vector, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+    
+    def embed(self, text: str) -> Optional[np.ndarray]:
+        """
+        Embed text once so the vector can be passed to both get() and put()
+        
+        Returns:
+            Unit-length float32 vector, or None when the cache is disabled
+        """
+        if not self.enabled:
+            return None
+        
+        encoder = self._get_encoder()
+        if encoder is None:
+            return None
+        
+        return self._normalize(encoder.encode([text])[0])
+    
+    def get(
+        self,
+        description: str,
+        context_key: str = "",
+        vector: Optional[np.ndarray] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached plan for a semantically similar description
+        
+        Args:
+            description: User's application description
+            context_key: Context fingerprint the plan must have been generated under
+            vector: Precomputed embedding of description (computed here if omitted)
+        
+        Returns:
+            Fresh copy of the cached plan dictionary, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        
+        query = self.embed(description) if vector is None else self._normalize(vector)
+        if query is None:
+            return None
+        
+        with self._lock:
+            if not self._plans:
+                self.stats['misses'] += 1
+                return None
+            
+            if self._matrix is None:
+                self._matrix = np.ascontiguousarray(np.vstack(self._embeddings), dtype=np.float32)
+                self._key_array = np.array(self._context_keys, dtype=object)
+            
+            # One matrix-vector product scores every cached description (rows are
+            # unit length, so the dot product is the cosine similarity); entries
+            # from other contexts are masked out in a single vectorized step
+            similarities = self._matrix @ query
+            similarities[self._key_array != context_key] = -1.0
+            
+            best = int(np.argmax(similarities))
+            if similarities[best] < self.threshold:
+                self.stats['misses'] += 1
+                return None
+            
+            plan_json = self._plans[best]
+            self._touch(best)
+            self.stats['hits'] += 1
+        
+        return json.loads(plan_json)
+    
+    def put(
+        self,
+        description: str,
+        plan: Dict[str, Any],
+        context_key: str = "",
+        vector: Optional[np.ndarray] = None
+    ) -> None:
+        """
+        Store a generated plan
+        
+        Args:
+            description: User's application description
+            plan: Plan dictionary returned by the LLM
+            context_key: Context fingerprint the plan was generated under
+            vector: Precomputed embedding of description (computed here if omitted)
+        """
+        if not self.enabled:
+            return
+        
+        vector = self.embed(description) if vector is None else self._normalize(vector)
+        if vector is None:
+            return
+        
+        with self._lock:
+            if len(self._plans) >= self.max_entries:
+                self._evict(0)
+            
+            self._embeddings.append(vector)
+            self._plans.append(json.dumps(plan))
+            self._context_keys.append(context_key)
+            self._matrix = None
+    
+    def _touch(self, index: int) -> None:
+        """Mark an entry as most recently used by moving it to the end"""
+        if index == len(self._plans) - 1:
+            return
+        
+        self._embeddings.append(self._embeddings.pop(index))
+        self._plans.append(self._plans.pop(index))
+        self._context_keys.append(self._context_keys.pop(index))
+        self._matrix = None
+    
+    def _evict(self, index: int) -> None:
+        """Remove an entry from all parallel stores"""
+        del self._embeddings[index]
+        del self._plans[index]
+        del self._context_keys[index]
+        self._matrix = None
+    
+    def __len__(self) -> int:
+        return len(self._plans)
+    
+    def clear(self) -> None:
+        """Remove all cached plans"""
+        with self._lock:
+            self._embeddings.clear()
+            self._plans.clear()
+            self._context_keys.clear()
+            self._matrix = None
+    
+    def save(self, path: str) -> None:
+        """
+        Persist cache for warm starts
+        
+        Writes embeddings to <path>.npy and plans to <path>.json. Concurrent
+        saves are serialized, and each file is written to a temporary name and
+        renamed into place so readers never see a partial cache.
+        """
+        with self._lock:
+            if not self._plans:
+                return
+            matrix = np.vstack(self._embeddings)
+            stored = {'plans': list(self._plans), 'context_keys': list(self._context_keys)}
+        
+        with self._save_lock:
+            with open(f"{path}.npy.tmp", 'wb') as f:
+                np.save(f, matrix)
+            with open(f"{path}.json.tmp", 'w') as f:
+                json.dump(stored, f)
+            os.replace(f"{path}.npy.tmp", f"{path}.npy")
+            os.replace(f"{path}.json.tmp", f"{path}.json")
+    
+    def load(self, path: str) -> bool:
+        """
+        Load a cache previously written by save()
+        
+        Returns:
+            True if a saved cache was found and loaded
+        """
+        matrix_file = Path(f"{path}.npy")
+        plans_file = Path(f"{path}.json")
+        if not matrix_file.exists() or not plans_file.exists():
+            return False
+        
+        try:
+            matrix = np.load(matrix_file)
+            with open(plans_file) as f:
+                stored = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to load semantic cache from {path}: {e}")
+            return False
+        
+        with self._lock:
+            self._embeddings = [row for row in matrix.astype(np.float32)][-self.max_entries:]
+            self._plans = stored['plans'][-self.max_entries:]
+            self._context_keys = stored['context_keys'][-self.max_entries:]
+            self._matrix = None
+        
+        logger.info(f"Semantic cache loaded {len(self._plans)} plans from {path}")
+        return True
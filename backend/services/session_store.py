@@ -0,0 +1,229 @@
+"""
+Session Store for AMAR MVP
+Holds per-session generation state (description, status, progress history,
+workflow result) so that it can live in Redis and be shared by every worker
+process; WebSocket connections stay local to the worker that accepted them
+"""
+
+import json
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field, fields
+from typing import Any, Deque, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SESSION_TTL_SECONDS = 3600
+MAX_PROGRESS_UPDATES = 200  # Most recent progress updates kept per session
+
+
+@dataclass(slots=True)
+class Session:
+    """State of one generation session"""
+    description: str = ""
+    enriched_description: str = ""
+    rag_metadata: Dict[str, Any] = field(default_factory=dict)
+    status: str = "initiated"
+    created_at: str = ""
+    progress: Deque[Dict[str, Any]] = field(default_factory=lambda: deque(maxlen=MAX_PROGRESS_UPDATES))
+    result: Optional[Dict[str, Any]] = None
+    workflow_state: Optional[Dict[str, Any]] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Session":
+        """Build a session from a field dictionary (unknown keys are ignored)"""
+        known = {name: value for name, value in data.items() if name in SESSION_FIELDS}
+        known['progress'] = deque(known.get('progress', ()), maxlen=MAX_PROGRESS_UPDATES)
+        return cls(**known)
+
+
+SESSION_FIELDS = frozenset(f.name for f in fields(Session))
+
+
+def _encode(value: Any) -> str:
+    """Serialize a session field for Redis (datetimes and other objects become strings)"""
+    return json.dumps(value, default=str)
+
+
+class InMemorySessionStore:
+    """
+    Process-local session store
+    
+    Sessions expire ttl_seconds after their last write; expired sessions are
+    purged whenever a new session is created, so memory stays bounded by the
+    number of sessions active within one TTL window. Each session's progress
+    history is a deque holding the latest MAX_PROGRESS_UPDATES entries.
+    """
+    
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, Session] = {}
+        self._expires_at: Dict[str, float] = {}
+    
+    def _live(self, session_id: str) -> Optional[Session]:
+        """Return the session if it exists and has not expired"""
+        session = self._sessions.get(session_id)
+        if session is not None and self._expires_at[session_id] < time.monotonic():
+            del self._sessions[session_id]
+            del self._expires_at[session_id]
+            return None
+        return session
+    
+    def _touch(self, session_id: str) -> None:
+        self._expires_at[session_id] = time.monotonic() + self.ttl_seconds
+    
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for session_id in [sid for sid, expires in self._expires_at.items() if expires < now]:
+            del self._sessions[session_id]
+            del self._expires_at[session_id]
+    
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Store a new session (replacing any existing one with the same id)"""
+        self._purge_expired()
+        self._sessions[session_id] = Session.from_dict(data)
+        self._touch(session_id)
+    
+    async def get(self, session_id: str) -> Optional[Session]:
+        """Return the session, or None if unknown or expired"""
+        return self._live(session_id)
+    
+    async def exists(self, session_id: str) -> bool:
+        return self._live(session_id) is not None
+    
+    async def update(self, session_id: str, **fields: Any) -> None:
+        """Set individual session fields; unknown sessions are ignored"""
+        session = self._live(session_id)
+        if session is None:
+            return
+        for name, value in fields.items():
+            setattr(session, name, value)
+        self._touch(session_id)
+    
+    async def append_progress(self, session_id: str, update: Dict[str, Any]) -> None:
+        """Append a progress update to the session history"""
+        session = self._live(session_id)
+        if session is None:
+            return
+        session.progress.append(update)
+        self._touch(session_id)
+    
+    async def count(self) -> int:
+        """Number of live sessions"""
+        self._purge_expired()
+        return len(self._sessions)
+
+
+class RedisSessionStore:
+    """
+    Session store shared by all workers (requires the redis package)
+    
+    Each session is a Redis hash with one JSON-encoded value per field, so
+    status and result updates do not rewrite the whole session; the progress
+    history is a separate list, trimmed to the latest MAX_PROGRESS_UPDATES.
+    """
+    
+    def __init__(self, url: str, prefix: str = "amar:session:", ttl_seconds: int = SESSION_TTL_SECONDS):
+        import redis.asyncio as redis
+        
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self.prefix = prefix
+        self.ttl_seconds = ttl_seconds
+    
+    def _keys(self, session_id: str) -> List[str]:
+        key = self.prefix + session_id
+        return [key, f"{key}:progress"]
+    
+    async def create(self, session_id: str, data: Dict[str, Any]) -> None:
+        """Store a new session (replacing any existing one with the same id)"""
+        key, progress_key = self._keys(session_id)
+        fields = {name: _encode(value) for name, value in data.items() if name != 'progress'}
+        progress = [_encode(update) for update in data.get('progress', [])][-MAX_PROGRESS_UPDATES:]
+        
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(key, progress_key)
+            pipe.hset(key, mapping=fields)
+            if progress:
+                pipe.rpush(progress_key, *progress)
+                pipe.expire(progress_key, self.ttl_seconds)
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+    
+    async def get(self, session_id: str) -> Optional[Session]:
+        """Return the session, or None if unknown or expired"""
+        key, progress_key = self._keys(session_id)
+        
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.hgetall(key)
+            pipe.lrange(progress_key, 0, -1)
+            fields, progress = await pipe.execute()
+        
+        if not fields:
+            return None
+        
+        session = {name: json.loads(value) for name, value in fields.items()}
+        session['progress'] = [json.loads(update) for update in progress]
+        return Session.from_dict(session)
+    
+    async def exists(self, session_id: str) -> bool:
+        return bool(await self._client.exists(self.prefix + session_id))
+    
+    async def update(self, session_id: str, **fields: Any) -> None:
+        """Set individual session fields; unknown sessions are ignored"""
+        if not fields or not await self.exists(session_id):
+            return
+        
+        key, progress_key = self._keys(session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping={name: _encode(value) for name, value in fields.items()})
+            pipe.expire(key, self.ttl_seconds)
+            pipe.expire(progress_key, self.ttl_seconds)
+            await pipe.execute()
+    
+    async def append_progress(self, session_id: str, update: Dict[str, Any]) -> None:
+        """Append a progress update to the session history"""
+        key, progress_key = self._keys(session_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.rpush(progress_key, _encode(update))
+            pipe.ltrim(progress_key, -MAX_PROGRESS_UPDATES, -1)
+            pipe.expire(progress_key, self.ttl_seconds)
+            pipe.expire(key, self.ttl_seconds)
+            await pipe.execute()
+    
+    async def count(self) -> int:
+        """Number of live sessions (scans the key space; meant for status endpoints)"""
+        count = 0
+        async for key in self._client.scan_iter(match=f"{self.prefix}*"):
+            if not key.endswith(":progress"):
+                count += 1
+        return count
+
+
+# Global session store instance
+_session_store = None
+
+
+def get_session_store():
+    """
+    Get or create the global session store
+    
+    Uses Redis when SESSION_REDIS_URL is configured, otherwise an in-memory
+    store (suitable for a single worker process).
+    
+    Returns:
+        InMemorySessionStore or RedisSessionStore instance
+    """
+    global _session_store
+    
+    if _session_store is None:
+        from config import get_settings
+        
+        settings = get_settings()
+        if settings.session_redis_url:
+            _session_store = RedisSessionStore(settings.session_redis_url)
+            logger.info("Session store: Redis")
+        else:
+            _session_store = InMemorySessionStore()
+    
+    return _session_store
@@ -0,0 +1,20 @@
+#!/bin/sh
+# AMAR MVP Backend production entrypoint
+#
+# Runs the FastAPI app under Gunicorn with Uvicorn workers, one event loop
+# per worker process. --preload imports the app once in the master so workers
+# share the loaded modules copy-on-write.
+#
+# Keep WEB_CONCURRENCY at 1 unless SESSION_REDIS_URL is set AND WebSocket
+# connections are routed stickily: live progress is pushed only to sockets
+# held by the worker that runs the session's workflow.
+#
+# Workflow phases can hold the event loop for long stretches (LLM and build
+# calls), so the worker heartbeat timeout is disabled.
+
+exec gunicorn main:app \
+    --worker-class uvicorn.workers.UvicornWorker \
+    --workers "${WEB_CONCURRENCY:-1}" \
+    --preload \
+    --timeout 0 \
+    --bind "0.0.0.0:${PORT:-8000}"
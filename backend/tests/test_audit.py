@@ -88,6 +88,20 @@ class TestAuditLogger:
         assert lineage.reason == "Generate main React component"
         assert len(lineage.modified_by) == 0
     
+    @pytest.mark.asyncio
+    async def test_log_file_operation_preview_and_size(self, audit_logger):
+        """Test that only a short preview is kept and size comes from the caller"""
+        content = "x" * 1000
+        await audit_logger.log_file_operation("builder", "create", "a.tsx", "r", content_preview=content)
+        await audit_logger.log_file_operation(
+            "builder", "modify", "a.tsx", "r", content_preview=content, file_size_bytes=1000
+        )
+
+        created, modified = audit_logger.entries
+        assert created.details["content_preview"] == "x" * 200
+        assert created.details["file_size_bytes"] is None
+        assert modified.details["file_size_bytes"] == 1000
+
     @pytest.mark.asyncio
     async def test_log_file_operation_modify(self, audit_logger):
         """Test logging file modification updates lineage"""
@@ -113,6 +127,20 @@ class TestAuditLogger:
         assert "builder" in lineage.modified_by
         assert len(audit_logger.entries) == 2
     
+    @pytest.mark.asyncio
+    async def test_file_operation_lineage_snapshots(self, audit_logger):
+        """Test that each entry keeps the lineage as it was when logged"""
+        await audit_logger.log_file_operation("builder", "create", "a.tsx", "Initial creation")
+        await audit_logger.log_file_operation("tester", "modify", "a.tsx", "Fix")
+
+        created, modified = audit_logger.entries
+        assert created.details["lineage"]["modified_by"] == []
+        assert modified.details["lineage"]["modified_by"] == ["tester"]
+
+        audit_trail = await audit_logger.generate_audit_trail()
+        lineage = audit_logger.get_file_lineage("a.tsx")
+        assert audit_trail["file_lineage"]["a.tsx"] == lineage.model_dump()
+
     @pytest.mark.asyncio
     async def test_log_error_with_exception(self, audit_logger):
         """Test logging errors with exception objects"""
@@ -244,6 +272,24 @@ class TestAuditLogger:
         assert "file_lineage" in audit_trail
         assert "performance_metrics" in audit_trail
     
+    @pytest.mark.asyncio
+    async def test_audit_trail_statistics(self, audit_logger):
+        """Test summary statistics and average duration of timed entries"""
+        await audit_logger.log_agent_decision("planner", "plan", {}, duration_ms=100)
+        await audit_logger.log_agent_decision("planner", "revise", {})
+        await audit_logger.log_file_operation("builder", "create", "a.tsx", "r", duration_ms=300)
+        await audit_logger.log_file_operation("builder", "modify", "a.tsx", "r")
+        await audit_logger.log_error("builder", "Test error", {})
+
+        audit_trail = await audit_logger.generate_audit_trail()
+        summary = audit_trail["summary"]
+
+        assert summary["unique_agents"] == 2
+        assert set(summary["actions"]) == {"plan", "revise", "file_create", "file_modify", "error"}
+        assert summary["file_operations"] == 2
+        assert summary["error_count"] == 1
+        assert audit_trail["performance_metrics"]["avg_operation_time_ms"] == 200
+
     @pytest.mark.asyncio
     async def test_export_to_file(self, audit_logger, temp_log_dir):
         """Test exporting audit trail to JSON file"""
@@ -261,6 +307,49 @@ class TestAuditLogger:
         assert data["summary"]["total_entries"] == 1
         assert len(data["entries"]) == 1
     
+    @pytest.mark.asyncio
+    async def test_jsonl_log_file_contents(self, audit_logger, temp_log_dir):
+        """Test that each entry is appended to the session JSONL file"""
+        await audit_logger.log_agent_decision("planner", "plan", {"pages": 2}, duration_ms=10)
+        await audit_logger.log_error("builder", "Build failed", {"context": "test"})
+        await audit_logger.flush_pending_writes()
+
+        log_file = Path(temp_log_dir) / "audit_test_session.jsonl"
+        lines = [json.loads(line) for line in log_file.read_text().splitlines()]
+
+        assert len(lines) == 2
+        assert lines[0]["agent"] == "planner"
+        assert lines[0]["details"] == {"pages": 2}
+        assert lines[0]["duration_ms"] == 10
+        assert lines[0]["category"] == "agent_decision"
+        assert lines[1]["action"] == "error"
+        assert lines[1]["importance"] == 1.0
+
+    @pytest.mark.asyncio
+    async def test_close_writes_queued_entries(self, audit_logger, temp_log_dir):
+        """Test that close() writes queued entries before closing the file"""
+        await audit_logger.log_agent_decision("planner", "plan", {"pages": 1})
+        await audit_logger.close()
+
+        log_file = Path(temp_log_dir) / "audit_test_session.jsonl"
+        assert len(log_file.read_text().splitlines()) == 1
+
+        # Closing twice is harmless
+        await audit_logger.close()
+
+    def test_dropped_logger_closes_its_descriptor(self, temp_log_dir):
+        """Test that a logger garbage collected without close() releases its file"""
+        import gc
+        import os
+        
+        logger = AuditLogger("dropped_session", temp_log_dir)
+        fd = logger._fd
+        del logger
+        gc.collect()
+        
+        with pytest.raises(OSError):
+            os.fstat(fd)
+
     @pytest.mark.asyncio
     async def test_async_logging_performance(self, audit_logger):
         """Test that async logging doesn't block execution"""
@@ -594,7 +683,7 @@ class TestAuditLogPropertyTests:
             
             # Verify that async writes are actually happening
             # There should be pending writes or they should complete quickly
-            pending_count_before_flush = len(logger.pending_writes)
+            pending_count_before_flush = logger._write_queue.qsize()
             
             # Flush all pending writes and measure time
             flush_start = time.perf_counter()
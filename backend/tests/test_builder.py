@@ -994,6 +994,17 @@ export default FixedComponent;"""
             page_spec = builder._find_page_spec(self.sample_plan, 'NonExistentPage')
             assert page_spec is None
     
+    def test_create_file_lineage(self):
+        """Test that lineage is recorded for every generated file"""
+        with patch('backend.agents.builder.ChatGoogleGenerativeAI'):
+            builder = BuilderAgent()
+            
+            lineage = builder._create_file_lineage({'src/App.tsx': '', 'package.json': ''}, 'test-session')
+            
+            assert [entry.file_path for entry in lineage] == ['src/App.tsx', 'package.json']
+            assert all(entry.created_by == 'builder' and entry.modified_by == [] for entry in lineage)
+            assert len({entry.created_at for entry in lineage}) == 1
+    
     def test_find_component_spec(self):
         """Test that _find_component_spec correctly finds component specifications"""
         # Mock the LLM
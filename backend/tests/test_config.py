@@ -0,0 +1,21 @@
+"""
+Tests for configuration management
+"""
+
+from backend.config import Settings, get_settings, settings
+
+
+class TestSettings:
+    """Test suite for application settings"""
+    
+    def test_get_settings_returns_singleton(self):
+        """Test that settings are loaded once and shared"""
+        assert get_settings() is get_settings()
+        assert get_settings() is settings
+    
+    def test_cors_origins_list(self):
+        """Test that CORS origins are split and stripped"""
+        config = Settings(cors_origins="http://a.test, http://b.test")
+        
+        assert config.cors_origins_list == ["http://a.test", "http://b.test"]
+        assert config.cors_origins_list is config.cors_origins_list
@@ -8,7 +8,8 @@ from fastapi.testclient import TestClient
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from main import app
+import asyncio
+from main import app, _drop_backfilled
 
 client = TestClient(app)
 
@@ -96,6 +97,22 @@ def test_websocket_ping_pong():
         
         # Receive response (could be pong or progress update from workflow)
         response_data = websocket.receive_json()
-        # Either pong or progress is acceptable since workflow may have started
-        assert response_data["type"] in ["pong", "progress"]
+        # Pong, progress, or the backfill of earlier progress is acceptable since
+        # the workflow may have started
+        assert response_data["type"] in ["pong", "progress", "backfill"]
         assert "timestamp" in response_data
+
+
+def test_backfilled_updates_are_not_resent():
+    """Test that updates queued before the backfill snapshot are not delivered twice"""
+    first = {"type": "progress", "agent": "planner", "status": "running", "message": "a"}
+    second = {"type": "progress", "agent": "planner", "status": "completed", "message": "b"}
+    pong = {"type": "pong"}
+    
+    queue = asyncio.Queue()
+    for message in (first, pong, second):
+        queue.put_nowait(message)
+    
+    _drop_backfilled(queue, [dict(first)])
+    
+    assert [queue.get_nowait() for _ in range(queue.qsize())] == [pong, second]
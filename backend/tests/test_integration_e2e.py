@@ -101,6 +101,7 @@ class TestSimpleSinglePageAppGeneration:
         }
         '''
         mock_planner_llm.invoke.return_value = mock_planner_response
+        mock_planner_llm.ainvoke = AsyncMock(return_value=mock_planner_response)
         mock_planner_llm_class.return_value = mock_planner_llm
         
         # Setup: Mock Builder LLM to return React components
@@ -301,6 +302,7 @@ class TestMultiPageAppWithRouting:
         }
         '''
         mock_planner_llm.invoke.return_value = mock_planner_response
+        mock_planner_llm.ainvoke = AsyncMock(return_value=mock_planner_response)
         mock_planner_llm_class.return_value = mock_planner_llm
         
         # Setup: Mock Builder LLM to return React components with routing
@@ -533,6 +535,7 @@ class TestBackendLogicIntegration:
         }
         '''
         mock_planner_llm.invoke.return_value = mock_planner_response
+        mock_planner_llm.ainvoke = AsyncMock(return_value=mock_planner_response)
         mock_planner_llm_class.return_value = mock_planner_llm
         
         # Setup: Mock Builder LLM to return components with API integration
@@ -780,6 +783,7 @@ class TestSelfHealingMechanism:
         }
         '''
         mock_planner_llm.invoke.return_value = mock_planner_response
+        mock_planner_llm.ainvoke = AsyncMock(return_value=mock_planner_response)
         mock_planner_llm_class.return_value = mock_planner_llm
         
         # Setup: Mock Builder LLM to return broken code first, then fixed code
@@ -967,6 +971,7 @@ export default Component;"""
         }
         '''
         mock_planner_llm.invoke.return_value = mock_planner_response
+        mock_planner_llm.ainvoke = AsyncMock(return_value=mock_planner_response)
         mock_planner_llm_class.return_value = mock_planner_llm
         
         # Setup: Mock Builder LLM to always return broken code
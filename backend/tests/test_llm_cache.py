@@ -0,0 +1,97 @@
+"""
+Tests for Exact-Match LLM Cache
+"""
+
+from backend.services.llm_cache import LLMCache, InMemoryBackend
+
+
+SAMPLE_RESPONSE = {"pages": [{"name": "HomePage", "route": "/"}]}
+
+
+class FailingBackend:
+    """Backend whose every operation raises, simulating an unreachable Redis"""
+    
+    def get(self, key):
+        raise ConnectionError("backend down")
+    
+    def set(self, key, value):
+        raise ConnectionError("backend down")
+    
+    def clear(self):
+        pass
+
+
+class TestLLMCache:
+    """Test suite for LLMCache"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = LLMCache()
+    
+    def test_cache_key_is_deterministic(self):
+        """Test that identical requests produce identical keys"""
+        first = LLMCache.cache_key("gemini:flash", "build a landing page")
+        second = LLMCache.cache_key("gemini:flash", "build a landing page")
+        
+        assert first == second
+        assert len(first) == 64
+    
+    def test_cache_key_depends_on_model_and_prompt(self):
+        """Test that model and prompt both feed the key"""
+        base = LLMCache.cache_key("gemini:flash", "build a landing page")
+        
+        assert LLMCache.cache_key("groq:llama", "build a landing page") != base
+        assert LLMCache.cache_key("gemini:flash", "build a blog") != base
+    
+    def test_sampled_requests_not_cached_by_default(self):
+        """Test that temperature > 0 disables caching unless opted in"""
+        assert LLMCache.cache_key("gemini:flash", "prompt", temperature=0.3) is None
+        assert LLMCache.cache_key("gemini:flash", "prompt", temperature=0.3, allow_sampled=True) is not None
+    
+    def test_round_trip(self):
+        """Test that a stored response is returned on the next lookup"""
+        key = LLMCache.cache_key("gemini:flash", "build a landing page")
+        
+        assert self.cache.get(key) is None
+        self.cache.put(key, SAMPLE_RESPONSE)
+        
+        assert self.cache.get(key) == SAMPLE_RESPONSE
+        assert self.cache.stats == {'hits': 1, 'misses': 1}
+    
+    def test_hits_return_independent_copies(self):
+        """Test that mutating a returned response does not corrupt the cache"""
+        key = LLMCache.cache_key("gemini:flash", "build a landing page")
+        self.cache.put(key, SAMPLE_RESPONSE)
+        
+        self.cache.get(key)['pages'].clear()
+        
+        assert self.cache.get(key) == SAMPLE_RESPONSE
+    
+    def test_none_key_is_ignored(self):
+        """Test that uncacheable requests never hit or count"""
+        self.cache.put(None, SAMPLE_RESPONSE)
+        
+        assert self.cache.get(None) is None
+        assert self.cache.stats == {'hits': 0, 'misses': 0}
+    
+    def test_in_memory_backend_evicts_lru(self):
+        """Test that the in-memory backend drops the least recently used entry"""
+        backend = InMemoryBackend(max_entries=2)
+        backend.set("a", "1")
+        backend.set("b", "2")
+        backend.get("a")
+        backend.set("c", "3")
+        
+        assert len(backend) == 2
+        assert backend.get("b") is None
+        assert backend.get("a") == "1"
+    
+    def test_backend_failures_are_misses(self):
+        """Test that a failing backend degrades to cache misses"""
+        cache = LLMCache(FailingBackend())
+        key = LLMCache.cache_key("gemini:flash", "build a landing page")
+        
+        cache.put(key, SAMPLE_RESPONSE)
+        
+        assert cache.get(key) is None
+        assert cache.stats['misses'] == 1
@@ -0,0 +1,44 @@
+"""
+Tests for LLM Client Pool
+"""
+
+from unittest.mock import Mock
+
+from backend.services.llm_pool import get_pooled_client, clear_client_pool
+
+
+class TestLLMClientPool:
+    """Test suite for the shared LLM client pool"""
+    
+    def setup_method(self):
+        """Start every test with an empty pool"""
+        clear_client_pool()
+    
+    def test_same_arguments_share_client(self):
+        """Test that identical configurations reuse one client"""
+        factory = Mock(side_effect=lambda **kwargs: object())
+        
+        first = get_pooled_client(factory, model="gemini-2.5-flash", temperature=0.3)
+        second = get_pooled_client(factory, temperature=0.3, model="gemini-2.5-flash")
+        
+        assert first is second
+        factory.assert_called_once_with(model="gemini-2.5-flash", temperature=0.3)
+    
+    def test_different_arguments_get_separate_clients(self):
+        """Test that a different model or sampling setting creates a new client"""
+        factory = Mock(side_effect=lambda **kwargs: object())
+        
+        planner_client = get_pooled_client(factory, model="gemini-2.5-flash", temperature=0.3)
+        builder_client = get_pooled_client(factory, model="gemini-2.5-flash", temperature=0.1)
+        
+        assert planner_client is not builder_client
+        assert factory.call_count == 2
+    
+    def test_clear_client_pool(self):
+        """Test that clearing the pool forces a new client"""
+        factory = Mock(side_effect=lambda **kwargs: object())
+        
+        first = get_pooled_client(factory, model="gemini-2.5-flash")
+        clear_client_pool()
+        
+        assert get_pooled_client(factory, model="gemini-2.5-flash") is not first
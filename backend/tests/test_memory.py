@@ -142,6 +142,24 @@ class TestEpisodicMemory:
         assert len(context["agent_history"]) == 2  # planner entries
         assert len(context["relevant_context"]) == 1  # high-importance from other agents
     
+    def test_context_version_tracks_relevant_changes(self):
+        """Test that only shared entries from other agents change an agent's context version"""
+        memory = EpisodicMemory("test_session")
+        initial = memory.get_context_version("planner")
+        
+        # The planner's own entries and low-importance entries leave it unchanged
+        memory.add_entry("planner", "plan", {"pages": 3}, importance=0.9)
+        memory.add_entry("builder", "draft", {"files": 1}, importance=0.5)
+        assert memory.get_context_version("planner") == initial
+        
+        memory.add_entry("builder", "build", {"files": 5}, importance=0.9)
+        after_build = memory.get_context_version("planner")
+        assert after_build != initial
+        assert memory.get_context_for_agent("planner")["context_version"] == after_build
+        
+        memory.clear()
+        assert memory.get_context_version("planner") not in (initial, after_build)
+    
     def test_export_for_rag(self):
         """Test exporting data for RAG integration"""
         memory = EpisodicMemory("test_session")
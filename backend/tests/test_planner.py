@@ -3,14 +3,20 @@ Tests for Planner Agent
 Validates: Requirements 2.1, 2.2, 12.1, 12.2
 """
 
+import asyncio
+import json
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from datetime import datetime
 from hypothesis import given, strategies as st, settings
 
-from backend.models.core import UserRequest, Plan
+from backend.models.core import UserRequest, Plan, PageSpec, ComponentSpec, RoutingConfig
+from backend.agents import planner as planner_module
 from backend.agents.planner import PlannerAgent
-from backend.agents.plan_validator import PlanValidator, validate_plan_completeness
+from backend.agents.plan_validator import PlanValidator, validate_plan_completeness, check_plan_completeness
+
+# The agents import services.* directly, so clear that module's pool
+from services.llm_pool import clear_client_pool
 
 
 class TestPlannerAgent:
@@ -92,6 +98,52 @@ class TestPlannerAgent:
         assert len(response.errors) == 0
         assert response.execution_time_ms >= 0
     
+    @pytest.mark.asyncio
+    @patch('backend.agents.planner.ChatGoogleGenerativeAI')
+    async def test_analyze_request_async_success(self, mock_llm_class):
+        """Test that the async variant awaits the LLM instead of blocking on invoke"""
+        mock_llm = Mock()
+        mock_llm.ainvoke = AsyncMock(return_value=self.mock_llm_response)
+        mock_llm_class.return_value = mock_llm
+        
+        planner = PlannerAgent()
+        user_request = UserRequest(description="Build a simple landing page")
+        
+        response = await planner.analyze_request_async(user_request)
+        
+        assert response.success is True
+        assert 'plan' in response.output
+        mock_llm.ainvoke.assert_awaited_once()
+        mock_llm.invoke.assert_not_called()
+    
+    @pytest.mark.asyncio
+    @patch('backend.agents.planner.ChatGoogleGenerativeAI')
+    async def test_analyze_requests_bounds_concurrency(self, mock_llm_class):
+        """Test that batched analysis returns ordered results with bounded concurrency"""
+        in_flight = 0
+        peak = 0
+        
+        async def slow_ainvoke(prompt):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return self.mock_llm_response
+        
+        mock_llm = Mock()
+        mock_llm.ainvoke = slow_ainvoke
+        mock_llm_class.return_value = mock_llm
+        
+        planner = PlannerAgent()
+        requests = [UserRequest(description=f"Build landing page number {i}") for i in range(5)]
+        
+        responses = await planner.analyze_requests(requests, max_concurrency=2)
+        
+        assert len(responses) == 5
+        assert all(response.success for response in responses)
+        assert peak <= 2
+    
     @patch('backend.agents.planner.ChatGoogleGenerativeAI')
     def test_analyze_request_with_invalid_json(self, mock_llm_class):
         """Test handling of invalid JSON from LLM"""
@@ -108,7 +160,7 @@ class TestPlannerAgent:
         
         assert response.success is False
         assert len(response.errors) > 0
-        assert "Plan generation failed" in response.errors[0]
+        assert "LLM plan generation failed" in response.errors[0]
     
     def test_extract_json_from_response(self):
         """Test JSON extraction from LLM response"""
@@ -124,43 +176,109 @@ class TestPlannerAgent:
             response_text = 'Here is the JSON: {"test": "value"} and some more text'
             result = planner._extract_json_from_response(response_text)
             assert result == {"test": "value"}
+            
+            # Test trailing text that itself contains braces
+            response_text = '{"test": {"nested": 1}} Note: wrap values in {quotes}'
+            result = planner._extract_json_from_response(response_text)
+            assert result == {"test": {"nested": 1}}
+            
+            # Test braces in the prose before the JSON
+            response_text = 'Use {braces} for props:\n{"test": "value"}'
+            result = planner._extract_json_from_response(response_text)
+            assert result == {"test": "value"}
+            
+            # Test a truncated response
+            with pytest.raises(ValueError):
+                planner._extract_json_from_response('{"test": {"nested": ')
+            
+            # Test an already-parsed response is returned without re-parsing
+            parsed = {"test": "value"}
+            assert planner._extract_json_from_response(parsed) is parsed
     
-    def test_validate_and_create_plan(self):
-        """Test plan validation and creation"""
+    def test_detect_backend_requirements(self):
+        """Test keyword-based backend detection and endpoint suggestions"""
         with patch('backend.agents.planner.ChatGoogleGenerativeAI'):
             planner = PlannerAgent()
             
-            plan_dict = {
-                "pages": [
-                    {
-                        "name": "HomePage",
-                        "route": "/",
-                        "components": ["Header"],
-                        "description": "Main page"
-                    }
-                ],
-                "components": [
-                    {
-                        "name": "Header",
-                        "type": "functional",
-                        "props": {},
-                        "description": "Header component"
-                    }
-                ],
-                "routing": {
-                    "base_path": "/",
-                    "routes": [{"path": "/", "component": "HomePage"}]
-                },
-                "backend_logic": None,
-                "estimated_complexity": "simple"
+            result = planner.detect_backend_requirements("A site with a Contact Form, signup and search")
+            
+            assert result['detected_categories'] == ['form_submission', 'search']
+            assert [ep['path'] for ep in result['suggested_endpoints']] == ['/api/contact', '/api/signup', '/api/search']
+            assert result['confidence'] == 'high'
+            
+            # Keywords match as substrings, as before ("api" inside "rapid")
+            assert planner.detect_backend_requirements("rapid prototype")['detected_categories'] == ['api_interaction']
+            assert planner.detect_backend_requirements("a static page")['needs_backend'] is False
+    
+    def test_planning_prompt_reuses_rendered_context(self):
+        """Test that session context is re-rendered only when its version changes"""
+        with patch('backend.agents.planner.ChatGoogleGenerativeAI'):
+            planner = PlannerAgent()
+            context = {
+                'session_id': 'session-1',
+                'context_version': (0, 1),
+                'relevant_context': [{'agent': 'builder', 'data': {'files': 5}}]
             }
             
-            plan = planner._validate_and_create_plan(plan_dict)
+            with patch('backend.agents.planner._dumps', wraps=planner_module._dumps) as mock_dumps:
+                first = planner._create_planning_prompt("Build a blog", context)
+                second = planner._create_planning_prompt("Build a shop", context)
+                assert mock_dumps.call_count == 1
+                
+                planner._create_planning_prompt("Build a shop", {**context, 'context_version': (0, 2)})
+                assert mock_dumps.call_count == 2
             
-            assert isinstance(plan, Plan)
-            assert len(plan.pages) == 1
-            assert len(plan.components) == 1
-            assert plan.backend_logic is None
+            assert '"files": 5' in first
+            assert first.replace("Build a blog", "Build a shop") == second
+    
+    def test_rendered_context_cache_is_bounded(self):
+        """Test that rendered context is kept only for the most recent sessions"""
+        with patch('backend.agents.planner.ChatGoogleGenerativeAI'), \
+                patch('backend.agents.planner.CONTEXT_CACHE_SESSIONS', 2):
+            planner = PlannerAgent()
+            for session_id in ('session-1', 'session-2', 'session-1', 'session-3'):
+                planner._create_planning_prompt("Build a blog", {
+                    'session_id': session_id,
+                    'context_version': (0, 1),
+                    'relevant_context': [{'agent': 'builder', 'data': {'files': 5}}]
+                })
+            
+            assert list(planner._context_cache) == ['session-1', 'session-3']
+    
+    def test_check_plan_completeness_returns_plan(self):
+        """Test that plan validation returns the Plan the planner builds its response from"""
+        plan_dict = {
+            "pages": [
+                {
+                    "name": "HomePage",
+                    "route": "/",
+                    "components": ["Header"],
+                    "description": "Main page"
+                }
+            ],
+            "components": [
+                {
+                    "name": "Header",
+                    "type": "functional",
+                    "props": {},
+                    "description": "Header component"
+                }
+            ],
+            "routing": {
+                "base_path": "/",
+                "routes": [{"path": "/", "component": "HomePage"}]
+            },
+            "backend_logic": None,
+            "estimated_complexity": "simple"
+        }
+        
+        result, plan = check_plan_completeness(plan_dict)
+        
+        assert result['valid'] is True
+        assert isinstance(plan, planner_module.Plan)
+        assert len(plan.pages) == 1
+        assert len(plan.components) == 1
+        assert plan.backend_logic is None
 
 
 class TestPlanValidator:
@@ -245,6 +363,114 @@ class TestPlanValidator:
         assert result['valid'] is False
         assert any("exceeds maximum of 5 pages" in error for error in result['errors'])
 
+    def test_validate_duplicate_component_names(self):
+        """Test that each repeated component name is reported once"""
+        plan_dict = {
+            "pages": [
+                {
+                    "name": "HomePage",
+                    "route": "/",
+                    "components": ["Header"],
+                    "description": "Main page"
+                }
+            ],
+            "components": [
+                {"name": "Header", "type": "functional", "props": {}, "description": "Header component"},
+                {"name": "Header", "type": "functional", "props": {}, "description": "Header again"},
+                {"name": "Header", "type": "functional", "props": {}, "description": "Header again"}
+            ],
+            "routing": {
+                "base_path": "/",
+                "routes": [{"path": "/", "component": "HomePage"}]
+            }
+        }
+        
+        result = validate_plan_completeness(plan_dict)
+        
+        assert result['valid'] is False
+        duplicate_errors = [e for e in result['errors'] if e.startswith("Duplicate component name")]
+        assert duplicate_errors == ["Duplicate component name: Header"] * 2
+    
+    def test_validate_plan_structure_stops_after_error_threshold(self):
+        """Test that validation stops early once errors exceed the threshold"""
+        from backend.agents.plan_validator import MAX_VALIDATION_ERRORS
+        
+        plan = Plan(
+            pages=[PageSpec(name="HomePage", route="/", components=["Header"], description="Main page")],
+            components=[
+                ComponentSpec(name="Header", type="functional", description="Header component")
+                for _ in range(MAX_VALIDATION_ERRORS + 2)
+            ],
+            routing=RoutingConfig(routes=[{"path": "/missing", "component": "HomePage"}])
+        )
+        
+        result = self.validator.validate_plan_structure(plan)
+        
+        assert result['valid'] is False
+        assert result['truncated'] is True
+        assert not any("Routes missing" in error for error in result['errors'])
+    
+    def test_validate_routing_messages_are_sorted(self):
+        """Test that set differences are reported in a stable, sorted order"""
+        plan = Plan(
+            pages=[
+                PageSpec(name="HomePage", route="/", components=["Header"], description="Main page"),
+                PageSpec(name="ZooPage", route="/zoo", components=["Header"], description="Zoo page"),
+                PageSpec(name="AboutPage", route="/about", components=["Header"], description="About page")
+            ],
+            components=[ComponentSpec(name="Header", type="functional", description="Header component")],
+            routing=RoutingConfig(routes=[{"path": "/", "component": "HomePage"}])
+        )
+        
+        result = self.validator.validate_plan_structure(plan)
+        
+        assert "Routes missing from routing config: ['/about', '/zoo']" in result['errors']
+    
+    def test_iter_validate_yields_severity_message_pairs(self):
+        """Test that the streaming validator yields the same issues as the report"""
+        plan = Plan(
+            pages=[PageSpec(name="HomePage", route="/", components=["Header", "Missing"], description="Main page")],
+            components=[ComponentSpec(name="Header", type="functional", description="Header component")],
+            routing=RoutingConfig(routes=[{"path": "/", "component": "HomePage"}])
+        )
+        
+        issues = list(self.validator.iter_validate(plan))
+        result = self.validator.validate_plan_structure(plan)
+        
+        assert ('error', "Page HomePage references undefined component: Missing") in issues
+        assert [message for severity, message in issues if severity == 'error'] == result['errors']
+        assert [message for severity, message in issues if severity == 'warning'] == result['warnings']
+    
+    def test_check_plan_completeness_returns_equivalent_plan(self):
+        """Test that the Plan built by the completeness check matches per-spec construction"""
+        plan_dict = {
+            "pages": [{"name": " HomePage ", "route": "/", "components": ["Header"], "description": "Main page"}],
+            "components": [{"name": "Header", "type": "functional", "props": {}, "description": "Header component"}],
+            "routing": {"base_path": "/", "routes": [{"path": "/", "component": "HomePage"}]},
+            "backend_logic": {},
+            "estimated_complexity": "simple"
+        }
+        
+        result, plan = check_plan_completeness(plan_dict)
+        expected = Plan(
+            pages=[PageSpec(**page) for page in plan_dict['pages']],
+            components=[ComponentSpec(**component) for component in plan_dict['components']],
+            routing=RoutingConfig(**plan_dict['routing']),
+            backend_logic=None,
+            estimated_complexity="simple"
+        )
+        
+        assert result['valid'] is True
+        assert plan.model_dump() == expected.model_dump()
+        assert plan.routing.route_paths == ("/",)
+    
+    def test_check_plan_completeness_without_plan_on_pydantic_error(self):
+        """Test that no Plan is returned when Pydantic rejects the data"""
+        result, plan = check_plan_completeness({"pages": "invalid", "components": [], "routing": {}})
+        
+        assert result['valid'] is False
+        assert plan is None
+
 
 class TestPlannerPropertyTests:
     """Property-based tests for Planner Agent"""
@@ -325,6 +551,10 @@ class TestPlannerPropertyTests:
         mock_llm.invoke.return_value = mock_llm_response
         mock_llm_class.return_value = mock_llm
         
+        # The class mock is shared by every example; drop the pooled client
+        # so this example's mock LLM is used
+        clear_client_pool()
+        
         # Create planner and test request
         planner = PlannerAgent()
         user_request = UserRequest(description=user_description)
@@ -471,6 +701,10 @@ class TestPlannerPropertyTests:
         mock_llm.invoke.return_value = mock_llm_response
         mock_llm_class.return_value = mock_llm
         
+        # The class mock is shared by every example; drop the pooled client
+        # so this example's mock LLM is used
+        clear_client_pool()
+        
         # Create planner and test request
         planner = PlannerAgent()
         user_request = UserRequest(description=f"Build a website with {page_count} pages")
@@ -574,6 +808,10 @@ class TestPlannerPropertyTests:
         mock_llm.invoke.return_value = mock_llm_response
         mock_llm_class.return_value = mock_llm
         
+        # The class mock is shared by every example; drop the pooled client
+        # so this example's mock LLM is used
+        clear_client_pool()
+        
         # Create planner and test request
         planner = PlannerAgent()
         user_request = UserRequest(description=user_description)
@@ -0,0 +1,107 @@
+"""
+Tests for RAG Service retrieval caching
+"""
+
+import numpy as np
+import pytest
+
+from backend.services.rag_service import RAGService
+
+
+class WordCountEncoder:
+    """Deterministic bag-of-words encoder so tests don't need a real model"""
+    
+    VOCAB = ['todo', 'app', 'blog', 'portfolio', 'build', 'me', 'a', 'simple']
+    
+    def encode(self, texts):
+        return np.array([
+            [text.lower().split().count(word) for word in self.VOCAB]
+            for text in texts
+        ], dtype=np.float32)
+
+
+class FakeRetriever:
+    """Stands in for FAISSRetriever and counts query encodes"""
+    
+    def __init__(self):
+        self.model = WordCountEncoder()
+        self.encodes = 0
+    
+    def embed_text(self, text):
+        self.encodes += 1
+        return self.model.encode([text])[0]
+
+
+class FakePipeline:
+    """Stands in for RAGPipeline and counts index searches"""
+    
+    def __init__(self):
+        self.retriever = FakeRetriever()
+        self.searches = 0
+    
+    def retrieve(self, query, top_k=3, query_embedding=None):
+        self.searches += 1
+        if query_embedding is None:
+            self.retriever.embed_text(query)
+        return [({"text": "Use React state for todo items", "source": "kb.md"}, 0.9)]
+
+
+class TestRAGServiceCache:
+    """Test suite for RAGService retrieval caching"""
+    
+    def setup_method(self, method):
+        """Set up a service backed by a fake pipeline"""
+        self.service = RAGService(knowledge_base_path="missing_knowledge_base.pkl")
+        self.pipeline = FakePipeline()
+        self.service.rag_pipeline = self.pipeline
+        self.service._reset_caches()
+        self.service.is_enabled = True
+    
+    @pytest.mark.asyncio
+    async def test_exact_repeat_is_cached(self):
+        """Test that a repeated query (ignoring case and whitespace) skips the index"""
+        first = await self.service.retrieve_context("Build me a todo app")
+        second = await self.service.retrieve_context("  build me a TODO app ")
+        
+        assert self.pipeline.searches == 1
+        assert second["retrieved_docs"] == first["retrieved_docs"]
+        assert second["metadata"] == first["metadata"]
+        assert "User Request:   build me a TODO app " in second["enriched_query"]
+    
+    @pytest.mark.asyncio
+    async def test_similar_query_is_cached(self):
+        """Test that a near-identical query is answered by the semantic tier"""
+        await self.service.retrieve_context("build me a todo app")
+        result = await self.service.retrieve_context("please build me a todo app")
+        
+        assert self.pipeline.searches == 1
+        assert result["metadata"]["rag_enabled"] is True
+        assert result["enriched_query"].startswith("User Request: please build me a todo app\n")
+    
+    @pytest.mark.asyncio
+    async def test_different_queries_and_top_k_miss(self):
+        """Test that unrelated queries and different top_k values are not shared"""
+        await self.service.retrieve_context("build me a todo app")
+        await self.service.retrieve_context("simple portfolio blog")
+        await self.service.retrieve_context("build me a todo app", top_k=5)
+        
+        assert self.pipeline.searches == 3
+    
+    @pytest.mark.asyncio
+    async def test_miss_encodes_query_once(self):
+        """Test that a miss encodes the query once for lookup, search and store"""
+        await self.service.retrieve_context("build me a todo app")
+        
+        assert self.pipeline.retriever.encodes == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_cache_write_keeps_result(self):
+        """Test that a cache write error does not discard a successful retrieval"""
+        def fail(*args, **kwargs):
+            raise TypeError("not JSON serializable")
+        self.service._semantic_cache.put = fail
+        
+        result = await self.service.retrieve_context("build me a todo app")
+        
+        assert result["metadata"]["rag_enabled"] is True
+        assert len(result["retrieved_docs"]) == 1
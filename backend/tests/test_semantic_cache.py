@@ -0,0 +1,144 @@
+"""
+Tests for Semantic Plan Cache
+"""
+
+import numpy as np
+
+from backend.services.semantic_cache import SemanticPlanCache, context_fingerprint
+
+
+class WordCountEncoder:
+    """Deterministic bag-of-words encoder so tests don't need a real model"""
+    
+    VOCAB = ['landing', 'page', 'portfolio', 'blog', 'contact', 'form', 'simple', 'a', 'build', 'create']
+    
+    def encode(self, texts):
+        return np.array([
+            [text.lower().split().count(word) for word in self.VOCAB]
+            for text in texts
+        ], dtype=np.float32)
+
+
+class CountingEncoder(WordCountEncoder):
+    """WordCountEncoder that records how many times it was called"""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def encode(self, texts):
+        self.calls += 1
+        return super().encode(texts)
+
+
+SAMPLE_PLAN = {
+    "pages": [{"name": "HomePage", "route": "/", "components": ["Header"], "description": "Main page"}],
+    "components": [{"name": "Header", "type": "functional", "props": {}, "description": "Header"}],
+    "routing": {"base_path": "/", "routes": [{"path": "/", "component": "HomePage"}]}
+}
+
+
+class TestSemanticPlanCache:
+    """Test suite for SemanticPlanCache"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.cache = SemanticPlanCache(encoder=WordCountEncoder())
+    
+    def test_empty_cache_misses(self):
+        """Test that lookups on an empty cache miss"""
+        assert self.cache.get("build a landing page") is None
+        assert self.cache.stats['misses'] == 1
+    
+    def test_similar_description_hits(self):
+        """Test that a paraphrased description returns the cached plan"""
+        self.cache.put("build a simple landing page", SAMPLE_PLAN)
+        
+        result = self.cache.get("Build simple landing page")
+        
+        assert result == SAMPLE_PLAN
+        assert self.cache.stats['hits'] == 1
+    
+    def test_dissimilar_description_misses(self):
+        """Test that unrelated descriptions do not hit"""
+        self.cache.put("build a simple landing page", SAMPLE_PLAN)
+        
+        assert self.cache.get("portfolio blog with contact form") is None
+    
+    def test_context_key_must_match(self):
+        """Test that plans are only reused under the same session context"""
+        self.cache.put("build a simple landing page", SAMPLE_PLAN, context_key="ctx-a")
+        
+        assert self.cache.get("build a simple landing page", context_key="ctx-b") is None
+        assert self.cache.get("build a simple landing page", context_key="ctx-a") == SAMPLE_PLAN
+    
+    def test_hits_return_independent_copies(self):
+        """Test that mutating a returned plan does not corrupt the cache"""
+        self.cache.put("build a simple landing page", SAMPLE_PLAN)
+        
+        first = self.cache.get("build a simple landing page")
+        first['pages'].clear()
+        
+        assert self.cache.get("build a simple landing page") == SAMPLE_PLAN
+    
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted at capacity"""
+        cache = SemanticPlanCache(encoder=WordCountEncoder(), max_entries=2)
+        cache.put("landing page", {"id": 1})
+        cache.put("portfolio blog", {"id": 2})
+        
+        # Touch the first entry so the second becomes least recently used
+        assert cache.get("landing page") == {"id": 1}
+        cache.put("contact form", {"id": 3})
+        
+        assert len(cache) == 2
+        assert cache.get("portfolio blog") is None
+        assert cache.get("landing page") == {"id": 1}
+    
+    def test_disabled_cache_never_hits(self):
+        """Test that a disabled cache neither stores nor returns plans"""
+        cache = SemanticPlanCache(encoder=WordCountEncoder(), enabled=False)
+        cache.put("build a simple landing page", SAMPLE_PLAN)
+        
+        assert len(cache) == 0
+        assert cache.get("build a simple landing page") is None
+    
+    def test_precomputed_vector_is_embedded_once(self):
+        """Test that a miss followed by a store encodes the description only once"""
+        encoder = CountingEncoder()
+        cache = SemanticPlanCache(encoder=encoder)
+        
+        vector = cache.embed("build a simple landing page")
+        assert cache.get("build a simple landing page", vector=vector) is None
+        cache.put("build a simple landing page", SAMPLE_PLAN, vector=vector)
+        
+        assert encoder.calls == 1
+        assert cache.get("build a simple landing page", vector=vector) == SAMPLE_PLAN
+    
+    def test_use_encoder_enables_cache(self):
+        """Test that attaching a shared encoder turns a disabled cache on"""
+        cache = SemanticPlanCache(enabled=False)
+        cache.use_encoder(WordCountEncoder())
+        cache.put("build a simple landing page", SAMPLE_PLAN)
+        
+        assert cache.get("build simple landing page") == SAMPLE_PLAN
+    
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that a persisted cache can be warm-started"""
+        path = str(tmp_path / "plan_cache")
+        self.cache.put("build a simple landing page", SAMPLE_PLAN, context_key="ctx")
+        self.cache.save(path)
+        
+        restored = SemanticPlanCache(encoder=WordCountEncoder())
+        
+        assert restored.load(path) is True
+        assert restored.get("build a simple landing page", context_key="ctx") == SAMPLE_PLAN
+        assert sorted(p.name for p in tmp_path.iterdir()) == ["plan_cache.json", "plan_cache.npy"]
+    
+    def test_context_fingerprint_is_stable(self):
+        """Test that equal contexts produce equal fingerprints"""
+        context = {'relevant_context': [{'agent': 'builder', 'data': {'b': 1, 'a': 2}}]}
+        same = {'relevant_context': [{'data': {'a': 2, 'b': 1}, 'agent': 'builder'}]}
+        
+        assert context_fingerprint(context) == context_fingerprint(same)
+        assert context_fingerprint({}) == context_fingerprint({'relevant_context': []})
+        assert context_fingerprint(context) != context_fingerprint({})
@@ -0,0 +1,71 @@
+"""
+Tests for Session Store
+"""
+
+import pytest
+
+from backend.services.session_store import InMemorySessionStore, MAX_PROGRESS_UPDATES
+
+
+class TestInMemorySessionStore:
+    """Test suite for InMemorySessionStore"""
+    
+    def setup_method(self):
+        """Set up test fixtures"""
+        self.store = InMemorySessionStore()
+    
+    @pytest.mark.asyncio
+    async def test_create_and_get(self):
+        """Test that a created session can be read back"""
+        await self.store.create("s1", {"status": "initiated", "progress": []})
+        
+        session = await self.store.get("s1")
+        
+        assert session.status == "initiated"
+        assert list(session.progress) == []
+        assert session.workflow_state is None
+        assert await self.store.exists("s1")
+        assert await self.store.get("missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_update_and_append_progress(self):
+        """Test field updates and progress history"""
+        await self.store.create("s1", {"status": "initiated"})
+        
+        await self.store.update("s1", status="running", workflow_state={"workflow_status": "completed"})
+        await self.store.append_progress("s1", {"agent": "planner"})
+        
+        session = await self.store.get("s1")
+        assert session.status == "running"
+        assert session.workflow_state == {"workflow_status": "completed"}
+        assert list(session.progress) == [{"agent": "planner"}]
+    
+    @pytest.mark.asyncio
+    async def test_progress_history_is_bounded(self):
+        """Test that only the most recent progress updates are kept"""
+        await self.store.create("s1", {"status": "running"})
+        
+        for i in range(MAX_PROGRESS_UPDATES + 5):
+            await self.store.append_progress("s1", {"step": i})
+        
+        progress = list((await self.store.get("s1")).progress)
+        assert len(progress) == MAX_PROGRESS_UPDATES
+        assert progress[0] == {"step": 5}
+        assert progress[-1] == {"step": MAX_PROGRESS_UPDATES + 4}
+    
+    @pytest.mark.asyncio
+    async def test_unknown_sessions_are_ignored(self):
+        """Test that writes to unknown sessions do not create them"""
+        await self.store.update("missing", status="running")
+        await self.store.append_progress("missing", {"agent": "planner"})
+        
+        assert await self.store.count() == 0
+    
+    @pytest.mark.asyncio
+    async def test_expired_sessions_are_dropped(self):
+        """Test that sessions past their TTL are no longer returned"""
+        store = InMemorySessionStore(ttl_seconds=-1)
+        await store.create("s1", {"status": "initiated"})
+        
+        assert await store.get("s1") is None
+        assert await store.count() == 0
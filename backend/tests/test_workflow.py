@@ -3,6 +3,7 @@ Tests for LangGraph workflow orchestrator
 Validates workflow state management and agent routing
 """
 
+import json
 import pytest
 from datetime import datetime
 from uuid import uuid4
@@ -19,7 +20,8 @@ from backend.models.workflow import (
     is_terminal_state,
     has_errors,
     can_retry,
-    preserve_context_across_transition
+    preserve_context_across_transition,
+    WorkflowStatus
 )
 from backend.workflow.orchestrator import WorkflowOrchestrator, get_orchestrator
 
@@ -88,6 +90,11 @@ class TestWorkflowStateManagement:
         assert len(updated_state['errors']) == 1
         assert error_msg in str(updated_state['errors'][0])
         assert 'planner' in str(updated_state['errors'][0])
+        
+        entry = json.loads(updated_state['errors'][0])
+        assert entry['agent'] == 'planner'
+        assert entry['error'] == error_msg
+        assert entry['retry_count'] == 0
     
     def test_increment_retry_count(self):
         """Test retry count increment"""
@@ -111,6 +118,25 @@ class TestWorkflowStateManagement:
         assert final_state['workflow_status'] == 'completed'
         assert final_state['execution_time_ms'] == execution_time
     
+    def test_inplace_updates_skip_copy(self):
+        """Test that inplace=True updates and returns the same state dict"""
+        state = create_initial_workflow_state("Test input", str(uuid4()))
+        
+        assert update_workflow_state(state, 'planner', {'plan': {'pages': []}}, inplace=True) is state
+        assert increment_retry_count(state, inplace=True) is state
+        assert add_error_to_state(state, "Test error", 'planner', inplace=True) is state
+        assert finalize_workflow_state(state, 'failed', 1000, inplace=True) is state
+        
+        assert state['plan'] == {'pages': []}
+        assert state['retry_count'] == 1
+        assert len(state['errors']) == 1
+        assert state['workflow_status'] == 'failed'
+        
+        # The default still leaves the original dict untouched
+        copied = finalize_workflow_state(state, 'completed', 2000)
+        assert copied is not state
+        assert state['workflow_status'] == 'failed'
+    
     def test_is_terminal_state(self):
         """Test terminal state detection"""
         state = create_initial_workflow_state("Test input", str(uuid4()))
@@ -547,3 +573,31 @@ class TestWorkflowValidation:
         # Should raise ValueError
         with pytest.raises(ValueError, match="workflow_status must be"):
             validate_workflow_state(state)
+    
+    def test_initial_state_is_validated(self):
+        """Test that creating a state with empty input fails validation"""
+        with pytest.raises(ValueError, match="user_input must be a non-empty string"):
+            create_initial_workflow_state("   ", str(uuid4()))
+    
+    def test_validation_at_boundaries_only(self):
+        """Test that transitions skip validation unless debug_validate is set"""
+        state = create_initial_workflow_state("Test input", str(uuid4()))
+        state['retry_count'] = -1
+        
+        # Ordinary transitions do not re-validate
+        update_workflow_state(state, 'planner', {'plan': None})
+        
+        with pytest.raises(ValueError, match="retry_count must be a non-negative integer"):
+            update_workflow_state(state, 'planner', {'plan': None}, debug_validate=True)
+        
+        with pytest.raises(ValueError, match="retry_count must be a non-negative integer"):
+            finalize_workflow_state(state, 'completed', 1000)
+    
+    def test_workflow_status_values(self):
+        """Test that every WorkflowStatus value validates as a plain string"""
+        state = create_initial_workflow_state("Test input", str(uuid4()))
+        
+        for status in WorkflowStatus:
+            state['workflow_status'] = status.value
+            assert validate_workflow_state(state) is True
+            assert is_terminal_state(state) is (status is not WorkflowStatus.RUNNING)
@@ -155,7 +155,8 @@ class WorkflowOrchestrator:
             {
                 'workflow_status': 'running',
                 'current_agent': 'supervisor'
-            }
+            },
+            inplace=True
         )
     
     async def _planner_node(self, state: WorkflowState) -> WorkflowState:
@@ -180,7 +181,7 @@ class WorkflowOrchestrator:
             )
             
             # Call Planner Agent
-            response = self.planner.analyze_request(user_request)
+            response = await self.planner.analyze_request_async(user_request)
             
             if response.success:
                 # Extract plan from response
@@ -202,7 +203,8 @@ class WorkflowOrchestrator:
                     {
                         'plan': plan_dict,
                         'current_agent': 'planner'
-                    }
+                    },
+                    inplace=True
                 )
             else:
                 # Planner failed
@@ -213,7 +215,7 @@ class WorkflowOrchestrator:
                     "Planning failed",
                     error_msg
                 )
-                return add_error_to_state(state, error_msg, 'planner')
+                return add_error_to_state(state, error_msg, 'planner', inplace=True)
                 
         except Exception as e:
             error_msg = f"Planner node error: {str(e)}"
@@ -223,7 +225,7 @@ class WorkflowOrchestrator:
                 "Planning error",
                 error_msg
             )
-            return add_error_to_state(state, error_msg, 'planner')
+            return add_error_to_state(state, error_msg, 'planner', inplace=True)
     
     async def _builder_node(self, state: WorkflowState) -> WorkflowState:
         """
@@ -280,7 +282,8 @@ class WorkflowOrchestrator:
                             'project': project_dict
                         },
                         'current_agent': 'builder'
-                    }
+                    },
+                    inplace=True
                 )
             else:
                 # Builder failed
@@ -291,7 +294,7 @@ class WorkflowOrchestrator:
                     "Code generation failed",
                     error_msg
                 )
-                return add_error_to_state(state, error_msg, 'builder')
+                return add_error_to_state(state, error_msg, 'builder', inplace=True)
                 
         except Exception as e:
             error_msg = f"Builder node error: {str(e)}"
@@ -301,7 +304,7 @@ class WorkflowOrchestrator:
                 "Code generation error",
                 error_msg
             )
-            return add_error_to_state(state, error_msg, 'builder')
+            return add_error_to_state(state, error_msg, 'builder', inplace=True)
     
     async def _tester_node(self, state: WorkflowState) -> WorkflowState:
         """
@@ -354,7 +357,8 @@ class WorkflowOrchestrator:
                 {
                     'test_results': test_results,
                     'current_agent': 'tester'
-                }
+                },
+                inplace=True
             )
                 
         except Exception as e:
@@ -365,7 +369,7 @@ class WorkflowOrchestrator:
                 "Testing error",
                 error_msg
             )
-            return add_error_to_state(state, error_msg, 'tester')
+            return add_error_to_state(state, error_msg, 'tester', inplace=True)
     
     async def _deployer_node(self, state: WorkflowState) -> WorkflowState:
         """
@@ -416,7 +420,8 @@ class WorkflowOrchestrator:
                         'deployment_url': deployment_url,
                         'project_location': project_dir,
                         'current_agent': 'deployer'
-                    }
+                    },
+                    inplace=True
                 )
             else:
                 # Deployment failed - but don't fail the workflow, just log it
@@ -442,7 +447,8 @@ class WorkflowOrchestrator:
                         'generated_files': generated_files,
                         'file_list': file_list,
                         'current_agent': 'deployer'
-                    }
+                    },
+                    inplace=True
                 )
                 
         except Exception as e:
@@ -458,7 +464,7 @@ class WorkflowOrchestrator:
             generated_files = project_dict.get('files', {}) if project_dict else {}
             project_dir = state.get('agent_context', {}).get('project_dir')
             
-            updated_state = add_error_to_state(state, error_msg, 'deployer')
+            updated_state = add_error_to_state(state, error_msg, 'deployer', inplace=True)
             if generated_files:
                 updated_state['generated_files'] = generated_files
                 updated_state['file_list'] = list(generated_files.keys())
@@ -474,7 +480,7 @@ class WorkflowOrchestrator:
         """
         try:
             # Increment retry count
-            state = increment_retry_count(state)
+            state = increment_retry_count(state, inplace=True)
             
             # Send progress update
             await self._send_progress(
@@ -504,7 +510,8 @@ class WorkflowOrchestrator:
                 'self_heal',
                 {
                     'current_agent': 'self_heal'
-                }
+                },
+                inplace=True
             )
                 
         except Exception as e:
@@ -515,7 +522,7 @@ class WorkflowOrchestrator:
                 "Self-healing error",
                 error_msg
             )
-            return add_error_to_state(state, error_msg, 'self_heal')
+            return add_error_to_state(state, error_msg, 'self_heal', inplace=True)
     
     async def _finalize_node(self, state: WorkflowState) -> WorkflowState:
         """
@@ -539,7 +546,7 @@ class WorkflowOrchestrator:
                 final_status = 'completed'
             
             # Finalize state
-            state = finalize_workflow_state(state, final_status, execution_time_ms)
+            state = finalize_workflow_state(state, final_status, execution_time_ms, inplace=True)
             
             # Send progress update
             await self._send_progress(
@@ -575,7 +582,7 @@ class WorkflowOrchestrator:
                 "Finalization error",
                 error_msg
             )
-            return add_error_to_state(state, error_msg, 'finalize')
+            return add_error_to_state(state, error_msg, 'finalize', inplace=True)
     
     # ========== Routing Functions ==========
     
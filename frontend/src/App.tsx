@@ -78,6 +78,14 @@ function App() {
 
     ws.onmessage = (event) => {
       const update: ProgressUpdate = JSON.parse(event.data);
+
+      // Stored history arrives as one batched message on (re)connect, and
+      // bursts of live progress updates are coalesced the same way
+      if (update.type === "backfill" || update.type === "progress_batch") {
+        setProgressUpdates((prev) => [...prev, ...(update.updates ?? [])]);
+        return;
+      }
+
       setProgressUpdates((prev) => [...prev, update]);
 
       // Check if workflow is complete
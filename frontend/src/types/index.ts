@@ -12,12 +12,13 @@ export interface GenerateResponse {
 }
 
 export interface ProgressUpdate {
-  type: 'connection' | 'progress' | 'error' | 'complete';
+  type: 'connection' | 'backfill' | 'progress' | 'progress_batch' | 'error' | 'complete';
   agent?: 'planner' | 'builder' | 'deployer';
   status?: 'running' | 'completed' | 'failed';
   message: string;
   details?: string;
   session_id?: string;
+  updates?: ProgressUpdate[];
 }
 
 export interface DeploymentResult {
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Optional native build for AMAR MVP Backend hot paths
+
+Compiles selected pure-Python modules with Cython. The compiled extension
+is placed next to its .py source and is picked up by the normal import
+system; removing it (or never building it) falls back to the .py module.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+# Modules compiled in place, relative to the backend directory
+CYTHON_MODULES = [
+    "agents/plan_validator.py",
+]
+
+
+def main():
+    """Compile the configured modules with Cython"""
+    try:
+        from Cython.Build import cythonize
+        from setuptools import setup
+    except ImportError:
+        print("❌ Cython and setuptools are required: pip install cython setuptools")
+        return 1
+
+    # Build from the repository root so extensions land beside their sources
+    repo_root = Path(__file__).parent.parent
+    os.chdir(repo_root)
+    modules = [str(Path("backend") / module) for module in CYTHON_MODULES]
+
+    print("🏗️  Compiling backend modules with Cython...")
+    for module in modules:
+        print(f"  • {module}")
+
+    setup(
+        name="amar-backend-extensions",
+        ext_modules=cythonize(modules, language_level=3),
+        script_args=["build_ext", "--inplace"],
+    )
+
+    print("✅ Native extensions built")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())